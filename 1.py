@@ -1,9 +1,8 @@
 # smartstore_review_scraper.py
 
 import time
-import pandas as pd
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
+
+from review_pagination import click_next_page
 
 
 # ================================
@@ -99,6 +98,9 @@ def parse_review_card(card):
 # 리뷰 전체 수집
 # ================================
 def extract_reviews_to_csv(url, limit_pages=10):
+    from bs4 import BeautifulSoup
+    from playwright.sync_api import sync_playwright
+
     reviews = []
     seen = set()
 
@@ -137,21 +139,21 @@ def extract_reviews_to_csv(url, limit_pages=10):
                     seen.add(key)
                     reviews.append(info)
 
-            # 다음 페이지 이동
-            pagination = page.locator(".LiT9lKOVbw")
-            next_btn = pagination.locator(f'a:has-text("{n+1}")').first
-
-            if next_btn.count() > 0:
+            # 다음 페이지 이동 (10 페이지마다 "다음" 그룹 버튼)
+            if click_next_page(page, n + 1):
                 print(f"➡ {n+1} 페이지 이동")
-                next_btn.click()
-                time.sleep(2)
             else:
                 print("⛔ 다음 페이지 없음 → 종료")
                 break
 
         browser.close()
 
-    df = pd.DataFrame(reviews)
+    import pandas as pd
+
+    from review_normalize import normalize_frame
+
+    # date_iso / date_ordinal 추가, rating → 정수
+    df = normalize_frame(pd.DataFrame(reviews))
     df.to_csv("reviews.csv", index=False, encoding="utf-8-sig")
 
     print("\n==========================================")
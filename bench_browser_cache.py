@@ -0,0 +1,106 @@
+# bench_browser_cache.py
+
+"""
+브라우저 디스크 캐시 벤치마크 (빈 브라우저 vs 영구 프로필)
+- 같은 상품 페이지를 N번 열면서 회차별로 측정
+    bytes      : CDP Network.loadingFinished 의 encodedDataLength 합 (실제 네트워크로 받은 바이트)
+    cached     : 디스크 / 메모리 캐시에서 나온 응답 수 (Network.requestServedFromCache + fromDiskCache)
+    first_paint: performance 'paint' 엔트리의 first-contentful-paint (ms)
+- clean  : 회차마다 launch() 로 빈 브라우저 (기존 동작)
+- profile: 회차마다 launch_persistent_context(같은 프로필 폴더) → 2회차부터 캐시 사용
+
+사용법:
+    python bench_browser_cache.py https://smartstore.naver.com/maca-mall/products/12491774443 --runs 3
+"""
+
+import argparse
+import asyncio
+import shutil
+import tempfile
+import time
+
+FIRST_PAINT_JS = """
+() => {
+    const entries = performance.getEntriesByType('paint');
+    const fcp = entries.find(e => e.name === 'first-contentful-paint') || entries[0];
+    return fcp ? fcp.startTime : null;
+}
+"""
+
+
+async def load_once(context, url: str) -> dict:
+    page = await context.new_page()
+    cdp = await context.new_cdp_session(page)
+    stats = {"bytes": 0, "requests": 0, "cached": 0}
+
+    def finished(event):
+        stats["bytes"] += event.get("encodedDataLength", 0)
+        stats["requests"] += 1
+
+    def served_from_cache(_):
+        stats["cached"] += 1
+
+    def response(event):
+        if event["response"].get("fromDiskCache"):
+            stats["cached"] += 1
+
+    cdp.on("Network.loadingFinished", finished)
+    cdp.on("Network.requestServedFromCache", served_from_cache)
+    cdp.on("Network.responseReceived", response)
+    await cdp.send("Network.enable")
+
+    start = time.perf_counter()
+    await page.goto(url, wait_until="load", timeout=120000)
+    stats["load_ms"] = (time.perf_counter() - start) * 1000
+    stats["first_paint_ms"] = await page.evaluate(FIRST_PAINT_JS)
+    await page.close()
+    return stats
+
+
+async def run(url: str, runs: int, headless: bool):
+    from playwright.async_api import async_playwright
+
+    from smartstore_review_api import BROWSER_ARGS, CONTEXT_OPTIONS
+
+    profile_dir = tempfile.mkdtemp(prefix="bench_profile_")
+    results = {"clean": [], "profile": []}
+    try:
+        async with async_playwright() as p:
+            for _ in range(runs):
+                browser = await p.chromium.launch(headless=headless, args=BROWSER_ARGS)
+                context = await browser.new_context(**CONTEXT_OPTIONS)
+                results["clean"].append(await load_once(context, url))
+                await browser.close()
+
+            for _ in range(runs):
+                context = await p.chromium.launch_persistent_context(
+                    profile_dir, headless=headless, args=BROWSER_ARGS, **CONTEXT_OPTIONS
+                )
+                results["profile"].append(await load_once(context, url))
+                await context.close()
+    finally:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Browser disk cache benchmark")
+    parser.add_argument("url")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--headless", action=argparse.BooleanOptionalAction, default=True)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.url, args.runs, args.headless))
+
+    print(f"{'mode':8} {'run':>3} {'KB':>9} {'req':>5} {'cached':>6} {'FCP ms':>8} {'load ms':>8}")
+    for mode, rows in results.items():
+        for i, s in enumerate(rows, 1):
+            fcp = f"{s['first_paint_ms']:.0f}" if s["first_paint_ms"] is not None else "-"
+            print(
+                f"{mode:8} {i:>3} {s['bytes'] / 1024:>9.1f} {s['requests']:>5} "
+                f"{s['cached']:>6} {fcp:>8} {s['load_ms']:>8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# bench_import_time.py
+
+"""
+엔트리 포인트 import 시간 측정 (python -X importtime 기반)
+- 각 모듈을 새 인터프리터에서 import 해서 wall-clock 시간 측정
+- -X importtime 출력(stderr)을 파싱해서 누적 시간이 큰 모듈 상위 N개 출력
+- 무거운 모듈(pandas / bs4 / playwright)이 로드 시점에 끌려오는지 감사(audit)
+
+사용법:
+    python bench_import_time.py
+    python bench_import_time.py smartstore_review_api --repeat 5 --top 15
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# 기본 측정 대상 (API + CLI 엔트리 포인트)
+DEFAULT_MODULES = [
+    "smartstore_review_api",
+    "smartstore_review_api_2511251854",
+    "smartstore_review_api_2511252216",
+    "smartstore_review_api_2511252236",
+    "smartstore_review_api_2511252315",
+    "smartstore_review_scraper",
+    "review_cli",
+    "review_dedup_inspector1",
+]
+
+# 로드 시점에 끌려오면 안 되는 무거운 모듈
+HEAVY_MODULES = ("pandas", "numpy", "bs4", "lxml", "playwright")
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+# ================================
+# -X importtime 출력 파싱
+# ================================
+def parse_importtime(stderr: str):
+    """
+    'import time: self [us] | cumulative | imported package' 라인을
+    (module, self_us, cumulative_us) 리스트로 변환
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        self_us, cum_us, name = parts
+        if not self_us.strip().isdigit():
+            continue  # 헤더 라인
+        rows.append((name.strip(), int(self_us), int(cum_us)))
+    return rows
+
+
+# ================================
+# 모듈 1개 측정
+# ================================
+def measure(module: str, repeat: int = 3):
+    walls = []
+    rows = []
+    error = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=HERE,
+            capture_output=True,
+            text=True,
+        )
+        walls.append(time.perf_counter() - start)
+
+        if proc.returncode != 0:
+            error = proc.stderr.strip().splitlines()[-1]
+            break
+        rows = parse_importtime(proc.stderr)
+
+    return {
+        "module": module,
+        "wall_ms": statistics.median(walls) * 1000,
+        "rows": rows,
+        "error": error,
+    }
+
+
+def report(result, top: int):
+    print(f"\n== {result['module']} ==")
+    if result["error"]:
+        print(f"  ❌ import 실패: {result['error']}")
+        return
+
+    print(f"  wall (median): {result['wall_ms']:.1f} ms")
+
+    rows = result["rows"]
+    loaded = {name.lstrip() for name, _, _ in rows}
+    heavy = [m for m in HEAVY_MODULES if m in loaded]
+    print(f"  무거운 모듈 로드: {', '.join(heavy) if heavy else '없음'}")
+
+    # 최상위 import 만 골라서 누적 시간 순으로
+    top_level = [r for r in rows if not r[0].startswith(" ")]
+    top_level.sort(key=lambda r: r[2], reverse=True)
+    for name, _, cum_us in top_level[:top]:
+        print(f"  {cum_us / 1000:8.1f} ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="entry point import-time audit")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        report(measure(module, args.repeat), args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# bench_json.py
+
+"""
+리뷰 응답 JSON 직렬화 벤치마크
+- 가짜 리뷰 N개(기본 50,000)를 ReviewBatch → to_records() 로 만든 /scrape 응답 body 기준
+- 비교 (회차별 최소 시간 / tracemalloc 최대 메모리)
+    fastapi   : jsonable_encoder + JSONResponse.render (기존 /scrape 경로, fastapi 설치 시)
+    json      : 표준 json.dumps (jsonable_encoder 없이)
+    fast      : review_json.dumps (orjson 있으면 orjson, 없으면 json 과 같음)
+
+사용법:
+    python bench_json.py --reviews 50000 --repeat 5
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from bench_review_batch import fake_reviews
+from review_batch import ReviewBatch
+from review_normalize import normalize_batch
+
+
+def stdlib_dumps(body) -> bytes:
+    # starlette JSONResponse.render 와 같은 옵션
+    return json.dumps(body, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def candidates():
+    import review_json
+
+    out = {}
+    try:
+        from fastapi.encoders import jsonable_encoder
+
+        out["fastapi"] = lambda body: stdlib_dumps(jsonable_encoder(body))
+    except ImportError:
+        pass
+    out["json"] = stdlib_dumps
+    out["orjson" if review_json.orjson else "fast(json)"] = review_json.dumps
+    return out
+
+
+def measure(fn, body, repeat: int):
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = len(fn(body))
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Review response JSON serialization benchmark")
+    parser.add_argument("--reviews", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    batch = normalize_batch(ReviewBatch(fake_reviews(args.reviews)))
+    body = {"count": len(batch), "truncated": False, "reviews": batch.to_records()}
+
+    print(f"{'encoder':12} {'ms':>9} {'peak MB':>9} {'MB out':>8}")
+    for name, fn in candidates().items():
+        best, peak, size = measure(fn, body, args.repeat)
+        print(f"{name:12} {best * 1000:>9.1f} {peak / 1e6:>9.1f} {size / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
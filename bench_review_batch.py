@@ -0,0 +1,73 @@
+# bench_review_batch.py
+
+"""
+ReviewBatch 메모리 벤치마크
+- 가짜 리뷰 N개를 dict 리스트 / ReviewBatch 로 각각 쌓아서 tracemalloc 으로 비교
+- 날짜 / 옵션 / 자동 라벨은 실제 크롤링처럼 소수의 값이 반복되도록 생성
+
+사용법:
+    python bench_review_batch.py --reviews 200000
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from review_batch import ReviewBatch
+
+OPTIONS = [f"색상: {c} / 사이즈: {s}" for c in ("블랙", "화이트", "네이비", "베이지") for s in ("S", "M", "L", "XL")]
+LABELS = ["", "재구매 | 한달사용", "한달사용", "재구매", "포장 꼼꼼해요 | 배송 빨라요"]
+DATES = [f"24.{m:02d}.{d:02d}." for m in range(1, 13) for d in range(1, 29)]
+
+
+def _fresh(s: str) -> str:
+    # get_text() 처럼 매번 새 문자열 객체를 만듦
+    return s.encode().decode()
+
+
+def fake_reviews(n: int, seed: int = 0):
+    rnd = random.Random(seed)
+    for i in range(n):
+        yield {
+            "nickname": f"user{rnd.randrange(10**6):06d}**",
+            "date": _fresh(rnd.choice(DATES)),
+            "rating": str(rnd.choice((5, 5, 5, 4, 4, 3, 2, 1))),
+            "option": _fresh(rnd.choice(OPTIONS)),
+            "auto_label": _fresh(rnd.choice(LABELS)),
+            "content": f"리뷰 본문 {i} " + "좋아요 " * rnd.randrange(1, 20),
+            "image_count": rnd.choice((0, 0, 0, 1, 2, 3)),
+        }
+
+
+def measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    obj = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ReviewBatch memory benchmark")
+    parser.add_argument("--reviews", type=int, default=200_000)
+    args = parser.parse_args()
+
+    n = args.reviews
+
+    # dict 리스트 (기존 방식) - 리뷰 dict 를 파서처럼 매번 새로 만듦
+    _, dict_bytes, dict_sec = measure(lambda: list(fake_reviews(n)))
+
+    # ReviewBatch
+    _, batch_bytes, batch_sec = measure(lambda: ReviewBatch(fake_reviews(n)))
+
+    print(f"reviews: {n:,}")
+    print(f"list[dict]  : {dict_bytes / 2**20:8.1f} MiB  ({dict_sec:.2f} s)")
+    print(f"ReviewBatch : {batch_bytes / 2**20:8.1f} MiB  ({batch_sec:.2f} s)")
+    print(f"절감률       : {(1 - batch_bytes / dict_bytes) * 100:.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# browser_profile.py
+
+"""
+Chromium 영구 프로필 (디스크 캐시 재사용)
+- launch_persistent_context 용 user-data-dir 을 슬롯 단위로 관리: <root>/slot-0, slot-1, ...
+- 같은 프로필을 Chromium 2개가 동시에 못 쓰므로 슬롯마다 lock 파일로 잠그고,
+  빈 슬롯이 없으면 새 슬롯을 만듦 → 워커(브라우저)마다 프로필 1개
+- 반납할 때 크기를 확인해서 max_bytes 를 넘으면 캐시 폴더부터 지우고, 그래도 크면 슬롯 통째로 삭제
+- 상품 페이지의 JS / CSS 번들이 다음 작업부터 디스크 캐시에서 나옴 (bench_browser_cache.py 로 측정)
+
+환경변수:
+    SCRAPER_BROWSER_PROFILE_DIR     프로필 루트 (설정 안 하면 기존처럼 매번 빈 브라우저)
+    SCRAPER_BROWSER_PROFILE_MAX_MB  슬롯당 최대 크기 (기본 500)
+"""
+
+import logging
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+logger = logging.getLogger("scraper")
+
+PROFILE_ROOT = os.getenv("SCRAPER_BROWSER_PROFILE_DIR") or None
+MAX_BYTES = int(float(os.getenv("SCRAPER_BROWSER_PROFILE_MAX_MB", "500")) * 1024 * 1024)
+
+# 크기 초과 시 먼저 지우는 폴더 (쿠키 / 설정은 남김)
+CACHE_DIRS = (
+    os.path.join("Default", "Cache"),
+    os.path.join("Default", "Code Cache"),
+    os.path.join("Default", "Service Worker", "CacheStorage"),
+    "GrShaderCache",
+    "ShaderCache",
+)
+
+
+def dir_size(path: str) -> int:
+    total = 0
+    for base, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(base, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+class ProfilePool:
+    def __init__(self, root: str, max_bytes: int = MAX_BYTES, check_interval: float = 60.0):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.check_interval = check_interval
+        self._checked: Dict[str, float] = {}
+        os.makedirs(root, exist_ok=True)
+
+    def _try_lock(self, slot: str) -> bool:
+        try:
+            fd = os.open(slot + ".lock", os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if self._stale(slot + ".lock"):
+                os.remove(slot + ".lock")
+                return self._try_lock(slot)
+            return False
+        with os.fdopen(fd, "w") as f:
+            f.write(str(os.getpid()))
+        return True
+
+    @staticmethod
+    def _stale(lock_path: str) -> bool:
+        """잠근 프로세스가 죽었으면 stale"""
+        try:
+            with open(lock_path) as f:
+                pid = int(f.read().strip() or 0)
+            os.kill(pid, 0)
+        except (OSError, ValueError):
+            return True
+        return False
+
+    @contextmanager
+    def acquire(self):
+        """빈 슬롯 경로를 잠그고 넘겨줌, 끝나면 크기 정리 후 반납"""
+        i = 0
+        while not self._try_lock(os.path.join(self.root, f"slot-{i}")):
+            i += 1
+        slot = os.path.join(self.root, f"slot-{i}")
+        try:
+            yield slot
+        finally:
+            try:
+                self.cleanup(slot)
+            finally:
+                os.remove(slot + ".lock")
+
+    def cleanup(self, slot: str, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._checked.get(slot, float("-inf")) < self.check_interval:
+            return
+        self._checked[slot] = now
+
+        size = dir_size(slot)
+        if size <= self.max_bytes:
+            return
+
+        for sub in CACHE_DIRS:
+            shutil.rmtree(os.path.join(slot, sub), ignore_errors=True)
+        after = dir_size(slot)
+        if after > self.max_bytes:
+            shutil.rmtree(slot, ignore_errors=True)
+            after = 0
+        logger.info(f"Browser profile {slot}: {size / 1e6:.0f}MB → {after / 1e6:.0f}MB")
+
+
+_pools: Dict[str, ProfilePool] = {}
+
+
+def get_pool(root: Optional[str] = None) -> Optional[ProfilePool]:
+    """root(또는 SCRAPER_BROWSER_PROFILE_DIR) 별 프로세스 전역 pool, 설정 없으면 None"""
+    root = root or PROFILE_ROOT
+    if not root:
+        return None
+    if root not in _pools:
+        _pools[root] = ProfilePool(root)
+    return _pools[root]
@@ -0,0 +1,115 @@
+# browser_recycle.py
+
+"""
+오래 도는 워커의 브라우저 재시작 (메모리 상한)
+- 브라우저 1개가 처리한 작업 수와 브라우저 프로세스 트리 RSS 를 추적
+- 작업 max_jobs 개를 넘기거나 RSS 가 max_rss 를 넘으면 재시작 대상 →
+  워커는 새 작업을 안 받고 진행 중 작업이 끝나길 기다린 뒤 브라우저를 닫고 다시 띄움
+- RSS = 워커 프로세스의 자식 프로세스 전체 (Playwright 드라이버 + Chromium 브라우저 / 렌더러 / GPU)
+  psutil(requirements)로 측정, 없으면 /proc 에서 직접 (둘 다 안 되면 경고 1번 남기고 작업 수 기준만)
+
+환경변수:
+    SCRAPER_BROWSER_MAX_JOBS     브라우저 1개당 최대 작업 수 (기본 50, 0 이면 제한 없음)
+    SCRAPER_BROWSER_MAX_RSS_MB   브라우저 프로세스 트리 최대 RSS (기본 1500, 0 이면 제한 없음)
+"""
+
+import logging
+import os
+import time
+from typing import Optional
+
+logger = logging.getLogger("scraper")
+
+MAX_JOBS = int(os.getenv("SCRAPER_BROWSER_MAX_JOBS", "50"))
+MAX_RSS = int(float(os.getenv("SCRAPER_BROWSER_MAX_RSS_MB", "1500")) * 1024 * 1024)
+
+
+def _children_rss_psutil(pid: int) -> int:
+    import psutil
+
+    total = 0
+    for child in psutil.Process(pid).children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            pass
+    return total
+
+
+def _children_rss_proc(pid: int) -> Optional[int]:
+    if not os.path.isdir("/proc"):
+        return None
+
+    children = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat") as f:
+                # comm 에 공백 / 괄호가 있을 수 있어서 마지막 ')' 뒤에서 자름
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(name))
+
+    page = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    stack = list(children.get(pid, []))
+    while stack:
+        child = stack.pop()
+        try:
+            with open(f"/proc/{child}/statm") as f:
+                total += int(f.read().split()[1]) * page
+        except (OSError, ValueError, IndexError):
+            pass
+        stack.extend(children.get(child, []))
+    return total
+
+
+def children_rss(pid: Optional[int] = None) -> Optional[int]:
+    """pid(기본: 현재 프로세스) 의 모든 자식 프로세스 RSS 합 (bytes), 측정 불가면 None"""
+    pid = pid or os.getpid()
+    try:
+        return _children_rss_psutil(pid)
+    except ImportError:
+        return _children_rss_proc(pid)
+
+
+class BrowserRecycler:
+    def __init__(self, max_jobs: int = MAX_JOBS, max_rss: int = MAX_RSS, sample_interval: float = 5.0):
+        self.max_jobs = max_jobs
+        self.max_rss = max_rss
+        self.sample_interval = sample_interval
+        self.jobs = 0
+        self.recycles = 0
+        self.rss: Optional[int] = None
+        self._sampled = float("-inf")
+        self._warned = False
+
+    def sample(self) -> Optional[int]:
+        """RSS 측정 (sample_interval 초에 1번만 실제로 읽음)"""
+        now = time.monotonic()
+        if now - self._sampled >= self.sample_interval:
+            self._sampled = now
+            self.rss = children_rss()
+            if self.rss is None and self.max_rss and not self._warned:
+                self._warned = True
+                logger.warning("Cannot read browser RSS (install psutil), recycling by job count only")
+        return self.rss
+
+    def job_started(self):
+        self.jobs += 1
+
+    def reason(self) -> Optional[str]:
+        """재시작해야 하면 이유, 아니면 None"""
+        if self.max_jobs and self.jobs >= self.max_jobs:
+            return f"{self.jobs} jobs"
+        if self.max_rss and self.rss is not None and self.rss >= self.max_rss:
+            return f"rss {self.rss / 1e6:.0f}MB"
+        return None
+
+    def recycled(self):
+        self.jobs = 0
+        self.recycles += 1
+        self.rss = None
+        self._sampled = float("-inf")
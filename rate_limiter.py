@@ -0,0 +1,168 @@
+# rate_limiter.py
+
+"""
+네이버 요청 속도 제한 (호스트별 토큰 버킷)
+- 버킷 상태를 로컬 sqlite 파일에 두고 워커 프로세스들이 같이 씀
+  (BEGIN IMMEDIATE 로 읽고-빼고-쓰기를 원자적으로)
+- 토큰을 미리 "예약" 하고 부족하면 그만큼 기다림 → 요청이 몰려도 순서대로 분산
+  (max_wait 보다 오래 기다려야 하면 예약하지 않고 RateLimitWait 예외)
+- sqlite 작업은 asyncio.to_thread 로 (잠금 대기가 이벤트 루프를 막지 않게)
+- 차단 페이지("현재 서비스 접속이 불가합니다")가 보이면 penalize() 로 속도를 절반으로,
+  이후 recover_seconds 동안 원래 속도로 선형 회복
+
+환경변수:
+    NAVER_RATE_PER_SEC   초당 요청 수 (기본 2, 0 이면 제한 없음)
+    NAVER_RATE_BURST     버킷 크기 (기본 5)
+    NAVER_RATE_DB        sqlite 파일 경로 (기본: 임시 폴더)
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from typing import Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger("scraper")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    host TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL,
+    rate REAL NOT NULL
+)
+"""
+
+
+class RateLimitWait(Exception):
+    """max_wait 안에 토큰이 안 생김 (토큰은 예약하지 않음)"""
+
+    def __init__(self, host: str, wait: float):
+        super().__init__(f"{host}: would wait {wait:.1f}s")
+        self.host = host
+        self.wait = wait
+
+
+def host_of(url_or_host: str) -> str:
+    if "://" in url_or_host:
+        return urlparse(url_or_host).hostname or url_or_host
+    return url_or_host
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        min_rate: float = 0.1,
+        recover_seconds: float = 300.0,
+    ):
+        self.path = path or os.getenv(
+            "NAVER_RATE_DB", os.path.join(tempfile.gettempdir(), "smartstore_ratelimit.sqlite3")
+        )
+        self.rate = float(os.getenv("NAVER_RATE_PER_SEC", "2")) if rate is None else rate
+        self.burst = float(os.getenv("NAVER_RATE_BURST", "5")) if burst is None else burst
+        self.min_rate = min_rate
+        self.recover_seconds = recover_seconds
+
+        if self.enabled:
+            db = self._connect()
+            try:
+                db.execute(SCHEMA)
+            finally:
+                db.close()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def _load(self, db, host: str, now: float):
+        row = db.execute("SELECT tokens, updated, rate FROM buckets WHERE host = ?", (host,)).fetchone()
+        if row is None:
+            return self.burst, self.rate
+
+        tokens, updated, rate = row
+        elapsed = max(0.0, now - updated)
+
+        # 차단 후 낮춘 속도 선형 회복
+        rate = min(self.rate, rate + self.rate * elapsed / self.recover_seconds)
+        tokens = min(self.burst, tokens + elapsed * rate)
+        return tokens, rate
+
+    def _save(self, db, host: str, tokens: float, now: float, rate: float):
+        db.execute(
+            "INSERT OR REPLACE INTO buckets (host, tokens, updated, rate) VALUES (?, ?, ?, ?)",
+            (host, tokens, now, rate),
+        )
+
+    def reserve(self, host: str, max_wait: Optional[float] = None) -> float:
+        """
+        토큰 1개 예약, 기다려야 할 초 반환
+        max_wait 초보다 오래 기다려야 하면 버킷은 그대로 두고 RateLimitWait
+        """
+        host = host_of(host)
+        db = self._connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            tokens, rate = self._load(db, host, now)
+            tokens -= 1
+            wait = max(0.0, -tokens / rate)
+            if max_wait is not None and wait > max_wait:
+                db.execute("ROLLBACK")
+                raise RateLimitWait(host, wait)
+            self._save(db, host, tokens, now, rate)
+            db.execute("COMMIT")
+        finally:
+            db.close()
+
+        return wait
+
+    def penalize(self, host: str, factor: float = 0.5):
+        """차단 감지 → 속도를 factor 배로 낮추고 남은 토큰을 비움"""
+        if not self.enabled:
+            return 0.0
+        host = host_of(host)
+        db = self._connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            tokens, rate = self._load(db, host, now)
+            rate = max(self.min_rate, rate * factor)
+            self._save(db, host, min(tokens, 0.0), now, rate)
+            db.execute("COMMIT")
+        finally:
+            db.close()
+
+        logger.warning(f"Rate limit lowered for {host}: {rate:.2f} req/s")
+        return rate
+
+    async def acquire(self, host: str, max_wait: Optional[float] = None):
+        """
+        토큰이 생길 때까지 대기
+        max_wait 초 안에 차례가 안 오면 토큰을 쓰지 않고 RateLimitWait (일찍 보내지 않음)
+        """
+        if not self.enabled:
+            return 0.0
+        wait = await asyncio.to_thread(self.reserve, host, max_wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+_limiter: Optional[RateLimiter] = None
+
+
+def get_limiter() -> RateLimiter:
+    """프로세스 전역 limiter (상태는 sqlite 로 프로세스 간 공유)"""
+    global _limiter
+    if _limiter is None:
+        _limiter = RateLimiter()
+    return _limiter
@@ -0,0 +1,206 @@
+# review_batch.py
+
+"""
+ReviewBatch : 리뷰를 컬럼 단위로 저장하는 컨테이너
+- 리뷰 1개 = 7키 dict 를 수십만 개 들고 있으면 메모리가 너무 큼
+- 반복되는 문자열 컬럼(date / rating / option / auto_label)은 딕셔너리 인코딩
+  (고유값 리스트 + array('i') 코드)
+- 정수 컬럼(image_count)은 array 버퍼
+- 파생 컬럼(date_iso 등)은 원본 컬럼의 고유값마다 1번만 계산하고 코드 버퍼를 공유
+- DataFrame / Parquet / JSON 출력은 버퍼를 그대로 넘겨서 변환
+"""
+
+import json
+from array import array
+
+COLUMNS = ("nickname", "date", "rating", "option", "auto_label", "content", "image_count")
+
+# 딕셔너리 인코딩 컬럼 (값이 계속 반복됨)
+DICT_COLUMNS = ("date", "rating", "option", "auto_label")
+
+# 고유값이 대부분인 문자열 컬럼 (그냥 리스트, intern 해도 아낄 게 없음)
+STR_COLUMNS = ("nickname", "content")
+
+# 정수 컬럼
+INT_COLUMNS = ("image_count",)
+
+
+class ReviewBatch:
+    """
+    parse_review_card() 결과 dict 를 컬럼 단위로 쌓는 컨테이너
+    append / extend 로 쌓고, to_records / to_dataframe / to_parquet / to_json 으로 출력
+    """
+
+    def __init__(self, records=None):
+        self._strings = {col: [] for col in STR_COLUMNS}
+        self._codes = {col: array("i") for col in DICT_COLUMNS}
+        self._values = {col: [] for col in DICT_COLUMNS}
+        self._index = {col: {} for col in DICT_COLUMNS}
+        self._ints = {col: array("i") for col in INT_COLUMNS}
+        # 파생 컬럼: col -> (원본 딕셔너리 컬럼, 고유값별 변환값), 변환 함수는 따로 보관
+        self._derived = {}
+        self._derive_fns = {}
+        self._size = 0
+        # 수집 메타데이터 (truncated, last_page 등) - 컬럼과 무관
+        self.meta = {}
+
+        if records:
+            self.extend(records)
+
+    # ------------------------------------------------------------
+    # 쌓기
+    # ------------------------------------------------------------
+    def append(self, info: dict):
+        for col in STR_COLUMNS:
+            self._strings[col].append(info.get(col) or "")
+
+        for col in DICT_COLUMNS:
+            value = info.get(col) or ""
+            index = self._index[col]
+            code = index.get(value)
+            if code is None:
+                code = len(self._values[col])
+                index[value] = code
+                self._values[col].append(value)
+                self._derive_new(col, value)
+            self._codes[col].append(code)
+
+        for col in INT_COLUMNS:
+            self._ints[col].append(int(info.get(col) or 0))
+
+        self._size += 1
+
+    def _derive_new(self, source: str, value: str):
+        # 정규화 뒤에 새 고유값이 들어오면 그 값만 변환해서 파생 컬럼에 추가
+        for col, (src, values) in self._derived.items():
+            if src == source:
+                values.append(self._derive_fns[col](value))
+
+    def extend(self, records):
+        for info in records:
+            self.append(info)
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        return iter(self.to_records())
+
+    def __getitem__(self, i: int) -> dict:
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("ReviewBatch index out of range")
+        row = {}
+        for col in self.columns:
+            if col in self._derived:
+                source, values = self._derived[col]
+                row[col] = values[self._codes[source][i]]
+            elif col in self._strings:
+                row[col] = self._strings[col][i]
+            elif col in self._codes:
+                row[col] = self._values[col][self._codes[col][i]]
+            else:
+                row[col] = self._ints[col][i]
+        return row
+
+    # ------------------------------------------------------------
+    # 컬럼 접근
+    # ------------------------------------------------------------
+    @property
+    def columns(self) -> tuple:
+        extra = tuple(col for col in self._derived if col not in COLUMNS)
+        return COLUMNS + extra
+
+    def add_derived(self, col: str, source: str, fn):
+        """
+        딕셔너리 컬럼(source)의 고유값마다 fn(값)을 붙여서 파생 컬럼 생성
+        col 이 기존 컬럼 이름이면 출력 시 원본 대신 변환값이 나감 (예: rating → int)
+        이후 append 로 새 고유값이 들어오면 그 값만 fn 으로 변환해서 이어 붙임
+        """
+        if source not in self._values:
+            raise KeyError(source)
+        self._derived[col] = (source, [fn(v) for v in self._values[source]])
+        self._derive_fns[col] = fn
+
+    def column(self, col: str) -> list:
+        """컬럼을 파이썬 리스트로 복원"""
+        if col in self._derived:
+            source, values = self._derived[col]
+            return [values[c] for c in self._codes[source]]
+        if col in self._strings:
+            return list(self._strings[col])
+        if col in self._codes:
+            values = self._values[col]
+            return [values[c] for c in self._codes[col]]
+        if col in self._ints:
+            return self._ints[col].tolist()
+        raise KeyError(col)
+
+    def categories(self, col: str):
+        """딕셔너리 인코딩 컬럼의 (고유값 리스트, 코드 버퍼)"""
+        return self._values[col], self._codes[col]
+
+    # ------------------------------------------------------------
+    # 출력
+    # ------------------------------------------------------------
+    def to_records(self, fields=None) -> list:
+        """API 응답용 dict 리스트, fields 를 주면 그 컬럼만 (나머지는 복원도 안 함)"""
+        names = self.columns
+        if fields:
+            unknown = [col for col in fields if col not in names]
+            if unknown:
+                raise KeyError(", ".join(unknown))
+            names = tuple(fields)
+        cols = [self.column(col) for col in names]
+        return [dict(zip(names, row)) for row in zip(*cols)]
+
+    def to_dataframe(self):
+        """
+        pandas DataFrame 변환
+        - 딕셔너리 인코딩 컬럼 → Categorical (코드 버퍼를 numpy 로 그대로 감쌈)
+        - 정수 컬럼 → int32 (array 버퍼 공유)
+        - 파생 컬럼 → 고유값 배열을 코드로 take (행 단위 파이썬 루프 없음)
+        """
+        import numpy as np
+        import pandas as pd
+
+        data = {}
+        for col in self.columns:
+            if col in self._derived:
+                source, values = self._derived[col]
+                codes = np.frombuffer(self._codes[source], dtype=np.int32)
+                data[col] = pd.array(values).take(codes)
+            elif col in self._strings:
+                data[col] = self._strings[col]
+            elif col in self._codes:
+                codes = np.frombuffer(self._codes[col], dtype=np.int32)
+                data[col] = pd.Categorical.from_codes(codes, categories=self._values[col])
+            else:
+                data[col] = np.frombuffer(self._ints[col], dtype=np.int32)
+        return pd.DataFrame(data, columns=list(self.columns))
+
+    def to_csv(self, path: str):
+        self.to_dataframe().to_csv(path, index=False, encoding="utf-8-sig")
+
+    def to_parquet(self, path: str):
+        # Categorical 은 parquet dictionary 컬럼으로 그대로 저장됨 (pyarrow 필요)
+        self.to_dataframe().to_parquet(path, index=False)
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_records(), ensure_ascii=False)
+
+    def write_json(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+
+    def write(self, path: str, fmt: str = "csv"):
+        """fmt: csv / json / parquet"""
+        if fmt == "csv":
+            self.to_csv(path)
+        elif fmt == "parquet":
+            self.to_parquet(path)
+        elif fmt == "json":
+            self.write_json(path)
+        else:
+            raise ValueError(f"unknown format: {fmt}")
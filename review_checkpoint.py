@@ -0,0 +1,98 @@
+# review_checkpoint.py
+
+"""
+긴 페이지네이션 체크포인트 / 재개
+- 페이지 1장 수집이 끝날 때마다 기록 → 73페이지에서 죽으면 74페이지부터 재개
+- <dir>/<key>.jsonl : 페이지마다 {"page": n, "reviews": [...]} 한 줄 append (emit 된 리뷰)
+- <dir>/<key>.json  : 상품 / URL / 옵션 / 마지막 완료 페이지 / 완료 페이지 목록 / 중복키 수
+- 중복 제거 상태(seen)는 jsonl 의 리뷰로 다시 만듦 (review_key 그대로)
+- key = 상품 id + 옵션(sort / ratings / media_only / 쿠키 identity) 해시 → 옵션이나 계정이 다르면 다른 체크포인트
+- record_page 는 탭 여러 개가 스레드에서 같이 부를 수 있음 → lock
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List
+
+
+class Checkpoint:
+    def __init__(self, directory: str, url: str, product_id: str, options: Dict[str, Any]):
+        self.directory = directory
+        self.url = url
+        self.product_id = product_id
+        self.options = options
+
+        digest = hashlib.sha1(json.dumps(options, sort_keys=True, default=str).encode()).hexdigest()[:8]
+        self.key = f"{product_id}_{digest}"
+        self.state_path = os.path.join(directory, f"{self.key}.json")
+        self.pages_path = os.path.join(directory, f"{self.key}.jsonl")
+
+        os.makedirs(directory, exist_ok=True)
+        self.pages_done: List[int] = []
+        self.seen = set()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------
+    # 읽기
+    # ------------------------------------------------------------
+    def load(self, review_key) -> Dict[int, List[Dict[str, Any]]]:
+        """저장된 {페이지: 리뷰 리스트}, 중간에 잘린 마지막 줄은 잘라냄 (이후 append 가 깨지지 않게)"""
+        pages = {}
+        if not os.path.exists(self.pages_path):
+            return pages
+
+        good = 0
+        with open(self.pages_path, "rb+") as f:
+            for line in f:
+                try:
+                    row = json.loads(line.decode("utf-8"))
+                except ValueError:
+                    f.truncate(good)
+                    break
+                pages[row["page"]] = row["reviews"]
+                good += len(line)
+
+        self.pages_done = sorted(pages)
+        for reviews in pages.values():
+            self.seen.update(review_key(info) for info in reviews)
+        return pages
+
+    # ------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------
+    def record_page(self, n: int, reviews: List[Dict[str, Any]], review_key):
+        line = json.dumps({"page": n, "reviews": reviews}, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.pages_path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+            self.pages_done.append(n)
+            self.seen.update(review_key(info) for info in reviews)
+            self._write_state()
+
+    def _write_state(self):
+        state = {
+            "url": self.url,
+            "product_id": self.product_id,
+            "options": self.options,
+            "last_page": max(self.pages_done) if self.pages_done else 0,
+            "pages_done": sorted(self.pages_done),
+            "seen": len(self.seen),
+            "updated": time.time(),
+        }
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, default=str)
+        os.replace(tmp, self.state_path)
+
+    def clear(self):
+        for path in (self.state_path, self.pages_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self.pages_done = []
+        self.seen = set()
@@ -0,0 +1,205 @@
+# review_cli.py
+
+"""
+SmartStore 리뷰 수집 통합 CLI
+- 1.py / 2.py / 3.py / smartstore_review_scraper.py 처럼 소스를 고치지 않고
+  페이지 수, 추출 엔진, 파서, 동시성, 출력 형식, headless 를 옵션으로 조정
+- 실제 수집은 smartstore_review_api.scrape_reviews (async Playwright) 사용
+
+사용법:
+    python review_cli.py https://smartstore.naver.com/maca-mall/products/12491774443 --pages 100
+    python review_cli.py URL1 URL2 --concurrency 2 --format parquet --output-dir out/
+    python review_cli.py --url-file urls.txt --concurrency 8 --output-dir out/   # manifest.json 생성
+    python review_cli.py URL --engine inbrowser --no-headless --cookies cookies.json
+    python review_cli.py URL --sort rating_low --rating 1 2     # 저평점 리뷰만
+    python review_cli.py URL --pages 200 --tabs 4               # 탭 4개로 페이지 구간 병렬 수집
+    python review_cli.py URL --pages 100 --checkpoint-dir ckpt/ --resume   # 실패한 페이지부터 재개
+    python review_cli.py URL --profile --trace                  # profiles/<job_id>/ 에 프로파일 + trace
+    python review_cli.py URL --browser-profile-dir bprof/       # 브라우저 디스크 캐시 재사용
+    python review_cli.py URL --snapshot-dir snap/        # 페이지 HTML 저장
+    python review_cli.py --replay snap/ --parser html.parser   # 저장된 HTML 다시 파싱
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from contextlib import nullcontext
+
+FORMATS = ("csv", "json", "parquet")
+
+
+# ================================
+# 출력
+# ================================
+def output_path(args, url: str) -> str:
+    from smartstore_review_api import product_id_from_url
+
+    if args.output and len(args.urls) <= 1:
+        return args.output
+    os.makedirs(args.output_dir, exist_ok=True)
+    return os.path.join(args.output_dir, f"{product_id_from_url(url)}.{args.format}")
+
+
+def scrape_options(args) -> dict:
+    return dict(
+        engine=args.engine,
+        parser=args.parser,
+        sort=args.sort,
+        ratings=args.rating,
+        media_only=args.media_only,
+        tabs=args.tabs,
+        deadline_seconds=args.deadline,
+        checkpoint_dir=args.checkpoint_dir,
+        resume=args.resume,
+        trace_dir=args.trace_dir,
+        user_data_dir=args.browser_profile_dir,
+    )
+
+
+def load_cookies(path):
+    if not path:
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ================================
+# 수집
+# ================================
+async def run_urls(args) -> int:
+    from smartstore_review_api import product_id_from_url, scrape_reviews
+
+    cookie_data = load_cookies(args.cookies)
+
+    # URL 여러 개 → 브라우저 1개 + context N개 동시 수집
+    if len(args.urls) > 1:
+        from review_crawl import crawl_products
+
+        manifest = await crawl_products(
+            args.urls,
+            args.pages,
+            cookie_data,
+            args.output_dir,
+            fmt=args.format,
+            concurrency=args.concurrency,
+            headless=args.headless,
+            snapshot_dir=args.snapshot_dir,
+            **scrape_options(args),
+        )
+        return manifest["reviews"]
+
+    url = args.urls[0]
+    start = time.perf_counter()
+    batch = await scrape_reviews(
+        url,
+        args.pages,
+        cookie_data,
+        headless=args.headless,
+        snapshot_dir=os.path.join(args.snapshot_dir, product_id_from_url(url)) if args.snapshot_dir else None,
+        **scrape_options(args),
+    )
+    path = output_path(args, url)
+    batch.write(path, args.format)
+    truncated = " ⏱ 시간 초과로 중단" if batch.meta.get("truncated") else ""
+    print(f"✅ {url} → {path} ({len(batch)}개, {time.perf_counter() - start:.1f}s){truncated}")
+    if args.timings:
+        print(json.dumps(batch.meta.get("timings", {}), ensure_ascii=False, indent=2))
+    return len(batch)
+
+
+def run_replay(args) -> int:
+    from smartstore_review_api import replay_snapshots
+
+    batch = replay_snapshots(args.replay, args.parser)
+    path = args.output or os.path.join(args.output_dir, f"replay.{args.format}")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    batch.write(path, args.format)
+    print(f"✅ replay {args.replay} → {path} ({len(batch)}개)")
+    return len(batch)
+
+
+# ================================
+# 인자
+# ================================
+def build_parser() -> argparse.ArgumentParser:
+    from review_options import ENGINES, PARSERS, SORTS
+
+    parser = argparse.ArgumentParser(description="SmartStore review scraper CLI")
+    parser.add_argument("urls", nargs="*", help="상품 URL (여러 개 가능)")
+    parser.add_argument("--url-file", help="상품 URL 목록 파일 (한 줄에 1개)")
+    parser.add_argument("--pages", type=int, default=10, help="최대 수집 페이지 수 (기본 10)")
+    parser.add_argument("--engine", choices=ENGINES, default="dom", help="추출 엔진")
+    parser.add_argument("--parser", choices=PARSERS, default="lxml", help="BeautifulSoup 파서 (dom 엔진/replay)")
+    parser.add_argument("--sort", choices=list(SORTS), help="위젯 정렬 (페이지 넘기기 전에 적용)")
+    parser.add_argument("--rating", type=int, nargs="+", choices=range(1, 6), help="별점 필터 (예: --rating 1 2)")
+    parser.add_argument("--media-only", action="store_true", help="포토/동영상 리뷰만")
+    parser.add_argument("--tabs", type=int, default=1, help="상품 1개를 탭 K개로 페이지 구간 나눠 동시 수집")
+    parser.add_argument("--deadline", type=float, help="상품당 시간 예산(초), 넘으면 모은 만큼만 저장")
+    parser.add_argument("--checkpoint-dir", help="페이지마다 체크포인트 기록 폴더")
+    parser.add_argument("--resume", action="store_true", help="체크포인트의 다음 페이지부터 이어서 수집")
+    parser.add_argument("--profile", action="store_true", help="Python 프로파일 저장 (profiles/<job_id>/)")
+    parser.add_argument("--trace", action="store_true", help="--profile 과 같이: Playwright trace zip 도 저장")
+    parser.add_argument("--timings", action="store_true", help="단계별 소요시간(ms) 출력")
+    parser.add_argument("--profile-dir", help="프로파일 저장 폴더 (기본 SCRAPER_PROFILE_DIR 또는 profiles)")
+    parser.add_argument(
+        "--browser-profile-dir", help="Chromium 영구 프로필 루트 (디스크 캐시 재사용, 기본 SCRAPER_BROWSER_PROFILE_DIR)"
+    )
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 수집할 상품 수 (브라우저 1개, context N개)")
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--output", help="출력 파일 (URL 1개일 때)")
+    parser.add_argument("--output-dir", default=".", help="URL 여러 개일 때 상품별 출력 + manifest.json 폴더")
+    parser.add_argument("--cookies", help="네이버 로그인 쿠키 JSON")
+    parser.add_argument("--snapshot-dir", help="페이지별 HTML 저장 폴더")
+    parser.add_argument("--replay", metavar="DIR", help="저장된 HTML 을 브라우저 없이 다시 파싱")
+    parser.add_argument("--headless", action=argparse.BooleanOptionalAction, default=True)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.resume and not args.checkpoint_dir:
+        parser.error("--resume 은 --checkpoint-dir 과 같이 써야 합니다")
+
+    if args.url_file:
+        from review_crawl import read_url_file
+
+        args.urls = list(dict.fromkeys(args.urls + read_url_file(args.url_file)))
+
+    if not args.urls and not args.replay:
+        parser.error("URL 또는 --replay 가 필요합니다")
+
+    if args.trace and not args.profile:
+        parser.error("--trace 는 --profile 과 같이 써야 합니다 (trace zip 은 프로파일 폴더에 저장)")
+    if args.trace and len(args.urls) > 1 and args.concurrency > 1:
+        from browser_profile import PROFILE_ROOT
+
+        if args.browser_profile_dir or PROFILE_ROOT:
+            # 영구 프로필은 상품들이 context 1개를 같이 씀 → tracing.start 가 겹침
+            parser.error("영구 프로필로 --trace 를 쓰려면 --concurrency 1 이어야 합니다")
+
+    profiler = None
+    if args.profile:
+        from review_profiling import RequestProfiler
+
+        profiler = RequestProfiler(base_dir=args.profile_dir, trace=args.trace)
+    args.trace_dir = profiler.trace_dir if profiler else None
+
+    start = time.perf_counter()
+    with profiler or nullcontext():
+        if args.replay:
+            total = run_replay(args)
+        else:
+            total = asyncio.run(run_urls(args))
+
+    print(f"\n총 {total}개 리뷰, {time.perf_counter() - start:.1f}s")
+    if profiler:
+        print(f"📊 프로파일: {profiler.dir} ({', '.join(profiler.summary()['files'])})")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
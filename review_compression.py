@@ -0,0 +1,89 @@
+# review_compression.py
+
+"""
+API 응답 압축
+- Accept-Encoding 에 zstd 가 있고(q > 0) zstandard 가 설치돼 있으면 zstd, 아니면 gzip (Starlette GZipMiddleware)
+- zstandard 는 선택 의존성 (requirements 에 없음, pip install zstandard 하면 켜짐)
+- 리뷰 JSON 은 닉네임 / 옵션 / 날짜가 반복돼서 압축률이 높음
+- minimum_size 보다 작은 응답, 이미 Content-Encoding 이 있는 응답은 그대로
+- zstd 는 응답 body 를 모아서 한 번에 압축 (/scrape, /jobs 결과처럼 한 번에 끝나는 응답용)
+- passthrough_paths 는 압축하지 않음 (NDJSON 스트리밍처럼 줄 단위로 바로 나가야 하는 응답)
+"""
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - 선택 의존성
+    zstandard = None
+
+
+def accepts(accept_encoding: str, coding: str) -> bool:
+    """
+    Accept-Encoding 에 coding 이 q > 0 으로 있는지 ("zstd;q=0" 은 거절)
+    q 가 없으면 1, 잘못된 q 는 0 으로 봄. "*" 는 보지 않음 (zstd 는 명시한 클라이언트에만)
+    """
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value.strip())
+                except ValueError:
+                    q = 0.0
+        if name == coding:
+            return q > 0
+    return False
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = 1000, gzip_level: int = 6, zstd_level: int = 3, passthrough_paths=()):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.passthrough_paths = set(passthrough_paths)
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size, compresslevel=gzip_level)
+        self.zstd = zstandard.ZstdCompressor(level=zstd_level) if zstandard else None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.passthrough_paths:
+            await self.app(scope, receive, send)
+            return
+        if scope["type"] == "http" and self.zstd:
+            accept = Headers(scope=scope).get("accept-encoding", "")
+            if accepts(accept, "zstd"):
+                await self._zstd(scope, receive, send)
+                return
+        await self.gzip(scope, receive, send)
+
+    async def _zstd(self, scope, receive, send):
+        start = None
+        chunks = []
+
+        async def wrapped(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            headers = MutableHeaders(raw=start["headers"])
+            if len(body) >= self.minimum_size and "content-encoding" not in headers:
+                body = self.zstd.compress(body)
+                headers["Content-Encoding"] = "zstd"
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, wrapped)
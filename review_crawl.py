@@ -0,0 +1,125 @@
+# review_crawl.py
+
+"""
+여러 상품 동시 수집 (URL 목록 파일)
+- 브라우저 1개를 띄우고 상품마다 async context 를 열어서 N개씩 동시에 수집
+- 상품별 출력 파일 + manifest.json (상품별 상태/개수/소요시간)
+- 전체 처리량 출력 (products/min, reviews/sec)
+- user_data_dir(영구 프로필)이 있으면 영구 context 1개에 상품마다 탭을 열어서 수집 (캐시 공유)
+
+URL 파일 형식: 한 줄에 URL 1개, 빈 줄과 # 주석은 무시
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import List, Optional
+
+
+def read_url_file(path: str) -> List[str]:
+    urls = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                urls.append(line)
+    # 순서 유지하면서 중복 제거
+    return list(dict.fromkeys(urls))
+
+
+async def crawl_products(
+    urls: List[str],
+    limit_pages: int,
+    cookie_data: dict,
+    out_dir: str,
+    fmt: str = "csv",
+    concurrency: int = 4,
+    headless: Optional[bool] = None,
+    snapshot_dir: Optional[str] = None,
+    **scrape_opts,
+) -> dict:
+    """scrape_opts 는 scrape_reviews 로 그대로 전달 (engine / parser / sort / ratings / media_only)"""
+    from contextlib import nullcontext
+
+    from playwright.async_api import async_playwright
+
+    from browser_profile import get_pool
+    from smartstore_review_api import launch_browser, launch_persistent, product_id_from_url, scrape_reviews
+
+    os.makedirs(out_dir, exist_ok=True)
+    sem = asyncio.Semaphore(max(1, concurrency))
+    entries = []
+
+    async def one(browser, url):
+        async with sem:
+            pid = product_id_from_url(url)
+            entry = {"url": url, "product_id": pid, "status": "ok", "count": 0, "seconds": 0.0}
+            start = time.perf_counter()
+            try:
+                batch = await scrape_reviews(
+                    url,
+                    limit_pages,
+                    cookie_data,
+                    snapshot_dir=os.path.join(snapshot_dir, pid) if snapshot_dir else None,
+                    browser=browser,
+                    **scrape_opts,
+                )
+                path = os.path.join(out_dir, f"{pid}.{fmt}")
+                batch.write(path, fmt)
+                entry.update(
+                    count=len(batch),
+                    output=os.path.basename(path),
+                    truncated=batch.meta.get("truncated", False),
+                    blocked=batch.meta.get("blocked", False),
+                    last_page=batch.meta.get("last_page", 0),
+                )
+                print(f"✅ {pid}: {len(batch)}개")
+            except Exception as e:
+                entry.update(status="error", error=repr(e))
+                print(f"❌ {pid}: {e!r}")
+            entry["seconds"] = round(time.perf_counter() - start, 2)
+            entries.append(entry)
+
+    pool = get_pool(scrape_opts.pop("user_data_dir", None))
+
+    start = time.perf_counter()
+    async with async_playwright() as p:
+        with pool.acquire() if pool else nullcontext() as slot:
+            if slot:
+                browser = await launch_persistent(p, slot, headless)
+            else:
+                browser = await launch_browser(p, headless)
+            try:
+                await asyncio.gather(*(one(browser, url) for url in urls))
+            finally:
+                await browser.close()
+    elapsed = time.perf_counter() - start
+
+    # 입력 순서대로 정렬
+    order = {url: i for i, url in enumerate(urls)}
+    entries.sort(key=lambda e: order[e["url"]])
+
+    reviews = sum(e["count"] for e in entries)
+    ok = sum(1 for e in entries if e["status"] == "ok")
+    manifest = {
+        "products": len(urls),
+        "succeeded": ok,
+        "failed": len(urls) - ok,
+        "reviews": reviews,
+        "seconds": round(elapsed, 2),
+        "products_per_min": round(len(urls) / elapsed * 60, 2) if elapsed else 0.0,
+        "reviews_per_sec": round(reviews / elapsed, 2) if elapsed else 0.0,
+        "concurrency": concurrency,
+        "entries": entries,
+    }
+
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    print("\n====================================")
+    print(f"상품 {ok}/{len(urls)} 성공, 리뷰 {reviews}개, {elapsed:.1f}s")
+    print(f"처리량: {manifest['products_per_min']} products/min, {manifest['reviews_per_sec']} reviews/sec")
+    print(f"📁 {os.path.join(out_dir, 'manifest.json')}")
+    print("====================================")
+    return manifest
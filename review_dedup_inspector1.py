@@ -1,9 +1,6 @@
 # review_dedup_inspector1.py (중복 리뷰 추적 버전)
 
 import time
-import pandas as pd
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
 
 
 def parse_review_card(card):
@@ -67,6 +64,9 @@ def parse_review_card(card):
 
 
 def extract_reviews_debug(url, limit_pages=12):
+    from bs4 import BeautifulSoup
+    from playwright.sync_api import sync_playwright
+
     seen = {}
     duplicates = []
 
@@ -0,0 +1,108 @@
+# review_flight.py
+
+"""
+같은 상품 동시 요청 합치기 (single-flight)
+- key = 상품 id + 결과에 영향을 주는 옵션 → 진행 중인 수집이 있으면 새로 띄우지 않고 거기에 붙음
+- 수집은 별도 task 로 돌아서 처음 요청한 클라이언트가 끊겨도 나머지는 결과를 받음
+- 스트리밍: 페이지가 끝날 때마다 Flight.page() 로 이벤트를 쌓아 둠 →
+  늦게 붙은 클라이언트는 이미 나온 페이지부터 다시 받고 이후 페이지를 이어서 받음
+- 페이지 이벤트는 flight 안에서 review_key 로 중복 제거 + 정규화한 ReviewBatch (클라이언트마다 fields 만 다르게 출력)
+  워커 모드 스트리밍은 워커가 이미 만든 리뷰 dict 리스트를 push() 로 그대로 넣음 ({"page": n, "records": [...]})
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+import review_metrics as metrics
+from review_batch import ReviewBatch
+from review_normalize import normalize_batch
+
+logger = logging.getLogger("scraper")
+
+
+class Flight:
+    def __init__(self, key: Hashable, review_key: Callable[[dict], str]):
+        self.key = key
+        self.review_key = review_key
+        self.events: List[Dict[str, Any]] = []
+        self.seen = set()
+        self.joiners = 1
+        self.task: Optional[asyncio.Task] = None
+        # 워커 모드면 큐 작업 id (deadline 으로 먼저 돌아간 요청이 /jobs/{id} 로 결과를 받을 수 있게)
+        self.job_id: Optional[str] = None
+        self._changed = asyncio.Event()
+
+    # ------------------------------------------------------------
+    # 수집 쪽
+    # ------------------------------------------------------------
+    def page(self, n: int, reviews: List[Dict[str, Any]]):
+        """scrape_reviews(on_page=...) 콜백: 새 리뷰만 정규화해서 이벤트로 쌓음"""
+        fresh = []
+        for info in reviews:
+            key = self.review_key(info)
+            if key not in self.seen:
+                self.seen.add(key)
+                fresh.append(info)
+        self.events.append({"page": n, "batch": normalize_batch(ReviewBatch(fresh))})
+        self._notify()
+
+    def push(self, event: Dict[str, Any]):
+        """이미 정리된 페이지 이벤트 그대로 추가 (워커가 만든 records)"""
+        self.events.append(event)
+        self._notify()
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    # ------------------------------------------------------------
+    # 받는 쪽
+    # ------------------------------------------------------------
+    @property
+    def finished(self) -> bool:
+        return self.task is not None and self.task.done()
+
+    async def follow(self):
+        """이미 나온 페이지부터 순서대로, 수집이 끝날 때까지"""
+        i = 0
+        while True:
+            while i < len(self.events):
+                yield self.events[i]
+                i += 1
+            if self.finished:
+                return
+            await self._changed.wait()
+
+    async def wait(self):
+        """수집 결과 (예외면 그대로 raise), 기다리던 요청이 취소돼도 수집은 계속"""
+        return await asyncio.shield(self.task)
+
+
+class SingleFlight:
+    def __init__(self, review_key: Callable[[dict], str]):
+        self.review_key = review_key
+        self.flights: Dict[Hashable, Flight] = {}
+
+    def join(self, key: Hashable, start: Callable[[Flight], Awaitable[Any]]) -> Flight:
+        """key 로 진행 중인 flight 에 붙거나, 없으면 start(flight) 로 새로 시작"""
+        flight = self.flights.get(key)
+        if flight is not None:
+            flight.joiners += 1
+            metrics.COALESCED.inc()
+            logger.info(f"Joined in-flight scrape {key} ({flight.joiners} requests)")
+            return flight
+
+        flight = Flight(key, self.review_key)
+        self.flights[key] = flight
+        flight.task = asyncio.create_task(self._run(flight, start))
+        # task 가 done 이 된 뒤에 깨워야 follow() 가 끝을 봄
+        flight.task.add_done_callback(lambda _: flight._notify())
+        return flight
+
+    async def _run(self, flight: Flight, start):
+        try:
+            return await start(flight)
+        finally:
+            # 끝난 뒤 들어오는 요청은 새로 수집
+            self.flights.pop(flight.key, None)
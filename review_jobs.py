@@ -0,0 +1,474 @@
+# review_jobs.py
+
+"""
+멀티 프로세스 워커 모드 (SCRAPER_WORKERS=N)
+- API 프로세스는 작업을 sqlite 큐에 넣기만 함 → 이벤트 루프가 파싱(BeautifulSoup)으로 막히지 않음
+- 워커 프로세스 N개가 각자 브라우저 1개를 띄우고 큐에서 작업을 가져가서 처리 (코어 수만큼 확장)
+- 감독(WorkerSupervisor)이 1초마다 워커 생존 확인 → 죽은 워커가 잡고 있던 작업은 다시 queued,
+  워커는 재시작. 같은 작업이 MAX_ATTEMPTS 번 워커를 죽이면 error 로 종료
+- 큐 / 워커 상태가 sqlite 파일이라 API 가 재시작돼도 queued 작업은 남음
+- 워커는 작업 수 / RSS 기준으로 브라우저를 재시작 (browser_recycle.py), 상태는 workers 테이블 → /metrics
+- 워커 안의 Prometheus 메트릭은 prometheus multiprocess 모드로 /metrics 에 합쳐짐 (review_metrics.py)
+- 스트리밍 작업(params["stream"])은 페이지가 끝날 때마다 job_pages 테이블에 한 줄 → API 가 읽어서 NDJSON 으로
+- 영구 프로필(SCRAPER_BROWSER_PROFILE_DIR) 워커는 context 가 1개라 쿠키가 작업끼리 섞이지 않게
+  동시 작업 1개, 작업마다 쿠키를 비우고 시작
+- 업로드된 쿠키(session_id 없이 온 요청)는 작업 행의 cookies 컬럼에만 두고 작업이 끝나면(done / error) 지움
+  (세션 등록소에 남기지 않음), sqlite 파일은 0600 으로 만듦
+- 스트리밍 페이지(job_pages)는 API 가 다 읽으면 지우고, 못 읽고 끝난 작업 것은 PAGES_TTL_SECONDS 뒤에 정리
+- API 프로세스(이벤트 루프)에서 부르는 메서드는 호출하는 쪽에서 asyncio.to_thread 로
+
+환경변수:
+    SCRAPER_WORKERS            워커 프로세스 수 (0 또는 미설정이면 기존처럼 API 프로세스에서 바로 수집)
+    SCRAPER_WORKER_CONCURRENCY 워커 1개가 동시에 처리할 작업 수 (기본 2, 브라우저 1개에 context N개)
+    SCRAPER_JOB_DB             sqlite 파일 경로 (기본: 임시 폴더)
+"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import review_metrics as metrics
+from review_json import dumps, loads
+
+logger = logging.getLogger("scraper")
+
+WORKERS = int(os.getenv("SCRAPER_WORKERS", "0"))
+WORKER_CONCURRENCY = int(os.getenv("SCRAPER_WORKER_CONCURRENCY", "2"))
+MAX_ATTEMPTS = 3
+POLL_SECONDS = 0.5
+# 끝난 작업의 스트리밍 페이지를 남겨 두는 시간 (API 가 못 읽고 끊긴 경우)
+PAGES_TTL_SECONDS = 600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    params TEXT NOT NULL,
+    cookies TEXT,
+    result TEXT,
+    error TEXT,
+    status_code INTEGER,
+    worker INTEGER,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created);
+CREATE TABLE IF NOT EXISTS job_pages (
+    job_id TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    reviews TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS job_pages_job ON job_pages (job_id);
+CREATE TABLE IF NOT EXISTS workers (
+    id INTEGER PRIMARY KEY,
+    pid INTEGER,
+    started REAL,
+    heartbeat REAL,
+    running INTEGER NOT NULL DEFAULT 0,
+    jobs_done INTEGER NOT NULL DEFAULT 0,
+    restarts INTEGER NOT NULL DEFAULT 0,
+    rss_bytes INTEGER,
+    browser_jobs INTEGER NOT NULL DEFAULT 0,
+    recycles INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+# ============================================================
+# 큐
+# ============================================================
+class JobQueue:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("SCRAPER_JOB_DB", os.path.join(tempfile.gettempdir(), "smartstore_jobs.sqlite3"))
+        if not os.path.exists(self.path):
+            # 작업 행에 쿠키가 잠깐 들어가므로 소유자만 읽게 (WAL 파일도 같은 권한)
+            os.close(os.open(self.path, os.O_CREAT | os.O_WRONLY, 0o600))
+        db = self._connect()
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+        finally:
+            db.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def submit(self, params: Dict[str, Any], cookies: Optional[List[Dict[str, Any]]] = None) -> str:
+        """cookies: 정규화된 쿠키 (session_id 없이 업로드된 경우만), 작업이 끝나면 지워짐"""
+        job_id = uuid.uuid4().hex[:16]
+        db = self._connect()
+        try:
+            db.execute(
+                "INSERT INTO jobs (id, status, params, cookies, created) VALUES (?, 'queued', ?, ?, ?)",
+                (
+                    job_id,
+                    json.dumps(params, ensure_ascii=False),
+                    json.dumps(cookies, ensure_ascii=False) if cookies is not None else None,
+                    time.time(),
+                ),
+            )
+        finally:
+            db.close()
+        return job_id
+
+    def claim(self, worker_id: int) -> Optional[Dict[str, Any]]:
+        """가장 오래된 queued 작업 1개를 running 으로 (BEGIN IMMEDIATE 로 워커끼리 원자적)"""
+        db = self._connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute(
+                "SELECT id, params, cookies FROM jobs WHERE status = 'queued' ORDER BY created LIMIT 1"
+            ).fetchone()
+            if row is None:
+                db.execute("COMMIT")
+                return None
+            db.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, started = ?, attempts = attempts + 1 WHERE id = ?",
+                (worker_id, time.time(), row[0]),
+            )
+            db.execute("COMMIT")
+        finally:
+            db.close()
+        return {"id": row[0], "params": json.loads(row[1]), "cookies": json.loads(row[2]) if row[2] else None}
+
+    def finish(self, job_id: str, worker_id: int, result: Dict[str, Any]):
+        self._close_job(
+            job_id, worker_id, "UPDATE jobs SET status = 'done', result = ?, cookies = NULL, finished = ? WHERE id = ?",
+            (dumps(result).decode("utf-8"), time.time(), job_id),
+        )
+
+    def fail(self, job_id: str, worker_id: int, error: str, status_code: int = 500):
+        self._close_job(
+            job_id,
+            worker_id,
+            "UPDATE jobs SET status = 'error', error = ?, status_code = ?, cookies = NULL, finished = ? WHERE id = ?",
+            (error, status_code, time.time(), job_id),
+        )
+
+    def _close_job(self, job_id, worker_id, sql, args):
+        db = self._connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            db.execute(sql, args)
+            db.execute("UPDATE workers SET jobs_done = jobs_done + 1 WHERE id = ?", (worker_id,))
+            db.execute("COMMIT")
+        finally:
+            db.close()
+
+    def requeue(self, worker_id: Optional[int] = None) -> int:
+        """죽은 워커(None 이면 전부)의 running 작업을 다시 queued, 시도 초과분은 error"""
+        where, args = ("status = 'running'", ()) if worker_id is None else ("status = 'running' AND worker = ?", (worker_id,))
+        db = self._connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            db.execute(
+                "UPDATE jobs SET status = 'error', error = 'worker crashed', status_code = 500, cookies = NULL, "
+                f"finished = ? WHERE {where} AND attempts >= ?",
+                (time.time(), *args, MAX_ATTEMPTS),
+            )
+            n = db.execute(f"UPDATE jobs SET status = 'queued', worker = NULL WHERE {where}", args).rowcount
+            db.execute("COMMIT")
+        finally:
+            db.close()
+        return n
+
+    def get(self, job_id: str, raw: bool = False) -> Optional[Dict[str, Any]]:
+        """raw=True 면 result 를 파싱하지 않고 저장된 JSON 문자열 그대로 (응답에 바로 붙임)"""
+        db = self._connect()
+        try:
+            row = db.execute(
+                "SELECT status, result, error, status_code, worker, attempts, created, started, finished "
+                "FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        finally:
+            db.close()
+        if row is None:
+            return None
+
+        status, result, error, status_code, worker, attempts, created, started, finished = row
+        job = {
+            "job_id": job_id,
+            "status": status,
+            "worker": worker,
+            "attempts": attempts,
+            "created": created,
+            "started": started,
+            "finished": finished,
+        }
+        if status == "done":
+            job["result"] = result if raw else loads(result)
+        elif status == "error":
+            job.update(error=error, status_code=status_code)
+        return job
+
+    def add_page(self, job_id: str, page: int, reviews: List[Dict[str, Any]]):
+        """스트리밍 작업의 페이지 1장 (워커 → API)"""
+        db = self._connect()
+        try:
+            db.execute(
+                "INSERT INTO job_pages (job_id, page, reviews) VALUES (?, ?, ?)",
+                (job_id, page, dumps(reviews).decode("utf-8")),
+            )
+        finally:
+            db.close()
+
+    def pages(self, job_id: str, after: int = 0) -> List[tuple]:
+        """after(rowid) 다음에 들어온 페이지들 [(rowid, page, 리뷰 JSON 문자열)]"""
+        db = self._connect()
+        try:
+            return db.execute(
+                "SELECT rowid, page, reviews FROM job_pages WHERE job_id = ? AND rowid > ? ORDER BY rowid",
+                (job_id, after),
+            ).fetchall()
+        finally:
+            db.close()
+
+    def drop_pages(self, job_id: str):
+        """API 가 스트리밍 페이지를 다 읽은 뒤"""
+        db = self._connect()
+        try:
+            db.execute("DELETE FROM job_pages WHERE job_id = ?", (job_id,))
+        finally:
+            db.close()
+
+    def expire_pages(self, max_age: float = PAGES_TTL_SECONDS) -> int:
+        """끝난 지 max_age 초가 지난 작업의 남은 스트리밍 페이지 삭제 (읽던 API 가 끊긴 경우)"""
+        db = self._connect()
+        try:
+            return db.execute(
+                "DELETE FROM job_pages WHERE job_id IN "
+                "(SELECT id FROM jobs WHERE status IN ('done', 'error') AND finished < ?)",
+                (time.time() - max_age,),
+            ).rowcount
+        finally:
+            db.close()
+
+    async def wait(self, job_id: str, poll: float = POLL_SECONDS, raw: bool = False) -> Dict[str, Any]:
+        """API 이벤트 루프에서 쓰는 대기 (sqlite 조회는 스레드에서)"""
+        while True:
+            job = await asyncio.to_thread(self.get, job_id, raw)
+            if job is None or job["status"] in ("done", "error"):
+                return job
+            await asyncio.sleep(poll)
+
+    # ------------------------------------------------------------
+    # 워커 상태
+    # ------------------------------------------------------------
+    def worker_started(self, worker_id: int, pid: int, restart: bool):
+        db = self._connect()
+        try:
+            db.execute(
+                "INSERT INTO workers (id, pid, started, heartbeat) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET pid = excluded.pid, started = excluded.started, "
+                "heartbeat = excluded.heartbeat, running = 0, restarts = restarts + ?",
+                (worker_id, pid, time.time(), time.time(), int(restart)),
+            )
+        finally:
+            db.close()
+
+    def heartbeat(self, worker_id: int, running: int, rss: Optional[int] = None, browser_jobs: int = 0, recycles: int = 0):
+        db = self._connect()
+        try:
+            db.execute(
+                "UPDATE workers SET heartbeat = ?, running = ?, rss_bytes = ?, browser_jobs = ?, recycles = ? WHERE id = ?",
+                (time.time(), running, rss, browser_jobs, recycles, worker_id),
+            )
+        finally:
+            db.close()
+
+    def workers(self):
+        db = self._connect()
+        db.row_factory = sqlite3.Row
+        try:
+            return [dict(r) for r in db.execute("SELECT * FROM workers ORDER BY id")]
+        finally:
+            db.close()
+
+    def counts(self) -> Dict[str, int]:
+        db = self._connect()
+        try:
+            return dict(db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        finally:
+            db.close()
+
+
+# ============================================================
+# 워커 프로세스
+# ============================================================
+def worker_main(worker_id: int, db_path: str, concurrency: int):
+    """워커 프로세스 진입점 (spawn)"""
+    logging.basicConfig(level=logging.INFO, format=f"[%(asctime)s] %(levelname)s: [worker {worker_id}] %(message)s")
+    asyncio.run(_worker_loop(worker_id, JobQueue(db_path), concurrency))
+
+
+async def _worker_loop(worker_id: int, queue: JobQueue, concurrency: int):
+    from contextlib import nullcontext
+
+    from playwright.async_api import async_playwright
+
+    from browser_profile import get_pool
+    from browser_recycle import BrowserRecycler
+    from smartstore_review_api import launch_browser, launch_persistent
+
+    pool = get_pool()
+    recycler = BrowserRecycler()
+    running = set()
+    if pool and concurrency > 1:
+        # 영구 프로필은 context 1개를 같이 씀 → 동시에 돌리면 작업끼리 쿠키가 섞임
+        logger.info(f"Worker {worker_id}: persistent profile, running 1 job at a time")
+        concurrency = 1
+
+    async with async_playwright() as p:
+        with pool.acquire() if pool else nullcontext() as slot:
+
+            async def launch():
+                return await (launch_persistent(p, slot) if slot else launch_browser(p))
+
+            browser = await launch()
+            logger.info(f"Worker {worker_id} ready (pid={os.getpid()})")
+            try:
+                while True:
+                    rss = recycler.sample()
+                    # sqlite 호출은 스레드에서 (같은 루프의 다른 작업이 멈추지 않게)
+                    await asyncio.to_thread(
+                        queue.heartbeat, worker_id, len(running), rss, recycler.jobs, recycler.recycles
+                    )
+
+                    reason = recycler.reason()
+                    if reason:
+                        # 새 작업은 안 받고 진행 중 작업이 끝나면 재시작
+                        if running:
+                            await asyncio.sleep(POLL_SECONDS)
+                            continue
+                        logger.info(f"Recycling browser ({reason})")
+                        await browser.close()
+                        if slot:
+                            # 브라우저가 닫힌 사이에 프로필 크기 정리 (워커가 안 죽으면 반납 시점이 안 옴)
+                            await asyncio.to_thread(pool.cleanup, slot, True)
+                        browser = await launch()
+                        recycler.recycled()
+                        continue
+
+                    job = await asyncio.to_thread(queue.claim, worker_id) if len(running) < concurrency else None
+                    if job is None:
+                        await asyncio.sleep(POLL_SECONDS)
+                        continue
+
+                    if slot:
+                        # 이전 작업의 로그인 쿠키를 다음 작업에 넘기지 않음 (캐시는 유지)
+                        await browser.clear_cookies()
+                    recycler.job_started()
+                    task = asyncio.create_task(_run_job(worker_id, queue, job, browser))
+                    running.add(task)
+                    task.add_done_callback(running.discard)
+            finally:
+                await browser.close()
+
+
+async def _run_job(worker_id: int, queue: JobQueue, job: Dict[str, Any], browser):
+    from fastapi import HTTPException
+
+    from smartstore_review_api import run_scrape_job
+
+    params = job["params"]
+    # profile=true 면 프로파일 결과 폴더 이름이 작업 id (GET /jobs/{id} 와 맞춤)
+    params["job_id"] = job["id"]
+    logger.info(f"Job {job['id']}: {params['url']}")
+    on_page = _page_writer(queue, job["id"], params.get("fields")) if params.get("stream") else None
+    # 업로드된 쿠키는 작업 행에서 (등록된 세션이면 None → scrape_job 이 session_id 로 읽음)
+    cookie_data = {"cookies": job["cookies"], "normalized": True} if job["cookies"] is not None else None
+    try:
+        result = await run_scrape_job(params, cookie_data, browser=browser, on_page=on_page)
+    except HTTPException as e:
+        await asyncio.to_thread(queue.fail, job["id"], worker_id, str(e.detail), e.status_code)
+    except Exception as e:
+        logger.error(f"Job {job['id']} failed: {e!r}")
+        await asyncio.to_thread(queue.fail, job["id"], worker_id, f"스크래핑 오류: {e!r}")
+    else:
+        await asyncio.to_thread(queue.finish, job["id"], worker_id, result)
+
+
+def _page_writer(queue: JobQueue, job_id: str, fields):
+    """scrape_reviews(on_page=...) → job_pages (Flight.page 와 같게: 작업 안에서 중복 제거 + 정규화)"""
+    from review_batch import ReviewBatch
+    from review_normalize import normalize_batch
+    from smartstore_review_api import review_key
+
+    seen = set()
+
+    def on_page(n, reviews):
+        fresh = []
+        for info in reviews:
+            key = review_key(info)
+            if key not in seen:
+                seen.add(key)
+                fresh.append(info)
+        queue.add_page(job_id, n, normalize_batch(ReviewBatch(fresh)).to_records(fields))
+
+    return on_page
+
+
+# ============================================================
+# 감독
+# ============================================================
+class WorkerSupervisor:
+    def __init__(self, workers: int, queue: JobQueue, concurrency: int = WORKER_CONCURRENCY):
+        self.n = workers
+        self.queue = queue
+        self.concurrency = concurrency
+        self.procs: Dict[int, multiprocessing.Process] = {}
+        self._ctx = multiprocessing.get_context("spawn")
+        self._task: Optional[asyncio.Task] = None
+
+    def _spawn(self, worker_id: int, restart: bool = False):
+        proc = self._ctx.Process(
+            target=worker_main, args=(worker_id, self.queue.path, self.concurrency), daemon=True
+        )
+        proc.start()
+        self.procs[worker_id] = proc
+        self.queue.worker_started(worker_id, proc.pid, restart)
+
+    async def start(self):
+        # 이전 API 프로세스가 남긴 running 작업 복구
+        n = await asyncio.to_thread(self.queue.requeue)
+        if n:
+            logger.warning(f"Requeued {n} jobs left running by a previous run")
+        for i in range(self.n):
+            self._spawn(i)
+        self._task = asyncio.create_task(self._watch())
+        logger.info(f"Started {self.n} scrape workers")
+
+    async def _watch(self):
+        last_expire = 0.0
+        while True:
+            await asyncio.sleep(1)
+            for worker_id, proc in list(self.procs.items()):
+                if proc.is_alive():
+                    continue
+                n = await asyncio.to_thread(self.queue.requeue, worker_id)
+                metrics.mark_process_dead(proc.pid)
+                logger.warning(f"Worker {worker_id} exited ({proc.exitcode}), requeued {n} jobs, restarting")
+                await asyncio.to_thread(self._spawn, worker_id, True)
+
+            if time.time() - last_expire > 60:
+                last_expire = time.time()
+                await asyncio.to_thread(self.queue.expire_pages)
+
+    async def stop(self, timeout: float = 10):
+        if self._task:
+            self._task.cancel()
+        for proc in self.procs.values():
+            proc.terminate()
+        for proc in self.procs.values():
+            await asyncio.to_thread(proc.join, timeout)
+        self.procs.clear()
@@ -0,0 +1,43 @@
+# review_json.py
+
+"""
+빠른 JSON 직렬화 (리뷰 응답용)
+- orjson 이 있으면 orjson.dumps (C 구현, bytes 로 바로 출력), 없으면 표준 json
+- FastJSONResponse 를 엔드포인트에서 직접 반환하면 FastAPI 의 jsonable_encoder 단계를 건너뜀
+  (리뷰 dict 수만 개를 한 번 더 복사 / 순회하지 않음)
+- 벤치마크: bench_json.py
+"""
+
+import json
+
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 선택 의존성
+    orjson = None
+
+
+if orjson is not None:
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    loads = orjson.loads
+
+else:
+
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+    loads = json.loads
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def raw_response(body: bytes, status_code: int = 200) -> Response:
+    """이미 직렬화된 JSON bytes 를 그대로 응답 (큐에 저장된 작업 결과 등)"""
+    return Response(content=body, status_code=status_code, media_type="application/json")
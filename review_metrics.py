@@ -0,0 +1,186 @@
+# review_metrics.py
+
+"""
+Prometheus 메트릭 (/metrics)
+- 단계별 소요시간 히스토그램: 브라우저 실행, goto, 리뷰탭 탐색, iframe 탐색, 페이지 파싱, 페이지 이동 대기
+- 카운터: 페이지 수, 파싱한 카드 수, 중복 제거 수, 차단 페이지 수, 에러(타입별)
+- 게이지: 진행 중 스크래핑 수, 열린 context 수
+- 워커 모드: 워커별 브라우저 RSS / 현재 브라우저 작업 수 / 브라우저 재시작 횟수 (workers 테이블에서 갱신)
+- 워커 모드면 prometheus multiprocess 모드: 프로세스마다 PROMETHEUS_MULTIPROC_DIR 에 값을 쓰고
+  /metrics 가 전부 합쳐서 출력 (워커 프로세스에서 센 페이지 / 카드 / 에러도 보임)
+  PROMETHEUS_MULTIPROC_DIR 를 안 주면 SCRAPER_WORKERS > 0 일 때 임시 폴더를 만들어서 씀
+  (prometheus_client import 전에 설정해야 하고, spawn 한 워커는 환경변수를 물려받음)
+prometheus_client 가 없으면 같은 인터페이스의 no-op 으로 대체 (CLI 는 설치 없이 동작)
+ScrapeTimings: 요청 1건의 단계별 ms (/scrape 응답의 timings 블록)
+"""
+
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+if int(os.getenv("SCRAPER_WORKERS", "0") or 0) > 0 and not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+    # API 프로세스 pid 별 폴더 → 재시작하면 이전 실행 값이 섞이지 않음
+    _multiproc_dir = os.path.join(tempfile.gettempdir(), f"smartstore_metrics_{os.getpid()}")
+    os.makedirs(_multiproc_dir, exist_ok=True)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = _multiproc_dir
+
+MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR") or None
+
+try:
+    from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+    from prometheus_client import multiprocess
+
+    ENABLED = True
+except ImportError:  # pragma: no cover - 선택 의존성
+    ENABLED = False
+
+
+class _NoopTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _NoopMetric:
+    def labels(self, *args, **kwargs):
+        return self
+
+    def observe(self, value):
+        pass
+
+    def inc(self, amount=1):
+        pass
+
+    def dec(self, amount=1):
+        pass
+
+    def set(self, value):
+        pass
+
+    def time(self):
+        return _NoopTimer()
+
+    def track_inprogress(self):
+        return _NoopTimer()
+
+
+# 브라우저 실행 / goto 는 초 단위, 페이지 단위 작업은 짧음
+SLOW_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 60, 120)
+FAST_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10)
+
+
+def _histogram(name, doc, buckets):
+    return Histogram(name, doc, buckets=buckets) if ENABLED else _NoopMetric()
+
+
+def _counter(name, doc, labels=()):
+    return Counter(name, doc, labels) if ENABLED else _NoopMetric()
+
+
+def _gauge(name, doc, labels=(), mode="livesum"):
+    # mode: multiprocess 모드에서 프로세스별 값을 합치는 방법 (아니면 무시됨)
+    return Gauge(name, doc, labels, multiprocess_mode=mode) if ENABLED else _NoopMetric()
+
+
+BROWSER_LAUNCH = _histogram("scraper_browser_launch_seconds", "Chromium launch time", SLOW_BUCKETS)
+GOTO = _histogram("scraper_goto_seconds", "Product page navigation time", SLOW_BUCKETS)
+REVIEW_TAB = _histogram("scraper_review_tab_seconds", "Time to find and click the REVIEW tab", SLOW_BUCKETS)
+IFRAME = _histogram("scraper_iframe_seconds", "Time to discover the review iframe", SLOW_BUCKETS)
+PAGE_PARSE = _histogram("scraper_page_parse_seconds", "Per-page scroll + card extraction time", FAST_BUCKETS)
+PAGE_NAV = _histogram("scraper_page_nav_seconds", "Per-page pagination click + wait time", FAST_BUCKETS)
+
+PAGES = _counter("scraper_pages_total", "Review pages collected")
+CARDS = _counter("scraper_cards_parsed_total", "Review cards parsed")
+DUPLICATES = _counter("scraper_duplicates_dropped_total", "Reviews dropped as duplicates")
+BLOCKS = _counter("scraper_block_pages_total", "Naver block pages / block statuses seen")
+ERRORS = _counter("scraper_errors_total", "Scrape errors by exception type", ("type",))
+COALESCED = _counter("scraper_coalesced_requests_total", "Requests that joined an in-flight scrape")
+
+INFLIGHT = _gauge("scraper_inflight_scrapes", "Scrapes in progress")
+OPEN_CONTEXTS = _gauge("scraper_open_contexts", "Open browser contexts")
+
+# workers 테이블 값을 API 프로세스가 /metrics 때 써 넣음 → 가장 최근 값
+WORKER_RSS = _gauge(
+    "scraper_worker_browser_rss_bytes", "Browser process tree RSS per worker", ("worker",), "mostrecent"
+)
+WORKER_BROWSER_JOBS = _gauge(
+    "scraper_worker_browser_jobs", "Jobs served by the current browser per worker", ("worker",), "mostrecent"
+)
+WORKER_RECYCLES = _gauge(
+    "scraper_worker_browser_recycles", "Browser recycles since worker start", ("worker",), "mostrecent"
+)
+WORKER_RESTARTS = _gauge("scraper_worker_restarts", "Worker process restarts", ("worker",), "mostrecent")
+
+
+def update_workers(rows):
+    """워커 프로세스는 따로 떠 있으므로 /metrics 요청 때 workers 테이블 값으로 갱신"""
+    for row in rows:
+        worker = str(row["id"])
+        if row["rss_bytes"] is not None:
+            WORKER_RSS.labels(worker).set(row["rss_bytes"])
+        WORKER_BROWSER_JOBS.labels(worker).set(row["browser_jobs"])
+        WORKER_RECYCLES.labels(worker).set(row["recycles"])
+        WORKER_RESTARTS.labels(worker).set(row["restarts"])
+
+
+class ScrapeTimings:
+    """
+    요청 1건의 단계별 소요시간(ms)
+    - phase(): launch / navigation / review_tab / frame (탭 여러 개면 탭별 합계)
+    - pages: 페이지별 scroll_ms / parse_ms / nav_ms / cards / duplicates
+    히스토그램을 같이 넘기면 같은 측정값을 /metrics 에도 기록
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.pages = {}
+
+    @contextmanager
+    def phase(self, name: str, histogram=None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed * 1000
+            if histogram is not None:
+                histogram.observe(elapsed)
+
+    @contextmanager
+    def page_phase(self, n: int, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.page(n)[name] = (time.perf_counter() - start) * 1000
+
+    def page(self, n: int) -> dict:
+        return self.pages.setdefault(n, {"page": n})
+
+    def to_dict(self) -> dict:
+        out = {name: round(ms, 1) for name, ms in self.phases.items()}
+        out["pages"] = [
+            {k: round(v, 1) if isinstance(v, float) else v for k, v in self.pages[n].items()}
+            for n in sorted(self.pages)
+        ]
+        return out
+
+
+def mark_process_dead(pid: int):
+    """죽은 워커의 live* 게이지 파일 정리 (multiprocess 모드에서만)"""
+    if ENABLED and MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid)
+
+
+def render():
+    """(body, content_type)"""
+    if not ENABLED:
+        return b"# prometheus_client not installed\n", "text/plain; charset=utf-8"
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,100 @@
+# review_normalize.py
+
+"""
+date / rating 정규화
+- parse_review_card() 의 date("24.11.25."), rating("5") 는 문자열 그대로 나옴
+- 고유값 단위로만 파싱하고(lru_cache 메모) 결과는 코드 버퍼로 펼침
+  · ReviewBatch : 딕셔너리 인코딩 고유값만 변환 → 파생 컬럼
+  · DataFrame   : category 로 바꿔서 카테고리만 변환 → take
+- 추가 컬럼: date_iso ("2024-11-25"), date_ordinal (date.toordinal(), 없으면 0)
+- rating 은 int 로 교체 (없으면 None)
+"""
+
+from datetime import date
+from functools import lru_cache
+from typing import Optional
+
+
+# ================================
+# 값 1개 파싱 (메모)
+# ================================
+@lru_cache(maxsize=8192)
+def parse_review_date(raw: str) -> Optional[date]:
+    """
+    "24.11.25." / "2024.11.25." / "24.11.25" → date(2024, 11, 25)
+    파싱 불가 → None
+    """
+    parts = [p for p in (raw or "").strip().split(".") if p.strip()]
+    if len(parts) != 3 or not all(p.strip().isdigit() for p in parts):
+        return None
+
+    year, month, day = (int(p) for p in parts)
+    if year < 100:
+        year += 2000
+
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=256)
+def parse_rating(raw: str) -> Optional[int]:
+    digits = "".join(c for c in (raw or "") if c.isdigit())
+    return int(digits) if digits else None
+
+
+def _date_iso(raw: str) -> str:
+    d = parse_review_date(raw)
+    return d.isoformat() if d else ""
+
+
+def _date_ordinal(raw: str) -> int:
+    d = parse_review_date(raw)
+    return d.toordinal() if d else 0
+
+
+# normalize_batch 가 추가하는 컬럼
+DERIVED_COLUMNS = ("date_iso", "date_ordinal")
+
+
+# ================================
+# ReviewBatch 일괄 정규화
+# ================================
+def normalize_batch(batch):
+    """ReviewBatch 에 date_iso / date_ordinal 파생 컬럼을 붙이고 rating 을 int 로 교체"""
+    batch.add_derived("date_iso", "date", _date_iso)
+    batch.add_derived("date_ordinal", "date", _date_ordinal)
+    batch.add_derived("rating", "rating", parse_rating)
+    return batch
+
+
+# ================================
+# DataFrame 일괄 정규화
+# ================================
+def normalize_frame(df):
+    """
+    reviews.csv 등에서 읽은 DataFrame 용 (리뷰 1행씩 파싱하지 않음)
+    - date / rating 을 category 로 바꿔서 카테고리 값만 파싱 → 코드로 take
+    - 1.py / 2.py / 3.py 의 reviews.csv 출력에서 사용
+    """
+    import numpy as np
+    import pandas as pd
+
+    if "date" not in df or "rating" not in df:
+        # 리뷰 0개
+        return df
+
+    dates = df["date"].fillna("").astype(str).astype("category")
+    cats = dates.cat.categories
+    codes = dates.cat.codes.to_numpy()
+
+    iso = np.array([_date_iso(v) for v in cats], dtype=object)
+    ordinal = np.array([_date_ordinal(v) for v in cats], dtype=np.int32)
+    df["date_iso"] = iso[codes]
+    df["date_ordinal"] = ordinal[codes]
+
+    ratings = df["rating"].fillna("").astype(str).astype("category")
+    values = pd.array([parse_rating(v) for v in ratings.cat.categories], dtype="Int8")
+    df["rating"] = values.take(ratings.cat.codes.to_numpy())
+    return df
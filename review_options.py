@@ -0,0 +1,38 @@
+# review_options.py
+
+"""
+수집 옵션 상수 / 헬퍼 (의존성 없음)
+- review_cli 의 --help / 인자 검증이 FastAPI / pydantic / prometheus 를 import 하지 않도록 분리
+- smartstore_review_api 도 여기서 가져다 씀
+"""
+
+from typing import List
+
+# 추출 엔진 (smartstore_review_api 5-1 참고)
+ENGINES = ("dom", "inbrowser", "network")
+
+# BeautifulSoup 파서 (requirements 에 있는 것만: lxml, 내장 html.parser)
+PARSERS = ("lxml", "html.parser")
+
+# 위젯 정렬 → 버튼 라벨
+SORTS = {
+    "ranking": "랭킹순",
+    "newest": "최신순",
+    "rating_high": "평점 높은순",
+    "rating_low": "평점 낮은순",
+}
+
+
+def split_page_ranges(first: int, last: int, k: int) -> List[tuple]:
+    """[first, last] 를 겹치지 않는 연속 구간 최대 k 개로 (tabs 옵션: 탭마다 1구간)"""
+    total = last - first + 1
+    k = max(1, min(k, total))
+    size, extra = divmod(total, k)
+
+    ranges = []
+    start = first
+    for i in range(k):
+        end = start + size - 1 + (1 if i < extra else 0)
+        ranges.append((start, end))
+        start = end + 1
+    return ranges
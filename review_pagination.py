@@ -0,0 +1,122 @@
+# review_pagination.py
+
+"""
+리뷰 페이지네이션 (1~10 페이지 그룹 + 다음/이전 그룹 버튼)
+- 페이지 상태를 JS 1번으로 읽음: 보이는 페이지 번호와 a 태그 index, 현재 페이지, 다음/이전 버튼 index
+- 숫자는 정확히 일치하는 링크만 클릭 ('a:has-text("1")' 은 "10", "11" 에도 걸림)
+- 10 페이지 그룹을 넘어가면 "다음" 버튼으로 그룹 이동
+- smartstore_review_api 의 goto_review_page(async) 와 1.py / 2.py / 3.py / smartstore_review_scraper.py 의
+  click_next_page(sync) 가 같이 씀
+"""
+
+import time
+
+PAGINATION_SELECTOR = ".LiT9lKOVbw"
+
+# 현재 페이지 링크 찾기 (PAGINATION_STATE_JS 등 앞에 붙여서 씀)
+# 1) aria-current / aria-selected
+# 2) 없으면 class: active / selected / current / on 이 붙은 링크,
+#    그것도 없으면 숫자 링크 중 class 가 혼자만 다른 링크 (난독화 class 대응)
+ACTIVE_PAGE_JS = """
+const activePage = (box) => {
+    const nums = Array.from(box.querySelectorAll("a")).filter((a) => /^\\d+/.test(a.textContent.trim()));
+    let active = nums.find((a) =>
+        a.getAttribute("aria-current") === "true" || a.getAttribute("aria-selected") === "true");
+    if (!active) {
+        active = nums.find((a) => /(^|[\\s_-])(active|selected|current|on)($|[\\s_-])/i.test(a.className));
+    }
+    if (!active && nums.length > 1) {
+        const count = {};
+        nums.forEach((a) => { count[a.className] = (count[a.className] || 0) + 1; });
+        const odd = nums.filter((a) => count[a.className] === 1);
+        if (odd.length === 1) active = odd[0];
+    }
+    return active ? parseInt(active.textContent.trim(), 10) : null;
+};
+"""
+
+# 보이는 페이지 번호들과 각 a 태그 index, 현재 페이지, 다음/이전 버튼 index
+PAGINATION_STATE_JS = """
+(selector) => {
+""" + ACTIVE_PAGE_JS + """
+    const box = document.querySelector(selector);
+    if (!box) return null;
+    const links = Array.from(box.querySelectorAll("a"));
+    const state = { pages: [], current: activePage(box), next: -1, prev: -1 };
+    links.forEach((a, i) => {
+        // 숫자 뒤에 "현재 페이지" 같은 숨김 텍스트가 붙어도 앞자리 숫자로 판단
+        const t = a.textContent.trim();
+        if (/^\\d+/.test(t)) {
+            state.pages.push([parseInt(t, 10), i]);
+        } else if (t.includes("다음")) {
+            state.next = i;
+        } else if (t.includes("이전")) {
+            state.prev = i;
+        }
+    });
+    return state;
+}
+"""
+
+# 클릭 후 이동 확인: 현재 페이지가 n 이면 "page", 첫 리뷰 카드가 바뀌었으면 "card" (둘 중 먼저 되는 쪽)
+PAGE_MOVED_JS = """
+([selector, n, cardSelector, before]) => {
+""" + ACTIVE_PAGE_JS + """
+    const box = document.querySelector(selector);
+    if (box && activePage(box) === n) return "page";
+    const card = document.querySelector(cardSelector);
+    if (before !== null && card && card.textContent.trim().slice(0, 200) !== before) return "card";
+    return false;
+}
+"""
+
+# 보이는 첫 페이지 번호가 바뀔 때까지 (그룹 이동)
+GROUP_CHANGED_JS = """
+([selector, first]) => {
+    const box = document.querySelector(selector);
+    if (!box) return false;
+    const nums = Array.from(box.querySelectorAll("a"))
+        .map((a) => a.textContent.trim())
+        .filter((t) => /^\\d+/.test(t));
+    return nums.length > 0 && parseInt(nums[0], 10) !== first;
+}
+"""
+
+
+# ================================
+# 동기 스크립트용: 다음 페이지로
+# ================================
+def click_next_page(target, n: int, delay: float = 2, timeout_ms: int = 10000) -> bool:
+    """
+    target(page 또는 iframe)에서 페이지 n 으로 이동 (sync playwright)
+    - n 이 보이면 숫자가 정확히 일치하는 링크 클릭
+    - 안 보이고 n 이 보이는 마지막 번호 다음이면 "다음" 버튼으로 그룹을 넘긴 뒤 n 으로
+    n 페이지가 없으면 False
+    """
+    for _ in range(2):
+        state = target.evaluate(PAGINATION_STATE_JS, PAGINATION_SELECTOR)
+        if not state or not state["pages"]:
+            return False
+        if state["current"] == n:
+            return True
+
+        links = target.locator(PAGINATION_SELECTOR).locator("a")
+        index = dict(state["pages"]).get(n)
+        if index is not None:
+            links.nth(index).click()
+            time.sleep(delay)
+            return True
+
+        numbers = [num for num, _ in state["pages"]]
+        if n <= max(numbers) or state["next"] < 0:
+            return False
+
+        links.nth(state["next"]).click()
+        try:
+            target.wait_for_function(GROUP_CHANGED_JS, arg=[PAGINATION_SELECTOR, numbers[0]], timeout=timeout_ms)
+        except Exception:
+            # 마지막 그룹이라 "다음" 이 눌리지 않음
+            return False
+        time.sleep(delay)
+
+    return False
@@ -0,0 +1,96 @@
+# review_profiling.py
+
+"""
+요청 단위 프로파일링 (opt-in)
+- profile=true 일 때만 켜짐 → 꺼져 있으면 아무것도 import / 시작하지 않음
+- Python 프로파일: pyinstrument(샘플링, async 인식, requirements 포함) 이 있으면 사용, 없으면 cProfile
+- 프로파일러는 프로세스 전체를 봄 → 같은 시간에 돌던 다른 요청의 코드도 섞여서 찍힘 (요청 단위가 아님)
+  async with 로 쓰면 프로세스 안의 프로파일 세션을 1개씩 순서대로 (동시 profile=true 요청은 앞 세션이 끝날 때까지 대기)
+- Playwright trace: scrape_reviews(trace_dir=...) 가 context.tracing 으로 trace_<상품id>.zip 저장
+- 결과는 <SCRAPER_PROFILE_DIR>/<job_id>/ 아래에
+    profile.html / profile.txt   (pyinstrument)
+    profile.prof / profile.txt   (cProfile, snakeviz 등으로 열기)
+    trace_<상품id>.zip           (npx playwright show-trace)
+"""
+
+import asyncio
+import io
+import os
+import uuid
+from typing import Optional
+
+PROFILE_DIR = os.getenv("SCRAPER_PROFILE_DIR", "profiles")
+
+# 프로파일 세션 직렬화 (cProfile / pyinstrument 둘 다 동시에 2개를 켜면 충돌)
+_session_lock: Optional[asyncio.Lock] = None
+
+
+class RequestProfiler:
+    def __init__(self, job_id: Optional[str] = None, base_dir: Optional[str] = None, trace: bool = False):
+        self.job_id = job_id or uuid.uuid4().hex[:12]
+        self.dir = os.path.join(base_dir or PROFILE_DIR, self.job_id)
+        self.trace = trace
+        self._profiler = None
+        self._kind = None
+
+    @property
+    def trace_dir(self) -> Optional[str]:
+        return self.dir if self.trace else None
+
+    def __enter__(self):
+        os.makedirs(self.dir, exist_ok=True)
+        try:
+            from pyinstrument import Profiler
+
+            self._profiler = Profiler(async_mode="enabled")
+            self._kind = "pyinstrument"
+        except ImportError:
+            import cProfile
+
+            self._profiler = cProfile.Profile()
+            self._kind = "cprofile"
+
+        if self._kind == "cprofile":
+            self._profiler.enable()
+        else:
+            self._profiler.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._kind == "pyinstrument":
+            self._profiler.stop()
+            with open(os.path.join(self.dir, "profile.html"), "w", encoding="utf-8") as f:
+                f.write(self._profiler.output_html())
+            with open(os.path.join(self.dir, "profile.txt"), "w", encoding="utf-8") as f:
+                f.write(self._profiler.output_text(unicode=True))
+        else:
+            import pstats
+
+            self._profiler.disable()
+            self._profiler.dump_stats(os.path.join(self.dir, "profile.prof"))
+            out = io.StringIO()
+            pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(50)
+            with open(os.path.join(self.dir, "profile.txt"), "w", encoding="utf-8") as f:
+                f.write(out.getvalue())
+        return False
+
+    async def __aenter__(self):
+        global _session_lock
+        if _session_lock is None:
+            _session_lock = asyncio.Lock()
+        await _session_lock.acquire()
+        try:
+            return self.__enter__()
+        except BaseException:
+            _session_lock.release()
+            raise
+
+    async def __aexit__(self, *exc):
+        try:
+            return self.__exit__(*exc)
+        finally:
+            _session_lock.release()
+
+    def summary(self) -> dict:
+        files = sorted(os.listdir(self.dir)) if os.path.isdir(self.dir) else []
+        return {"job_id": self.job_id, "dir": self.dir, "profiler": self._kind, "files": files}
@@ -0,0 +1,159 @@
+# review_sessions.py
+
+"""
+쿠키 세션 등록소
+- POST /sessions 로 쿠키 JSON 을 한 번 올리면 session_id 발급 → /scrape 등은 session_id 만 넘기면 됨
+- 정규화(normalize_cookie)가 끝난 쿠키 리스트를 sqlite 에 저장 (워커 프로세스끼리 공유)
+- SESSION_ENCRYPTION_KEY 가 있으면 Fernet 으로 암호화해서 저장 (cryptography 필요)
+- 한 번 읽은 세션은 프로세스 메모리에 캐시 → 매 요청마다 복호화 / JSON 파싱 안 함
+
+환경변수:
+    SCRAPER_SESSION_DB       sqlite 파일 경로 (기본: 임시 폴더)
+    SESSION_ENCRYPTION_KEY   Fernet 키 (Fernet.generate_key()), 없으면 평문 저장
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    cookies BLOB NOT NULL,
+    encrypted INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    domains TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL
+)
+"""
+
+
+class SessionNotFound(KeyError):
+    pass
+
+
+def _fernet(key: Optional[str]):
+    if not key:
+        return None
+    try:
+        from cryptography.fernet import Fernet
+    except ImportError:
+        raise RuntimeError("SESSION_ENCRYPTION_KEY 를 쓰려면 cryptography 설치 필요")
+    return Fernet(key.encode() if isinstance(key, str) else key)
+
+
+class SessionRegistry:
+    def __init__(self, path: Optional[str] = None, key: Optional[str] = None):
+        self.path = path or os.getenv(
+            "SCRAPER_SESSION_DB", os.path.join(tempfile.gettempdir(), "smartstore_sessions.sqlite3")
+        )
+        self.fernet = _fernet(os.getenv("SESSION_ENCRYPTION_KEY") if key is None else key)
+        self._cache: Dict[str, List[Dict[str, Any]]] = {}
+
+        db = self._connect()
+        try:
+            db.execute(SCHEMA)
+        finally:
+            db.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    # ------------------------------------------------------------
+    # 등록 / 삭제
+    # ------------------------------------------------------------
+    def register(self, cookies: List[Dict[str, Any]]) -> dict:
+        """정규화된 쿠키 리스트 저장, 메타데이터 반환"""
+        session_id = uuid.uuid4().hex
+        blob = json.dumps(cookies, ensure_ascii=False).encode("utf-8")
+        if self.fernet:
+            blob = self.fernet.encrypt(blob)
+        domains = sorted({c["domain"] for c in cookies})
+
+        db = self._connect()
+        try:
+            db.execute(
+                "INSERT INTO sessions (id, cookies, encrypted, count, domains, created) VALUES (?, ?, ?, ?, ?, ?)",
+                (session_id, blob, int(self.fernet is not None), len(cookies), json.dumps(domains), time.time()),
+            )
+        finally:
+            db.close()
+
+        self._cache[session_id] = cookies
+        return self.info(session_id)
+
+    def delete(self, session_id: str) -> bool:
+        self._cache.pop(session_id, None)
+        db = self._connect()
+        try:
+            return db.execute("DELETE FROM sessions WHERE id = ?", (session_id,)).rowcount > 0
+        finally:
+            db.close()
+
+    # ------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------
+    def info(self, session_id: str) -> dict:
+        db = self._connect()
+        try:
+            row = db.execute(
+                "SELECT count, domains, encrypted, created, last_used FROM sessions WHERE id = ?", (session_id,)
+            ).fetchone()
+        finally:
+            db.close()
+        if row is None:
+            raise SessionNotFound(session_id)
+
+        count, domains, encrypted, created, last_used = row
+        return {
+            "session_id": session_id,
+            "cookies": count,
+            "domains": json.loads(domains),
+            "encrypted": bool(encrypted),
+            "created": created,
+            "last_used": last_used,
+        }
+
+    def cookies(self, session_id: str) -> List[Dict[str, Any]]:
+        """정규화된 쿠키 리스트 (캐시 우선)"""
+        db = self._connect()
+        try:
+            cached = self._cache.get(session_id)
+            if cached is not None:
+                if db.execute("UPDATE sessions SET last_used = ? WHERE id = ?", (time.time(), session_id)).rowcount:
+                    return cached
+                # 다른 프로세스에서 삭제됨
+                self._cache.pop(session_id, None)
+                raise SessionNotFound(session_id)
+
+            row = db.execute("SELECT cookies, encrypted FROM sessions WHERE id = ?", (session_id,)).fetchone()
+            if row is None:
+                raise SessionNotFound(session_id)
+            db.execute("UPDATE sessions SET last_used = ? WHERE id = ?", (time.time(), session_id))
+        finally:
+            db.close()
+
+        blob, encrypted = row
+        if encrypted:
+            if not self.fernet:
+                raise RuntimeError("암호화된 세션: SESSION_ENCRYPTION_KEY 필요")
+            blob = self.fernet.decrypt(blob)
+        cookies = json.loads(blob)
+        self._cache[session_id] = cookies
+        return cookies
+
+
+_registry: Optional[SessionRegistry] = None
+
+
+def get_registry() -> SessionRegistry:
+    """프로세스 전역 registry (저장은 sqlite 라 프로세스 간 공유)"""
+    global _registry
+    if _registry is None:
+        _registry = SessionRegistry()
+    return _registry
@@ -0,0 +1,122 @@
+# review_store.py
+
+"""
+수집 결과 저장소 (상품별, sqlite)
+- /scrape · /jobs 가 끝날 때마다 상품 리뷰를 저장 (review_key 기준 중복은 무시)
+- GET /products/{id}/reviews?cursor=&limit= 로 keyset 페이지네이션
+    WHERE product_id = ? AND id > cursor ORDER BY id LIMIT n
+  → OFFSET 처럼 앞 행을 다시 읽지 않고, 서버 / 클라이언트 모두 한 페이지만 메모리에 둠
+- 순서는 처음 수집된 순서 (다시 수집해서 새로 나온 리뷰는 뒤에 붙음)
+
+환경변수:
+    SCRAPER_REVIEW_DB   sqlite 파일 경로 (기본: 임시 폴더)
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from review_batch import COLUMNS
+from review_normalize import DERIVED_COLUMNS
+
+FIELDS = COLUMNS + DERIVED_COLUMNS
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS reviews (
+    id INTEGER PRIMARY KEY,
+    product_id TEXT NOT NULL,
+    review_key TEXT NOT NULL,
+    scraped_at REAL NOT NULL,
+    {", ".join(FIELDS)},
+    UNIQUE (product_id, review_key)
+);
+CREATE INDEX IF NOT EXISTS reviews_product ON reviews (product_id, id);
+"""
+
+
+class ReviewStore:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv(
+            "SCRAPER_REVIEW_DB", os.path.join(tempfile.gettempdir(), "smartstore_reviews.sqlite3")
+        )
+        db = self._connect()
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+        finally:
+            db.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def save(self, product_id: str, batch, review_key) -> int:
+        """ReviewBatch 저장, 새로 들어간 리뷰 수 반환"""
+        cols = [batch.column(col) for col in FIELDS]
+        keys = [review_key(dict(zip(COLUMNS, row))) for row in zip(*cols[: len(COLUMNS)])]
+        now = time.time()
+        rows = [(product_id, key, now, *row) for key, row in zip(keys, zip(*cols))]
+
+        placeholders = ", ".join("?" * (len(FIELDS) + 3))
+        db = self._connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            before = db.total_changes
+            db.executemany(
+                f"INSERT OR IGNORE INTO reviews (product_id, review_key, scraped_at, {', '.join(FIELDS)}) "
+                f"VALUES ({placeholders})",
+                rows,
+            )
+            added = db.total_changes - before
+            db.execute("COMMIT")
+        finally:
+            db.close()
+        return added
+
+    def page(
+        self, product_id: str, cursor: Optional[int] = None, limit: int = 100, fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """cursor(이전 페이지의 next_cursor) 다음부터 limit 개"""
+        names = list(fields or FIELDS)
+        db = self._connect()
+        try:
+            rows = db.execute(
+                f"SELECT id, {', '.join(names)} FROM reviews WHERE product_id = ? AND id > ? ORDER BY id LIMIT ?",
+                (product_id, cursor or 0, limit + 1),
+            ).fetchall()
+        finally:
+            db.close()
+
+        more = len(rows) > limit
+        rows = rows[:limit]
+        return {
+            "product_id": product_id,
+            "reviews": [dict(zip(names, row[1:])) for row in rows],
+            "next_cursor": str(rows[-1][0]) if more else None,
+        }
+
+    def keys(self, product_id: str) -> set:
+        """저장된 review_key 집합 (증분 수집용)"""
+        db = self._connect()
+        try:
+            return {row[0] for row in db.execute("SELECT review_key FROM reviews WHERE product_id = ?", (product_id,))}
+        finally:
+            db.close()
+
+    def count(self, product_id: str) -> int:
+        db = self._connect()
+        try:
+            return db.execute("SELECT COUNT(*) FROM reviews WHERE product_id = ?", (product_id,)).fetchone()[0]
+        finally:
+            db.close()
+
+
+_store: Optional[ReviewStore] = None
+
+
+def get_store() -> ReviewStore:
+    global _store
+    if _store is None:
+        _store = ReviewStore()
+    return _store
@@ -0,0 +1,257 @@
+# review_watchlist.py
+
+"""
+상품 watchlist 주기 갱신 (외부 cron 대신 내장 스케줄러)
+- 상품마다 갱신 주기(interval) 설정, 주기가 지난 상품을 골라서 갱신
+- 우선순위: 리뷰 속도(최근 갱신들의 새 리뷰 / 시간, EMA) × 밀린 정도 → 리뷰가 빨리 쌓이는 상품 먼저
+- 전체 갱신 속도 예산: 분당 budget 개 (RateLimiter 토큰 버킷, 키 "watchlist")
+- 갱신은 증분 수집: 최신순으로 보다가 이미 저장된 리뷰만 나오는 페이지에서 멈춤
+  (워커 모드면 작업 큐로, 아니면 API 프로세스에서)
+- claim 을 BEGIN IMMEDIATE 로 하므로 API 프로세스가 여러 개여도 같은 상품을 두 번 돌리지 않음
+  (running 행에는 가져간 프로세스 pid 를 남김 → 시작 시 죽은 프로세스의 running 만 해제)
+
+환경변수:
+    SCRAPER_SCHEDULER              1 이면 API 시작 시 스케줄러 실행 (기본 1)
+    SCRAPER_WATCH_BUDGET_PER_MIN   분당 최대 갱신 수 (기본 6)
+    SCRAPER_WATCH_CONCURRENCY      동시에 진행할 갱신 수 (기본 2)
+    SCRAPER_WATCH_DB               sqlite 파일 경로 (기본: 임시 폴더)
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from rate_limiter import RateLimiter
+
+logger = logging.getLogger("scraper")
+
+ENABLED = os.getenv("SCRAPER_SCHEDULER", "1").lower() in ("1", "true", "yes")
+BUDGET_PER_MIN = float(os.getenv("SCRAPER_WATCH_BUDGET_PER_MIN", "6"))
+CONCURRENCY = int(os.getenv("SCRAPER_WATCH_CONCURRENCY", "2"))
+TICK_SECONDS = 5.0
+# 갱신 1번 결과를 속도 EMA 에 반영하는 비율
+VELOCITY_ALPHA = 0.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS watchlist (
+    product_id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    interval_seconds REAL NOT NULL,
+    pages INTEGER NOT NULL,
+    session_id TEXT,
+    velocity REAL NOT NULL DEFAULT 0,
+    running INTEGER NOT NULL DEFAULT 0,
+    runs INTEGER NOT NULL DEFAULT 0,
+    last_run REAL,
+    last_new INTEGER,
+    last_error TEXT,
+    next_run REAL NOT NULL,
+    created REAL NOT NULL,
+    owner INTEGER
+)
+"""
+
+
+def _alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # 권한 없음 = 다른 사용자의 살아 있는 프로세스
+        return True
+    return True
+
+
+class Watchlist:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv(
+            "SCRAPER_WATCH_DB", os.path.join(tempfile.gettempdir(), "smartstore_watchlist.sqlite3")
+        )
+        db = self._connect()
+        try:
+            db.execute(SCHEMA)
+        finally:
+            db.close()
+
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        return db
+
+    # ------------------------------------------------------------
+    # 관리
+    # ------------------------------------------------------------
+    def add(self, product_id: str, url: str, interval_seconds: float, pages: int, session_id: Optional[str]) -> dict:
+        """등록 (이미 있으면 설정만 바꾸고 속도 / 기록은 유지), 바로 1번 갱신 대상"""
+        now = time.time()
+        db = self._connect()
+        try:
+            db.execute(
+                "INSERT INTO watchlist (product_id, url, interval_seconds, pages, session_id, next_run, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(product_id) DO UPDATE SET url = excluded.url, interval_seconds = excluded.interval_seconds, "
+                "pages = excluded.pages, session_id = excluded.session_id, "
+                "next_run = MIN(next_run, COALESCE(last_run, 0) + excluded.interval_seconds)",
+                (product_id, url, interval_seconds, pages, session_id, now, now),
+            )
+        finally:
+            db.close()
+        return self.get(product_id)
+
+    def remove(self, product_id: str) -> bool:
+        db = self._connect()
+        try:
+            return db.execute("DELETE FROM watchlist WHERE product_id = ?", (product_id,)).rowcount > 0
+        finally:
+            db.close()
+
+    def run_now(self, product_id: str) -> bool:
+        db = self._connect()
+        try:
+            return db.execute(
+                "UPDATE watchlist SET next_run = ? WHERE product_id = ?", (time.time(), product_id)
+            ).rowcount > 0
+        finally:
+            db.close()
+
+    def get(self, product_id: str) -> Optional[dict]:
+        db = self._connect()
+        try:
+            row = db.execute("SELECT * FROM watchlist WHERE product_id = ?", (product_id,)).fetchone()
+        finally:
+            db.close()
+        return dict(row) if row else None
+
+    def entries(self) -> List[dict]:
+        db = self._connect()
+        try:
+            return [dict(r) for r in db.execute("SELECT * FROM watchlist ORDER BY next_run")]
+        finally:
+            db.close()
+
+    # ------------------------------------------------------------
+    # 스케줄링
+    # ------------------------------------------------------------
+    def claim_due(self, limit: int) -> List[dict]:
+        """
+        주기가 지난 상품 중 우선순위 높은 순으로 limit 개를 running 으로
+        priority = (velocity + 1) × (밀린 시간 / 주기 + 1) → 속도 0 인 상품도 밀리면 결국 차례가 옴
+        """
+        if limit <= 0:
+            return []
+        now = time.time()
+        db = self._connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            rows = db.execute(
+                "SELECT * FROM watchlist WHERE running = 0 AND next_run <= ? "
+                "ORDER BY (velocity + 1) * ((? - next_run) / interval_seconds + 1) DESC LIMIT ?",
+                (now, now, limit),
+            ).fetchall()
+            db.executemany(
+                "UPDATE watchlist SET running = 1, owner = ? WHERE product_id = ?",
+                [(os.getpid(), r["product_id"]) for r in rows],
+            )
+            db.execute("COMMIT")
+        finally:
+            db.close()
+        return [dict(r) for r in rows]
+
+    def finish(self, entry: dict, new_reviews: Optional[int], error: Optional[str] = None):
+        """갱신 결과 반영: 속도(새 리뷰 / 시간) EMA 갱신, 다음 실행 시각 = 지금 + 주기"""
+        now = time.time()
+        velocity = entry["velocity"]
+        if new_reviews is not None and entry["last_run"]:
+            hours = max((now - entry["last_run"]) / 3600, 1 / 60)
+            velocity = (1 - VELOCITY_ALPHA) * velocity + VELOCITY_ALPHA * (new_reviews / hours)
+
+        db = self._connect()
+        try:
+            db.execute(
+                "UPDATE watchlist SET running = 0, owner = NULL, runs = runs + 1, last_run = ?, last_new = ?, "
+                "last_error = ?, velocity = ?, next_run = ? WHERE product_id = ?",
+                (now, new_reviews, error, velocity, now + entry["interval_seconds"], entry["product_id"]),
+            )
+        finally:
+            db.close()
+
+    def reset_running(self) -> int:
+        """
+        갱신 중에 죽은 프로세스가 남긴 running 표시 해제 (해제한 수 반환)
+        다른 API 프로세스가 살아서 돌리고 있는 상품은 그대로 둠
+        """
+        db = self._connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            rows = db.execute("SELECT product_id, owner FROM watchlist WHERE running = 1").fetchall()
+            dead = [(r["product_id"],) for r in rows if r["owner"] == os.getpid() or not _alive(r["owner"])]
+            db.executemany("UPDATE watchlist SET running = 0, owner = NULL WHERE product_id = ?", dead)
+            db.execute("COMMIT")
+        finally:
+            db.close()
+        return len(dead)
+
+
+class WatchScheduler:
+    def __init__(
+        self,
+        watchlist: Watchlist,
+        refresh: Callable[[Dict[str, Any]], Awaitable[int]],
+        budget_per_min: float = BUDGET_PER_MIN,
+        concurrency: int = CONCURRENCY,
+    ):
+        self.watchlist = watchlist
+        self.refresh = refresh
+        self.concurrency = concurrency
+        # 전체 갱신 예산 (프로세스 간 공유되는 토큰 버킷)
+        self.budget = RateLimiter(rate=budget_per_min / 60, burst=max(1.0, min(budget_per_min, concurrency)))
+        self.running = set()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        n = await asyncio.to_thread(self.watchlist.reset_running)
+        if n:
+            logger.warning(f"Released {n} watchlist entries left running by a dead process")
+        self._task = asyncio.create_task(self._loop())
+        logger.info("Watchlist scheduler started")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+        for task in list(self.running):
+            task.cancel()
+
+    async def _loop(self):
+        while True:
+            try:
+                # sqlite 호출은 스레드에서 (API 이벤트 루프를 막지 않게)
+                due = await asyncio.to_thread(self.watchlist.claim_due, self.concurrency - len(self.running))
+                for entry in due:
+                    await self.budget.acquire("watchlist")
+                    task = asyncio.create_task(self._run(entry))
+                    self.running.add(task)
+                    task.add_done_callback(self.running.discard)
+            except Exception as e:
+                logger.error(f"Watchlist tick failed: {e!r}")
+            await asyncio.sleep(TICK_SECONDS)
+
+    async def _run(self, entry: dict):
+        logger.info(f"Refreshing {entry['product_id']} (velocity {entry['velocity']:.2f}/h)")
+        try:
+            new_reviews = await self.refresh(entry)
+        except asyncio.CancelledError:
+            # 취소 중이라 await 하지 않고 바로 기록
+            self.watchlist.finish(entry, None, "cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"Refresh {entry['product_id']} failed: {e!r}")
+            await asyncio.to_thread(self.watchlist.finish, entry, None, repr(e))
+        else:
+            await asyncio.to_thread(self.watchlist.finish, entry, new_reviews)
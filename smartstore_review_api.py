@@ -9,17 +9,43 @@ Async SmartStore Review Scraper API
 """
 
 import os
+import re
 import json
+import asyncio
+import hashlib
 import time
 import logging
-from typing import List, Dict, Any
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Callable, List, Dict, Any, Optional
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
-from fastapi.concurrency import run_in_threadpool
-from playwright.async_api import async_playwright, Browser, Page
-from bs4 import BeautifulSoup
+from fastapi import Depends, FastAPI, HTTPException, UploadFile, File, Form, Response
+from fastapi.responses import StreamingResponse
+
+from review_batch import COLUMNS, ReviewBatch
+from review_options import ENGINES, SORTS, split_page_ranges
+from review_pagination import GROUP_CHANGED_JS, PAGE_MOVED_JS, PAGINATION_SELECTOR, PAGINATION_STATE_JS
+from review_normalize import DERIVED_COLUMNS, normalize_batch
+from review_compression import CompressionMiddleware
+from rate_limiter import RateLimitWait, get_limiter
+from review_checkpoint import Checkpoint
+import review_metrics as metrics
+from review_profiling import RequestProfiler
+from review_sessions import SessionNotFound, get_registry
+from browser_profile import get_pool
+from review_store import get_store
+from review_json import FastJSONResponse, dumps, loads, raw_response
+from review_flight import Flight, SingleFlight
+import review_watchlist
+from review_watchlist import Watchlist, WatchScheduler
+from review_jobs import POLL_SECONDS, WORKERS, JobQueue, WorkerSupervisor
+
+# 타입 힌트 전용 (playwright 는 스크래핑 함수 안에서 import)
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Page
 
 app = FastAPI()
+# 큰 리뷰 응답 압축 (zstd 우선, 없으면 gzip)
+app.add_middleware(CompressionMiddleware, minimum_size=1000, passthrough_paths=("/scrape/stream",))
 
 # ============================================================
 # 0) 로깅 설정
@@ -42,20 +68,51 @@ UA = (
 # ============================================================
 # 2) 브라우저 런처
 # ============================================================
-async def launch_browser(p) -> Browser:
-    headless_env = os.getenv("PLAYWRIGHT_HEADLESS", "true").lower()
-    headless = headless_env in ("1", "true", "yes")
+BROWSER_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-web-security",
+    "--no-sandbox"
+]
+
+CONTEXT_OPTIONS = dict(
+    locale="ko-KR",
+    user_agent=UA,
+    viewport={"width": 1280, "height": 720},
+)
+
 
+def resolve_headless(headless: Optional[bool]) -> bool:
+    if headless is None:
+        headless_env = os.getenv("PLAYWRIGHT_HEADLESS", "true").lower()
+        headless = headless_env in ("1", "true", "yes")
+    return headless
+
+
+async def launch_browser(p, headless: Optional[bool] = None) -> "Browser":
+    headless = resolve_headless(headless)
     logger.info(f"Launching browser (headless={headless})")
 
-    return await p.chromium.launch(
-        headless=headless,
-        args=[
-            "--disable-blink-features=AutomationControlled",
-            "--disable-web-security",
-            "--no-sandbox"
-        ]
-    )
+    with metrics.BROWSER_LAUNCH.time():
+        return await p.chromium.launch(headless=headless, args=BROWSER_ARGS)
+
+
+async def launch_persistent(p, user_data_dir: str, headless: Optional[bool] = None) -> "BrowserContext":
+    """
+    영구 프로필(user_data_dir)로 실행 → HTTP 디스크 캐시가 작업 간에 남음
+    반환값은 Browser 가 아니라 BrowserContext 하나 (create_page 가 둘 다 받음)
+    """
+    headless = resolve_headless(headless)
+    logger.info(f"Launching browser with profile {user_data_dir} (headless={headless})")
+
+    with metrics.BROWSER_LAUNCH.time():
+        context = await p.chromium.launch_persistent_context(
+            user_data_dir, headless=headless, args=BROWSER_ARGS, **CONTEXT_OPTIONS
+        )
+    # 이전 작업의 로그인 쿠키가 프로필에 남아 있으므로 비우고 시작 (캐시만 재사용)
+    await context.clear_cookies()
+    metrics.OPEN_CONTEXTS.inc()
+    context.on("close", lambda _: metrics.OPEN_CONTEXTS.dec())
+    return context
 
 # ============================================================
 # 3) 쿠키 정규화
@@ -88,19 +145,23 @@ def normalize_cookie(c: dict) -> dict:
 # ============================================================
 # 4) 페이지 + 쿠키 삽입
 # ============================================================
-async def create_page(browser: Browser, cookie_data: dict) -> Page:
-    context = await browser.new_context(
-        locale="ko-KR",
-        user_agent=UA,
-        viewport={"width": 1280, "height": 720},
-    )
+async def create_page(browser, cookie_data: dict) -> "Page":
+    """browser 가 영구 프로필 context 면 그 context 에 탭만 추가"""
+    persistent = not hasattr(browser, "new_context")
+    context = browser if persistent else await browser.new_context(**CONTEXT_OPTIONS)
 
     raw = cookie_data.get("cookies", [])
-    fixed = [normalize_cookie(c) for c in raw]
+    # 세션 등록소에서 온 쿠키는 이미 정규화됨
+    fixed = raw if cookie_data.get("normalized") else [normalize_cookie(c) for c in raw]
 
     if fixed:
         await context.add_cookies(fixed)
 
+    if persistent:
+        return await context.new_page()
+
+    metrics.OPEN_CONTEXTS.inc()
+    context.on("close", lambda _: metrics.OPEN_CONTEXTS.dec())
     return await context.new_page()
 
 # ============================================================
@@ -154,12 +215,189 @@ def parse_review_card(card):
         logger.error(f"Parse error: {e}")
         return None
 
+# ============================================================
+# 5-1) 추출 엔진
+#   dom       : frame HTML 을 받아서 BeautifulSoup + parse_review_card
+#   inbrowser : 브라우저 안에서 JS 로 카드 필드만 뽑아서 받음 (HTML 전송/파싱 없음)
+#   network   : 리뷰 위젯이 받는 JSON 응답을 가로채서 매핑
+# ============================================================
+
+CARD_SELECTOR = ".IwcuBUIAKf"
+
+
+def review_key(info: dict) -> str:
+    return f"{info['nickname']}|{info['date']}|{info['content'][:20]}"
+
+
+def product_id_from_url(url: str) -> str:
+    m = re.search(r"/products/(\d+)", url)
+    return m.group(1) if m else re.sub(r"\W+", "_", url).strip("_")[-64:]
+
+
+def parse_review_html(html: str, parser: str = "lxml") -> List[Dict[str, Any]]:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, parser)
+    reviews = []
+    for card in soup.select(CARD_SELECTOR):
+        info = parse_review_card(card)
+        if info:
+            reviews.append(info)
+    return reviews
+
+
+# parse_review_card() 와 같은 규칙 (get_text(strip=True) = 텍스트 노드 strip 후 join)
+EXTRACT_CARDS_JS = """
+(selector) => {
+    const strings = (el) => {
+        if (!el) return [];
+        const out = [];
+        const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+        while (walker.nextNode()) {
+            const t = walker.currentNode.nodeValue.trim();
+            if (t) out.push(t);
+        }
+        return out;
+    };
+    const text = (card, sel, sep) => strings(card.querySelector(sel)).join(sep);
+
+    return Array.from(document.querySelectorAll(selector)).map((card) => {
+        const buyer = text(card, ".eWRrdDdSzW", " ");
+        const tag = text(card, ".h8uqAeqIe7", " ");
+
+        let image_count = 0;
+        const imgBox = card.querySelector(".s30AvhHfb0");
+        if (imgBox) {
+            const countSpan = imgBox.querySelector(".lOzR1kO8jf");
+            if (countSpan) {
+                image_count = parseInt(strings(countSpan).join("").replace(/\\D/g, "") || "0", 10);
+            } else if (imgBox.querySelector("img")) {
+                image_count = 1;
+            }
+        }
+
+        return {
+            nickname: text(card, ".Db9Dtnf7gY strong", ""),
+            date: text(card, ".Db9Dtnf7gY span:nth-of-type(1)", ""),
+            rating: text(card, "em.n6zq2yy0KA", ""),
+            option: strings(card.querySelector(".b_caIle8kC"))[0] || "",
+            auto_label: [buyer, tag].filter((x) => x.trim()).join(" | "),
+            content: text(card, ".KqJ8Qqw082", " "),
+            image_count: image_count,
+        };
+    });
+}
+"""
+
+
+def _map_network_review(item: dict) -> Dict[str, Any]:
+    """리뷰 JSON 1건 → parse_review_card() 와 같은 키 (날짜는 위젯 표기 "24.11.25." 로)"""
+    created = str(item.get("createDate") or "")
+    date = ""
+    if len(created) >= 10:
+        date = f"{created[2:4]}.{created[5:7]}.{created[8:10]}."
+
+    attaches = item.get("reviewAttaches") or []
+    labels = [item.get("reviewTypeName") or "", item.get("reviewContentClassTypeName") or ""]
+
+    return {
+        "nickname": item.get("writerMemberId") or item.get("writerNickname") or "",
+        "date": date,
+        "rating": str(item.get("reviewScore") or ""),
+        "option": (item.get("productOptionContent") or "").split("\n")[0],
+        "auto_label": " | ".join(x for x in labels if x),
+        "content": " ".join(str(item.get("reviewContent") or "").split()),
+        "image_count": len(attaches),
+    }
+
+
+class NetworkReviewCapture:
+    """
+    page.on("response") 로 리뷰 JSON 응답을 모아 두고 페이지마다 drain()
+    """
+
+    def __init__(self, page: "Page"):
+        self.buffer: List[Dict[str, Any]] = []
+        page.on("response", self._on_response)
+
+    async def _on_response(self, response):
+        if "review" not in response.url.lower():
+            return
+        if "json" not in (response.headers.get("content-type") or ""):
+            return
+        try:
+            body = await response.json()
+        except Exception:
+            return
+
+        items = body.get("contents") if isinstance(body, dict) else None
+        if isinstance(items, list):
+            self.buffer.extend(_map_network_review(x) for x in items if isinstance(x, dict))
+
+    def drain(self) -> List[Dict[str, Any]]:
+        out, self.buffer = self.buffer, []
+        return out
+
+
+async def collect_page(target, engine: str = "dom", parser: str = "lxml", capture=None, snapshot_path=None):
+    """현재 리뷰 페이지 1장의 카드들을 dict 리스트로"""
+    html = None
+    if engine == "dom" or snapshot_path:
+        html = await target.content()
+        if snapshot_path:
+            with open(snapshot_path, "w", encoding="utf-8") as f:
+                f.write(html)
+
+    if engine == "inbrowser":
+        return await target.evaluate(EXTRACT_CARDS_JS, CARD_SELECTOR)
+    if engine == "network":
+        # 응답 핸들러가 끝날 시간
+        await target.wait_for_timeout(300)
+        return capture.drain() if capture else []
+    return parse_review_html(html, parser)
+
+
+def replay_snapshots(snapshot_dir: str, parser: str = "lxml") -> ReviewBatch:
+    """snapshot_dir 의 page_###.html 을 브라우저 없이 다시 파싱"""
+    results = ReviewBatch()
+    seen = set()
+
+    for name in sorted(os.listdir(snapshot_dir)):
+        if not (name.startswith("page_") and name.endswith(".html")):
+            continue
+        with open(os.path.join(snapshot_dir, name), encoding="utf-8") as f:
+            html = f.read()
+
+        for info in parse_review_html(html, parser):
+            key = review_key(info)
+            if key not in seen:
+                seen.add(key)
+                results.append(info)
+
+    return normalize_batch(results)
+
 # ============================================================
 # 6) 리뷰탭 + iframe 탐지
 # ============================================================
-async def load_review_frame(page: Page):
+async def load_review_frame(
+    page: "Page",
+    deadline: Optional["Deadline"] = None,
+    timings: Optional[metrics.ScrapeTimings] = None,
+):
+    deadline = deadline or Deadline()
+    timings = timings or metrics.ScrapeTimings()
     logger.info("Seeking REVIEW tab...")
 
+    with timings.phase("review_tab", metrics.REVIEW_TAB):
+        await _click_review_tab(page, deadline)
+
+    with timings.phase("frame", metrics.IFRAME):
+        return await _find_review_frame(page, deadline)
+
+
+async def _click_review_tab(page: "Page", deadline: "Deadline"):
+    last_y = None
+    stuck = 0
     for _ in range(50):
         btn = page.locator('[data-name="REVIEW"]').first
         if await btn.is_visible():
@@ -167,15 +405,25 @@ async def load_review_frame(page: Page):
             await btn.click()
             break
         await page.mouse.wheel(0, 800)
-        await page.wait_for_timeout(200)
+        await page.wait_for_timeout(deadline.cap(200))
 
+        # 바닥에 닿아서 더 안 내려가면 그만 (리뷰탭 없는 페이지)
+        y = await page.evaluate("window.scrollY")
+        stuck = stuck + 1 if y == last_y else 0
+        if stuck >= 3:
+            logger.warning("REVIEW tab not found before page bottom")
+            break
+        last_y = y
+
+
+async def _find_review_frame(page: "Page", deadline: "Deadline"):
     # iframe 찾기
     for _ in range(80):
         for frame in page.frames:
             if "review" in frame.url.lower() or "pstatic" in frame.url.lower():
                 logger.info(f"Review iframe found: {frame.url}")
                 return frame
-        await page.wait_for_timeout(250)
+        await page.wait_for_timeout(deadline.cap(250))
 
     logger.warning("No iframe found, fallback to main page")
     return page
@@ -183,89 +431,1248 @@ async def load_review_frame(page: Page):
 # ============================================================
 # 7) 에러 감지
 # ============================================================
-async def check_service_error(page: Page):
-    html = await page.content()
-    if "현재 서비스 접속이 불가합니다" in html:
-        raise HTTPException(503, "네이버가 차단했습니다.")
+BLOCK_TEXT = "현재 서비스 접속이 불가합니다"
+BLOCK_STATUSES = (403, 429)
+
+
+class ServiceBlocked(HTTPException):
+    def __init__(self, reason: str):
+        super().__init__(503, "네이버가 차단했습니다.")
+        self.reason = reason
+
+
+class BlockWatcher:
+    """
+    page.on("response") 로 403·429 를 표시만 해 둠 (체크 시 추가 round-trip 없음)
+    - 보는 응답: 페이지 / 리뷰 iframe 문서 이동, 리뷰 API XHR·fetch
+      (광고 / 로그 / 추천 위젯 같은 다른 naver.com 호출이 403 이어도 차단으로 보지 않음)
+    - take() 로 읽으면 초기화 → 한 번 본 403 이 이후 페이지마다 다시 걸리지 않음
+    """
+
+    def __init__(self, page: "Page"):
+        self.status: Optional[int] = None
+        page.on("response", self._on_response)
+
+    def _on_response(self, response):
+        if response.status not in BLOCK_STATUSES or "naver.com" not in response.url:
+            return
+        request = response.request
+        if request.resource_type == "document" and request.is_navigation_request():
+            self.status = response.status
+        elif request.resource_type in ("xhr", "fetch") and "review" in response.url.lower():
+            self.status = response.status
+
+    def take(self) -> Optional[int]:
+        status, self.status = self.status, None
+        return status
+
+
+async def check_service_error(page: "Page", target=None, watcher: Optional[BlockWatcher] = None, response=None):
+    """
+    차단 감지 (HTML 전체를 가져오지 않음)
+    1) goto 응답 / BlockWatcher 가 본 상태 코드
+    2) 차단 문구 텍스트 locator count (page, 리뷰 iframe)
+    """
+    reason = None
+    status = watcher.take() if watcher is not None else None
+    if response is not None and response.status in BLOCK_STATUSES:
+        reason = f"HTTP {response.status}"
+    elif status:
+        reason = f"HTTP {status}"
+    else:
+        targets = [page] if target is None or target is page else [page, target]
+        for t in targets:
+            if await t.get_by_text(BLOCK_TEXT).count():
+                reason = "block page"
+                break
+
+    if reason:
+        metrics.BLOCKS.inc()
+        # 같은 호스트로 가는 모든 워커의 속도를 낮춤
+        await asyncio.to_thread(get_limiter().penalize, page.url)
+        raise ServiceBlocked(reason)
+
+# ============================================================
+# 7-1) 시간 예산 (deadline_seconds)
+# ============================================================
+class DeadlineExceeded(Exception):
+    pass
+
+
+class Deadline:
+    """
+    요청 전체 시간 예산. seconds=None 이면 무제한
+    모든 대기(goto / wait_for_timeout / 페이지 이동 확인)는 cap() 으로 남은 시간 안으로 자름
+    """
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.end = time.monotonic() + seconds if seconds else None
+
+    def remaining(self) -> Optional[float]:
+        if self.end is None:
+            return None
+        return max(0.0, self.end - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.end is not None and time.monotonic() >= self.end
+
+    def check(self):
+        if self.expired():
+            raise DeadlineExceeded()
+
+    def cap(self, ms: int) -> int:
+        """ms 와 남은 시간 중 작은 값 (이미 만료면 DeadlineExceeded)"""
+        if self.end is None:
+            return ms
+        self.check()
+        return max(1, min(ms, int(self.remaining() * 1000)))
+
+
+async def throttle(target, deadline: Optional[Deadline] = None):
+    """
+    네이버로 요청이 나가는 동작(goto / 클릭) 전에 호스트별 토큰 버킷 통과
+    target: URL 문자열, Page 또는 Frame (Frame 이면 상위 Page 의 호스트 기준)
+    deadline 안에 차례가 안 오면 요청을 보내지 않고 DeadlineExceeded
+    """
+    if isinstance(target, str):
+        url = target
+    else:
+        url = getattr(target, "page", target).url
+    max_wait = deadline.remaining() if deadline else None
+    try:
+        await get_limiter().acquire(url, max_wait=max_wait)
+    except RateLimitWait:
+        raise DeadlineExceeded() from None
 
 # ============================================================
-# 8) Human-like Scroll
+# 8) Human-like Scroll (수렴하면 멈춤)
 # ============================================================
-async def smooth_scroll(target, steps=10, delay=300):
+SCROLL_STATE_JS = "(selector) => [document.documentElement.scrollHeight, document.querySelectorAll(selector).length]"
+
+
+async def scroll_until_stable(
+    target,
+    card_selector: str = CARD_SELECTOR,
+    max_steps: int = 12,
+    delay: int = 250,
+    deadline: Optional[Deadline] = None,
+) -> int:
+    """
+    800px 씩 내리다가 scrollHeight 와 리뷰 카드 수가 더 이상 안 바뀌면 멈춤
+    max_steps 가 상한, 실제로 쓴 스텝 수를 반환 (deadline 이 지나면 바로 멈춤)
+    """
+    deadline = deadline or Deadline()
+    last = None
+    steps = 0
     try:
-        for _ in range(steps):
+        while steps < max_steps and not deadline.expired():
             await target.evaluate("window.scrollBy(0, 800)")
-            await target.wait_for_timeout(delay)
-    except Exception:
+            await target.wait_for_timeout(deadline.cap(delay))
+            steps += 1
+
+            state = await target.evaluate(SCROLL_STATE_JS, card_selector)
+            if state == last:
+                break
+            last = state
+    except DeadlineExceeded:
         pass
+    except Exception as e:
+        # 스크롤 실패해도 수집은 계속 (현재 DOM 그대로 파싱)
+        logger.warning(f"Scroll stopped after {steps} steps: {e!r}")
+
+    logger.debug(f"Scrolled {steps}/{max_steps} steps")
+    return steps
+
+# ============================================================
+# 8-1) 정렬 / 필터 (리뷰 위젯 컨트롤로 서버 쪽에서 적용)
+# ============================================================
+MEDIA_FILTER_LABELS = ("포토/동영상", "포토/동영상 리뷰")
+
+
+async def _click_control(target, label: str, deadline: Deadline) -> bool:
+    ctrl = target.locator(
+        f'a:text-is("{label}"), button:text-is("{label}"), [role="tab"]:text-is("{label}"), '
+        f'[role="option"]:text-is("{label}"), label:text-is("{label}")'
+    ).first
+    if not await ctrl.count():
+        return False
+    await ctrl.scroll_into_view_if_needed()
+    await throttle(target, deadline)
+    await ctrl.click()
+    await target.wait_for_timeout(deadline.cap(1500))
+    return True
+
+
+async def apply_review_view(
+    target,
+    sort: Optional[str] = None,
+    ratings=None,
+    media_only: bool = False,
+    deadline: Optional[Deadline] = None,
+) -> dict:
+    """
+    페이지를 넘기기 전에 위젯의 정렬/필터 컨트롤을 눌러 둠
+    컨트롤을 못 찾으면 applied 에 False → 수집 후 클라이언트 쪽 필터로 보정
+    """
+    deadline = deadline or Deadline()
+    applied = {}
+
+    if sort:
+        if sort not in SORTS:
+            raise ValueError(f"unknown sort: {sort}")
+        applied["sort"] = await _click_control(target, SORTS[sort], deadline)
+
+    if media_only:
+        ok = False
+        for label in MEDIA_FILTER_LABELS:
+            if await _click_control(target, label, deadline):
+                ok = True
+                break
+        applied["media_only"] = ok
+
+    # 위젯의 별점 필터는 1개만 선택 가능
+    if ratings and len(ratings) == 1:
+        applied["rating"] = await _click_control(target, f"{ratings[0]}점", deadline)
+
+    for name, ok in applied.items():
+        if not ok:
+            logger.warning(f"Review widget control not found: {name} (client-side filter only)")
+    return applied
+
+
+def matches_view(info: dict, ratings=None, media_only: bool = False) -> bool:
+    if ratings:
+        digits = "".join(c for c in str(info.get("rating") or "") if c.isdigit())
+        if not digits or int(digits) not in ratings:
+            return False
+    if media_only and not info.get("image_count"):
+        return False
+    return True
+
+
+def past_sorted_range(cards, sort: Optional[str], ratings) -> bool:
+    """
+    평점순 정렬 + 별점 필터일 때, 이번 페이지가 이미 원하는 별점 범위를 지나쳤는지
+    (평점 낮은순에서 max(ratings) 보다 높은 리뷰만 나오면 더 볼 필요 없음)
+    """
+    if not ratings or sort not in ("rating_low", "rating_high") or not cards:
+        return False
+
+    values = []
+    for info in cards:
+        digits = "".join(c for c in str(info.get("rating") or "") if c.isdigit())
+        if digits:
+            values.append(int(digits))
+    if not values:
+        return False
+
+    if sort == "rating_low":
+        return min(values) > max(ratings)
+    return max(values) < min(ratings)
+
+# ============================================================
+# 8-2) 페이지네이션 (1~10 페이지 그룹 + 다음/이전 그룹 버튼, JS 는 review_pagination.py)
+# ============================================================
+# 첫 리뷰 카드 내용 (활성 페이지 표시를 못 찾았을 때 페이지가 바뀌었는지 보는 용도)
+FIRST_CARD_JS = f"""
+() => {{
+    const card = document.querySelector("{CARD_SELECTOR}");
+    return card ? card.textContent.trim().slice(0, 200) : null;
+}}
+"""
+
+
+class PageNavigationFailed(Exception):
+    """페이지 이동을 눌렀는데 확인이 안 됨 (페이지가 없는 것과 구분: 수집이 끝난 게 아님)"""
+
+    def __init__(self, n: int):
+        super().__init__(f"navigation to review page {n} not confirmed")
+        self.n = n
+
+
+async def _wait_js(target, js: str, arg, timeout_ms: int) -> bool:
+    try:
+        await target.wait_for_function(js, arg=arg, timeout=timeout_ms)
+        return True
+    except Exception:
+        return False
+
+
+async def goto_review_page(
+    target,
+    n: int,
+    timeout_ms: int = 10000,
+    max_hops: int = 50,
+    deadline: Optional[Deadline] = None,
+) -> bool:
+    """
+    리뷰 페이지 n 으로 이동 후 활성 페이지가 n 인지 확인
+    - n 이 현재 그룹에 보이면 숫자를 정확히 일치하는 링크로 클릭 ("1" 이 "10" 에 걸리지 않음)
+    - 안 보이면 다음/이전 그룹 버튼으로 그룹을 넘기면서 찾아감
+    페이지가 없으면 False (진짜 끝), 눌렀는데 이동 확인이 안 되면 PageNavigationFailed
+    """
+    for _ in range(max_hops):
+        state = await target.evaluate(PAGINATION_STATE_JS, PAGINATION_SELECTOR)
+        if not state or not state["pages"]:
+            return False
+        if state["current"] == n:
+            return True
+
+        links = target.locator(PAGINATION_SELECTOR).locator("a")
+        index = dict(state["pages"]).get(n)
+        if index is not None:
+            before = await target.evaluate(FIRST_CARD_JS)
+            await throttle(target, deadline)
+            await links.nth(index).click()
+            # 활성 페이지 표시가 안 보여도 첫 리뷰 카드가 바뀌면 바로 통과 (한 번만 기다림)
+            try:
+                handle = await target.wait_for_function(
+                    PAGE_MOVED_JS, arg=[PAGINATION_SELECTOR, n, CARD_SELECTOR, before], timeout=timeout_ms
+                )
+                moved = await handle.json_value()
+            except Exception:
+                moved = None
+            if moved == "card":
+                logger.warning(f"Active page marker not found, page {n} assumed from changed first card")
+            if moved:
+                return True
+            logger.warning(f"Could not verify move to review page {n} (current {state['current']})")
+            raise PageNavigationFailed(n)
+
+        numbers = [num for num, _ in state["pages"]]
+        if n > max(numbers) and state["next"] >= 0:
+            button = state["next"]
+        elif n < min(numbers) and state["prev"] >= 0:
+            button = state["prev"]
+        else:
+            return False
+
+        await throttle(target, deadline)
+        await links.nth(button).click()
+        if not await _wait_js(target, GROUP_CHANGED_JS, [PAGINATION_SELECTOR, numbers[0]], timeout_ms):
+            logger.warning(f"Page group did not change while seeking review page {n}")
+            raise PageNavigationFailed(n)
+
+    raise PageNavigationFailed(n)
 
 # ============================================================
 # 9) 메인 스크래핑
 # ============================================================
-async def scrape_reviews(url: str, limit_pages: int, cookie_data: dict):
+async def scrape_reviews(
+    url: str,
+    limit_pages: int,
+    cookie_data: dict,
+    engine: str = "dom",
+    parser: str = "lxml",
+    headless: Optional[bool] = None,
+    snapshot_dir: Optional[str] = None,
+    browser: Optional["Browser"] = None,
+    sort: Optional[str] = None,
+    ratings: Optional[List[int]] = None,
+    media_only: bool = False,
+    tabs: int = 1,
+    deadline_seconds: Optional[float] = None,
+    checkpoint_dir: Optional[str] = None,
+    resume: bool = False,
+    trace_dir: Optional[str] = None,
+    user_data_dir: Optional[str] = None,
+    on_page: Optional[Callable[[int, List[Dict[str, Any]]], None]] = None,
+    known_keys: Optional[set] = None,
+    identity: Optional[str] = None,
+):
+    """
+    browser 를 넘기면 그 브라우저에 새 context 만 열어서 수집 (여러 상품 동시 수집용)
+    없으면 브라우저를 직접 띄우고 끝나면 닫음
+    user_data_dir(또는 SCRAPER_BROWSER_PROFILE_DIR) 이 있으면 그 아래 프로필 슬롯으로
+    launch_persistent_context → 정적 리소스를 디스크 캐시에서 재사용
+    sort / ratings / media_only 는 위젯 컨트롤로 먼저 적용하고 페이지를 넘김
+    tabs > 1 이면 같은 context 에 탭 K개를 열고 페이지 구간을 나눠서 동시에 수집
+    deadline_seconds 가 지나면 그때까지 모은 리뷰를 반환 (batch.meta["truncated"] = True)
+    checkpoint_dir 이 있으면 페이지마다 기록, resume=True 면 기록된 다음 페이지부터 이어서 수집
+    (identity(쿠키 구분값)도 체크포인트 key 에 들어감 → 다른 계정으로 받던 체크포인트는 이어받지 않음)
+    trace_dir 이 있으면 Playwright trace 를 trace_<상품id>.zip 으로 저장
+    on_page(n, reviews) 는 페이지 1장이 끝날 때마다 호출 (탭이 여러 개면 끝난 순서, 재개한 페이지는 먼저)
+    known_keys(review_key 집합) 가 있으면 증분 수집: 페이지의 리뷰가 전부 이미 아는 리뷰면 거기서 멈춤
+    (sort="newest" 가 위젯에 실제로 적용됐을 때만 멈춤, batch.meta["stopped_at_known"] = 멈춘 페이지)
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"unknown engine: {engine}")
+    if sort and sort not in SORTS:
+        raise ValueError(f"unknown sort: {sort}")
+    if snapshot_dir:
+        os.makedirs(snapshot_dir, exist_ok=True)
+
+    deadline = Deadline(deadline_seconds)
+    opts = dict(
+        engine=engine,
+        parser=parser,
+        snapshot_dir=snapshot_dir,
+        sort=sort,
+        ratings=set(ratings) if ratings else None,
+        media_only=media_only,
+    )
+
+    checkpoint = None
+    if checkpoint_dir:
+        checkpoint = Checkpoint(
+            checkpoint_dir,
+            url,
+            product_id_from_url(url),
+            {
+                "sort": sort,
+                "ratings": sorted(ratings) if ratings else None,
+                "media_only": media_only,
+                "identity": identity,
+            },
+        )
+    run = {
+        "timings": metrics.ScrapeTimings(),
+        "truncated": False,
+        "blocked": None,
+        "checkpoint": checkpoint,
+        "resume": resume,
+        "trace_path": os.path.join(trace_dir, f"trace_{product_id_from_url(url)}.zip") if trace_dir else None,
+        "on_page": on_page,
+        "known_keys": known_keys,
+        "stopped_at_known": None,
+    }
+    if trace_dir:
+        os.makedirs(trace_dir, exist_ok=True)
+
+    with metrics.INFLIGHT.track_inprogress():
+        try:
+            if browser is not None:
+                return await _scrape_in_browser(browser, url, limit_pages, cookie_data, tabs, deadline, run, opts)
+
+            from playwright.async_api import async_playwright
+
+            pool = get_pool(user_data_dir)
+            async with async_playwright() as p:
+                with pool.acquire() if pool else nullcontext() as slot:
+                    with run["timings"].phase("launch"):
+                        if slot:
+                            browser = await launch_persistent(p, slot, headless)
+                        else:
+                            browser = await launch_browser(p, headless)
+                    try:
+                        return await _scrape_in_browser(browser, url, limit_pages, cookie_data, tabs, deadline, run, opts)
+                    finally:
+                        await browser.close()
+        except Exception as e:
+            metrics.ERRORS.labels(type(e).__name__).inc()
+            raise
+
+
+# deadline 이 지나도 안 끝나는 Playwright 호출(content() 등)을 끊기 전 여유 시간
+DEADLINE_GRACE_SECONDS = 5
 
-    async with async_playwright() as p:
-        browser = await launch_browser(p)
+
+async def _scrape_in_browser(browser, url, limit_pages, cookie_data, tabs, deadline, run, opts):
+    # 페이지 번호 → 리뷰 리스트 (탭들이 같이 채움, 중간에 끊겨도 남음)
+    pages = {}
+
+    checkpoint = run["checkpoint"]
+    if checkpoint:
+        if run["resume"]:
+            pages.update(checkpoint.load(review_key))
+            if pages:
+                logger.info(f"Resuming {url} after pages {min(pages)}~{max(pages)} ({len(pages)} pages)")
+        else:
+            checkpoint.clear()
+    resumed = len(pages)
+    if run["on_page"]:
+        for n in sorted(pages):
+            run["on_page"](n, pages[n])
+
+    todo = [n for n in range(1, limit_pages + 1) if n not in pages]
+    if todo:
         page = await create_page(browser, cookie_data)
+        if run["trace_path"]:
+            await page.context.tracing.start(screenshots=True, snapshots=True)
+        tab_pages = [page]
+        try:
+            first = todo[0]
+            if tabs <= 1:
+                work = _scrape_page_range(page, url, first, limit_pages, pages, deadline, run, **opts)
+            else:
+                ranges = split_page_ranges(first, limit_pages, tabs)
+                tab_pages = [page] + [await page.context.new_page() for _ in ranges[1:]]
+                logger.info(f"Scraping {url} with {len(ranges)} tabs: {ranges}")
+
+                work = asyncio.gather(
+                    *(
+                        _scrape_page_range(tab, url, start, end, pages, deadline, run, **opts)
+                        for tab, (start, end) in zip(tab_pages, ranges)
+                    )
+                )
+
+            remaining = deadline.remaining()
+            if remaining is None:
+                await work
+            else:
+                try:
+                    await asyncio.wait_for(work, timeout=remaining + DEADLINE_GRACE_SECONDS)
+                except asyncio.TimeoutError:
+                    run["truncated"] = True
+        finally:
+            if run["trace_path"]:
+                await page.context.tracing.stop(path=run["trace_path"])
+            if page.context is browser:
+                # 영구 프로필 context 는 여러 상품이 같이 씀 → 탭만 닫음
+                for tab in tab_pages:
+                    await tab.close()
+            else:
+                await page.context.close()
+
+    if run["blocked"] and len(pages) == resumed:
+        raise ServiceBlocked(run["blocked"])
 
-        await page.goto(url, timeout=120000)
-        await page.wait_for_timeout(2000)
+    # 페이지 순서대로 합치면서 중복 제거
+    timings = run["timings"]
+    results = ReviewBatch()
+    seen = set()
+    for n in sorted(pages):
+        duplicates = 0
+        for info in pages[n]:
+            key = review_key(info)
+            if key not in seen:
+                seen.add(key)
+                results.append(info)
+            else:
+                duplicates += 1
+        if n in timings.pages:
+            timings.page(n)["duplicates"] = duplicates
+        metrics.DUPLICATES.inc(duplicates)
+
+    results = normalize_batch(results)
+    results.meta.update(
+        truncated=run["truncated"] or bool(run["blocked"]),
+        blocked=bool(run["blocked"]),
+        last_page=max(pages) if pages else 0,
+        resumed_pages=resumed,
+        stopped_at_known=run["stopped_at_known"],
+        timings=timings.to_dict(),
+    )
+    if run["blocked"]:
+        logger.warning(f"Blocked mid-crawl ({run['blocked']}): {url} (last page {results.meta['last_page']})")
+    elif run["truncated"]:
+        reason = "Deadline reached" if deadline.expired() else "Crawl stopped early"
+        logger.warning(f"{reason}: {url} (last page {results.meta['last_page']}, {len(results)} reviews)")
+    elif checkpoint:
+        # 리뷰 페이지 끝까지 수집했을 때만 체크포인트 삭제 (이동 실패로 멈췄으면 resume 용으로 남김)
+        checkpoint.clear()
+    return results
 
-        await check_service_error(page)
 
-        iframe = await load_review_frame(page)
+async def _scrape_page_range(
+    page, url, start, end, pages, deadline, run, engine, parser, snapshot_dir, sort, ratings, media_only
+):
+    """
+    탭 1개로 리뷰 페이지 start~end 수집 → pages[페이지 번호] = 리뷰 리스트
+    start > 1 이면 페이지 그룹 이동으로 바로 start 페이지로 감
+    체크포인트에서 이미 불러온 페이지는 지나가기만 하고 다시 파싱하지 않음
+    deadline 이 지나거나 페이지 이동 확인이 안 되면 run["truncated"] 를 켜고 끝냄
+    (리뷰 페이지가 더 없어서 끝난 경우만 truncated 아님)
+    차단이 감지되면 그 자리에서 멈추고 run["blocked"] 에 이유를 남김
+    """
+    try:
+        capture = NetworkReviewCapture(page) if engine == "network" else None
+        watcher = BlockWatcher(page)
 
-        results = []
-        seen = set()
+        timings = run["timings"]
 
-        for n in range(1, limit_pages + 1):
-            await smooth_scroll(iframe, steps=12, delay=250)
+        await throttle(url, deadline)
+        with timings.phase("navigation", metrics.GOTO):
+            response = await page.goto(url, timeout=deadline.cap(120000))
+            await page.wait_for_timeout(deadline.cap(2000))
 
-            soup = BeautifulSoup(await iframe.content(), "lxml")
-            cards = soup.select(".IwcuBUIAKf")
+        await check_service_error(page, watcher=watcher, response=response)
 
-            for card in cards:
-                info = parse_review_card(card)
-                if not info:
-                    continue
+        iframe = await load_review_frame(page, deadline, timings)
 
-                key = f"{info['nickname']}|{info['date']}|{info['content'][:20]}"
-                if key not in seen:
-                    seen.add(key)
-                    results.append(info)
+        sort_applied = False
+        if sort or ratings or media_only:
+            if capture:
+                # 기본 정렬로 받은 첫 응답은 버림
+                capture.drain()
+            applied = await apply_review_view(iframe, sort, sorted(ratings) if ratings else None, media_only, deadline)
+            sort_applied = bool(applied.get("sort"))
 
-            # 다음 페이지
-            next_btn = iframe.locator(f'.LiT9lKOVbw a:has-text("{n+1}")').first
-            if await next_btn.count():
-                await next_btn.click()
-                await page.wait_for_timeout(2000)
+        # 정렬 순서에 기대는 조기 종료(정렬 범위 밖 / 증분 수집)는 정렬 컨트롤이 실제로 눌렸을 때만
+        # (못 눌렀으면 기본 랭킹순이라 "아는 리뷰만 있는 페이지" 뒤에도 새 리뷰가 있을 수 있음)
+        sorted_by = sort if sort_applied else None
+        known = run["known_keys"] if sort_applied else None
+        if run["known_keys"] is not None and known is None:
+            logger.warning(f"Sort not applied on {url}, incremental stop disabled (scraping up to page {end})")
+
+        if start > 1:
+            if capture:
+                capture.drain()
+            try:
+                exists = await goto_review_page(iframe, start, timeout_ms=deadline.cap(10000), deadline=deadline)
+            except PageNavigationFailed:
+                # 차단 페이지라서 못 간 거면 ServiceBlocked 로 (속도 제한도 낮춤)
+                await check_service_error(page, iframe, watcher)
+                # 이 탭이 맡은 구간을 통째로 못 받음 → 결과가 빠졌다고 표시
+                logger.warning(f"Tab {start}~{end} of {url}: could not jump to start page {start}")
+                run["truncated"] = True
+                return
+            if not exists:
+                # 리뷰 페이지가 start 보다 적음
+                logger.info(f"Tab {start}~{end} of {url}: no review page {start}, nothing to scrape")
+                return
+            await page.wait_for_timeout(deadline.cap(300))
+
+        checkpoint = run["checkpoint"]
+        for n in range(start, end + 1):
+            if n in pages:
+                cards = pages[n]
             else:
+                with timings.page_phase(n, "scroll_ms"):
+                    steps = await scroll_until_stable(iframe, max_steps=12, delay=250, deadline=deadline)
+                deadline.check()
+
+                with timings.page_phase(n, "parse_ms"):
+                    snapshot_path = os.path.join(snapshot_dir, f"page_{n:03d}.html") if snapshot_dir else None
+                    cards = await collect_page(iframe, engine, parser, capture, snapshot_path)
+                    pages[n] = [info for info in cards if matches_view(info, ratings, media_only)]
+
+                entry = timings.page(n)
+                entry.update(scroll_steps=steps, cards=len(cards))
+                metrics.PAGE_PARSE.observe((entry["scroll_ms"] + entry["parse_ms"]) / 1000)
+                metrics.PAGES.inc()
+                metrics.CARDS.inc(len(cards))
+
+                if checkpoint:
+                    # fsync 는 스레드에서 (이벤트 루프를 막지 않게)
+                    await asyncio.to_thread(checkpoint.record_page, n, pages[n], review_key)
+                if run["on_page"]:
+                    run["on_page"](n, pages[n])
+
+            if past_sorted_range(cards, sorted_by, ratings) or n == end:
                 break
 
-        await browser.close()
-        return results
+            if known is not None and pages[n] and all(review_key(info) in known for info in pages[n]):
+                # 증분 수집: 이 페이지부터는 전에 받은 리뷰
+                run["stopped_at_known"] = n
+                break
+
+            # 다음 페이지 (그룹 경계면 다음 그룹 버튼까지 처리)
+            try:
+                with timings.page_phase(n, "nav_ms"):
+                    moved = await goto_review_page(iframe, n + 1, timeout_ms=deadline.cap(10000), deadline=deadline)
+            except PageNavigationFailed:
+                # 이동 확인이 안 된 게 차단 때문이면 잘린 결과가 아니라 차단으로 보고
+                await check_service_error(page, iframe, watcher)
+                raise
+            metrics.PAGE_NAV.observe(timings.page(n)["nav_ms"] / 1000)
+
+            # 페이지 이동마다 차단 확인 (빈 페이지를 limit_pages 까지 파싱하지 않도록)
+            await check_service_error(page, iframe, watcher)
+
+            if not moved:
+                # 다음 페이지 없음 = 끝까지 수집
+                break
+            await page.wait_for_timeout(deadline.cap(300))
+
+    except DeadlineExceeded:
+        run["truncated"] = True
+    except PageNavigationFailed as e:
+        if not deadline.expired():
+            logger.warning(f"Stopping tab {start}~{end} of {url}: {e}")
+        run["truncated"] = True
+    except ServiceBlocked as e:
+        run["blocked"] = e.reason
+    except HTTPException:
+        raise
+    except Exception:
+        # deadline 으로 잘린 goto 등의 TimeoutError
+        if not deadline.expired():
+            raise
+        run["truncated"] = True
 
 # ============================================================
 # 10) 엔드포인트
 # ============================================================
-@app.post("/scrape")
-async def scrape_endpoint(
+# 설정하면 /scrape 가 페이지마다 체크포인트를 남기고 resume=true 로 이어서 수집 가능
+CHECKPOINT_DIR = os.getenv("SCRAPER_CHECKPOINT_DIR") or None
+
+# SCRAPER_WORKERS > 0 이면 startup 에서 워커 프로세스 기동, /scrape 와 /jobs 는 큐로 보냄
+supervisor: Optional[WorkerSupervisor] = None
+
+# watchlist 주기 갱신 (SCRAPER_SCHEDULER)
+# sqlite 파일은 import 가 아니라 startup 에서 만듦 (CLI / 테스트가 import 만 해도 파일이 생기지 않게)
+watchlist: Optional[Watchlist] = None
+scheduler: Optional[WatchScheduler] = None
+
+def parse_ratings(raw: Optional[str]) -> Optional[List[int]]:
+    """ "1,2" → [1, 2] """
+    if not raw:
+        return None
+    try:
+        ratings = [int(x) for x in raw.split(",") if x.strip()]
+    except ValueError:
+        raise HTTPException(400, f"rating 형식 오류: {raw}")
+    if any(r < 1 or r > 5 for r in ratings):
+        raise HTTPException(400, f"rating 은 1~5: {raw}")
+    return ratings or None
+
+
+def parse_fields(raw: Optional[str]) -> Optional[List[str]]:
+    """ "rating,date,content" → 응답 리뷰 dict 에 넣을 컬럼 (None 이면 전체)"""
+    if not raw:
+        return None
+    fields = list(dict.fromkeys(x.strip() for x in raw.split(",") if x.strip()))
+    allowed = COLUMNS + DERIVED_COLUMNS
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise HTTPException(400, f"fields 는 {', '.join(allowed)} 중에서: {', '.join(unknown)}")
+    return fields or None
+
+
+async def load_cookie_data(cookie_file: Optional[UploadFile], session_id: Optional[str]) -> dict:
+    """cookie_file 업로드 또는 등록된 session_id → create_page 에 넘길 cookie_data"""
+    if session_id:
+        try:
+            return {"cookies": get_registry().cookies(session_id), "normalized": True}
+        except SessionNotFound:
+            raise HTTPException(404, f"세션 없음: {session_id}")
+    if cookie_file is None:
+        raise HTTPException(400, "cookie_file 또는 session_id 필요")
+    try:
+        return json.loads((await cookie_file.read()).decode("utf-8"))
+    except ValueError:
+        raise HTTPException(400, "쿠키 JSON 형식 오류")
+
+
+@app.post("/sessions")
+async def create_session(cookie_file: UploadFile = File(...)):
+    cookie_data = await load_cookie_data(cookie_file, None)
+    try:
+        cookies = [normalize_cookie(c) for c in cookie_data.get("cookies", [])]
+    except KeyError as e:
+        raise HTTPException(400, f"쿠키 필드 누락: {e}")
+    if not cookies:
+        raise HTTPException(400, "쿠키가 비어 있음")
+    return get_registry().register(cookies)
+
+
+@app.get("/sessions/{session_id}")
+async def get_session(session_id: str):
+    try:
+        return get_registry().info(session_id)
+    except SessionNotFound:
+        raise HTTPException(404, f"세션 없음: {session_id}")
+
+
+@app.delete("/sessions/{session_id}")
+async def delete_session(session_id: str):
+    if not get_registry().delete(session_id):
+        raise HTTPException(404, f"세션 없음: {session_id}")
+    return {"deleted": session_id}
+
+
+async def scrape_form(
     url: str = Form(...),
     limit_pages: int = Form(3),
-    cookie_file: UploadFile = File(...)
-):
-    cookie_json = (await cookie_file.read()).decode("utf-8")
-    cookie_data = json.loads(cookie_json)
+    cookie_file: Optional[UploadFile] = File(None),
+    session_id: Optional[str] = Form(None),
+    sort: Optional[str] = Form(None),
+    rating: Optional[str] = Form(None),
+    media_only: bool = Form(False),
+    tabs: int = Form(1),
+    deadline_seconds: Optional[float] = Form(None),
+    resume: bool = Form(False),
+    profile: bool = Form(False),
+    trace: bool = Form(False),
+    timings: bool = Form(False),
+    fields: Optional[str] = Form(None),
+) -> dict:
+    """/scrape 와 /jobs 공통 폼 → 작업 파라미터 (cookie_file 외에는 JSON 으로 큐에 저장 가능)"""
+    if sort and sort not in SORTS:
+        raise HTTPException(400, f"sort 는 {', '.join(SORTS)} 중 하나")
+    if deadline_seconds is not None and deadline_seconds <= 0:
+        raise HTTPException(400, "deadline_seconds 는 0 보다 커야 함")
+    if cookie_file is None and not session_id:
+        raise HTTPException(400, "cookie_file 또는 session_id 필요")
+
+    # 요청 합치기는 같은 쿠키끼리만 (session_id 또는 업로드한 쿠키 파일 해시)
+    if session_id:
+        identity = f"session:{session_id}"
+    else:
+        identity = "cookie:" + hashlib.sha1(await cookie_file.read()).hexdigest()
+        await cookie_file.seek(0)
+
+    return dict(
+        url=url,
+        limit_pages=limit_pages,
+        cookie_file=cookie_file,
+        session_id=session_id,
+        sort=sort,
+        ratings=parse_ratings(rating),
+        media_only=media_only,
+        tabs=max(1, min(tabs, 8)),
+        deadline_seconds=deadline_seconds,
+        # 요청이 들어온 시각 기준 마감 (큐에서 기다린 시간도 포함)
+        deadline_at=time.time() + deadline_seconds if deadline_seconds else None,
+        identity=identity,
+        resume=resume,
+        profile=profile,
+        trace=trace,
+        timings=timings,
+        fields=parse_fields(fields),
+    )
+
+
+async def scrape_job(params: dict, cookie_data: Optional[dict] = None, browser=None, on_page=None) -> ReviewBatch:
+    """
+    작업 1건 수집 + 저장소 기록, 응답에 필요한 값은 batch.meta 에
+    params["incremental"] 이면 저장소에 있는 리뷰만 나오는 페이지에서 멈춤 (watchlist 갱신)
+    """
+    if cookie_data is None:
+        # watchlist 는 세션 없이 등록 가능
+        sid = params.get("session_id")
+        cookie_data = await load_cookie_data(None, sid) if sid else {}
+
+    product_id = product_id_from_url(params["url"])
+    # 저장소 sqlite 호출은 스레드에서 (저장 / 키 조회가 이벤트 루프를 막지 않게)
+    known_keys = await asyncio.to_thread(get_store().keys, product_id) if params.get("incremental") else None
+
+    deadline_seconds = params["deadline_seconds"]
+    if params.get("deadline_at"):
+        deadline_seconds = params["deadline_at"] - time.time()
+
+    # profile=false 면 프로파일러 객체 자체를 만들지 않음
+    profiler = RequestProfiler(job_id=params.get("job_id"), trace=params["trace"]) if params["profile"] else None
+
+    if deadline_seconds is not None and deadline_seconds <= 0:
+        # 큐에서 기다리는 동안 마감 → 브라우저를 열지 않음
+        logger.warning(f"Deadline passed before scraping started: {params['url']}")
+        # 빈 결과도 정규화 (저장 / 응답이 date_iso 등 파생 컬럼을 찾음)
+        data = normalize_batch(ReviewBatch())
+        data.meta.update(truncated=True)
+    else:
+        async with profiler or nullcontext():
+            data = await scrape_reviews(
+                params["url"],
+                params["limit_pages"],
+                cookie_data,
+                browser=browser,
+                sort=params["sort"],
+                ratings=params["ratings"],
+                media_only=params["media_only"],
+                tabs=params["tabs"],
+                deadline_seconds=deadline_seconds,
+                checkpoint_dir=CHECKPOINT_DIR,
+                resume=params["resume"] and bool(CHECKPOINT_DIR),
+                trace_dir=profiler.trace_dir if profiler else None,
+                on_page=on_page,
+                known_keys=known_keys,
+                identity=params.get("identity"),
+            )
+
+    stored = await asyncio.to_thread(get_store().save, product_id, data, review_key)
+    data.meta.update(product_id=product_id, stored=stored)
+    if profiler:
+        data.meta["profile"] = profiler.summary()
+    return data
+
+
+def scrape_body(params: dict, data: ReviewBatch, reviews: bool = True) -> dict:
+    """응답 body (같은 수집 결과라도 요청마다 fields / timings 가 다를 수 있음)"""
+    body = {
+        "product_id": data.meta.get("product_id"),
+        "count": len(data),
+        "stored": data.meta.get("stored", 0),
+        "truncated": data.meta.get("truncated", False),
+        "blocked": data.meta.get("blocked", False),
+        "last_page": data.meta.get("last_page", 0),
+        "resumed_pages": data.meta.get("resumed_pages", 0),
+    }
+    if params["timings"]:
+        body["timings"] = data.meta.get("timings", {})
+    if params.get("incremental"):
+        body["stopped_at_known"] = data.meta.get("stopped_at_known")
+    if "profile" in data.meta:
+        body["profile"] = data.meta["profile"]
+    if reviews:
+        body["reviews"] = data.to_records(params.get("fields"))
+    return body
+
+
+async def run_scrape_job(params: dict, cookie_data: Optional[dict] = None, browser=None, on_page=None) -> dict:
+    """
+    작업 1건 수집 → 응답 body (API 프로세스에서 바로 / 워커 프로세스에서 같이 사용)
+    스트리밍 작업은 리뷰를 페이지마다 이미 보냈으므로 body 에 reviews 를 빼고 "done" 줄 내용만
+    """
+    data = await scrape_job(params, cookie_data, browser, on_page)
+    return scrape_body(params, data, reviews=not params.get("stream"))
+
 
+async def enqueue(params: dict) -> str:
+    """
+    큐에 작업 등록, 등록된 세션이면 session_id 만 넘김
+    업로드된 쿠키는 세션 등록소에 남기지 않고 작업 행에만 (작업이 끝나면 큐가 지움)
+    """
+    cookie_file = params.pop("cookie_file")
+    cookies = None
+    if not params["session_id"]:
+        cookie_data = await load_cookie_data(cookie_file, None)
+        try:
+            cookies = [normalize_cookie(c) for c in cookie_data.get("cookies", [])]
+        except KeyError as e:
+            raise HTTPException(400, f"쿠키 필드 누락: {e}")
+    return await asyncio.to_thread(supervisor.queue.submit, params, cookies)
+
+
+@app.on_event("startup")
+async def start_workers():
+    global supervisor
+    if WORKERS > 0:
+        supervisor = WorkerSupervisor(WORKERS, JobQueue())
+        await supervisor.start()
+
+
+@app.on_event("shutdown")
+async def stop_workers():
+    if supervisor:
+        await supervisor.stop()
+
+
+async def refresh_watched(entry: dict) -> int:
+    """watchlist 갱신 1건: 최신순 증분 수집, 새로 저장된 리뷰 수 반환"""
+    params = dict(
+        url=entry["url"],
+        limit_pages=entry["pages"],
+        session_id=entry["session_id"],
+        sort="newest",
+        ratings=None,
+        media_only=False,
+        tabs=1,
+        deadline_seconds=None,
+        resume=False,
+        profile=False,
+        trace=False,
+        timings=False,
+        # 리뷰는 저장소에 들어가므로 응답은 최소로
+        fields=["date_iso"],
+        incremental=True,
+    )
+    if supervisor:
+        job_id = await asyncio.to_thread(supervisor.queue.submit, params)
+        job = await supervisor.queue.wait(job_id)
+        if job["status"] == "error":
+            raise RuntimeError(job["error"])
+        return job["result"]["stored"]
+
+    data = await scrape_job(params)
+    return data.meta["stored"]
+
+
+@app.on_event("startup")
+async def start_scheduler():
+    global watchlist, scheduler
+    watchlist = await asyncio.to_thread(Watchlist)
+    if review_watchlist.ENABLED:
+        scheduler = WatchScheduler(watchlist, refresh_watched)
+        await scheduler.start()
+
+
+@app.on_event("shutdown")
+async def stop_scheduler():
+    if scheduler:
+        await scheduler.stop()
+
+
+# 같은 상품 + 같은 옵션의 동시 요청은 수집 1번으로 합침
+flights = SingleFlight(review_key)
+
+# deadline 이 이 간격 안에서 끝나는 요청끼리만 합침 (수집은 먼저 온 요청의 deadline 으로 잘림)
+FLIGHT_DEADLINE_BUCKET_SECONDS = 30
+
+
+def flight_key(params: dict, mode: str) -> tuple:
+    """
+    결과에 영향을 주는 옵션 + 쿠키(identity) + deadline 구간 (tabs 같은 실행 옵션은 제외)
+    → 다른 세션의 요청은 합치지 않음
+    → deadline 없는 요청은 deadline 있는 수집에 붙지 않음 (잘린 결과를 받지 않게),
+      deadline 있는 요청은 마감 시각이 같은 FLIGHT_DEADLINE_BUCKET_SECONDS 구간인 수집에만 붙고
+      기다리는 시간은 wait_flight 로 요청마다 따로 적용
+    큐 / 스트림(워커 모드) 모드는 워커가 만든 응답 body / 페이지를 그대로 나눠 주므로 fields / timings 도 포함
+    """
+    deadline_at = params.get("deadline_at")
+    key = (
+        mode,
+        params["identity"],
+        int(deadline_at // FLIGHT_DEADLINE_BUCKET_SECONDS) if deadline_at else None,
+        product_id_from_url(params["url"]),
+        params["limit_pages"],
+        params["sort"],
+        tuple(params["ratings"] or ()),
+        params["media_only"],
+        params["resume"],
+    )
+    if mode in ("queue", "stream"):
+        key += (tuple(params["fields"] or ()), params["timings"])
+    return key
+
+
+async def scrape_inline(params: dict, flight: Optional[Flight] = None) -> ReviewBatch:
+    cookie_data = await load_cookie_data(params.pop("cookie_file"), params["session_id"])
+    return await scrape_job(params, cookie_data, on_page=flight.page if flight else None)
+
+
+async def scrape_queued(params: dict, flight: Optional[Flight] = None) -> str:
+    """워커 결과 (직렬화된 응답 body 문자열)"""
+    job_id = await enqueue(params)
+    if flight:
+        flight.job_id = job_id
+    job = await supervisor.queue.wait(job_id, raw=True)
+    if job["status"] == "error":
+        raise HTTPException(job["status_code"] or 500, job["error"])
+    return job["result"]
+
+
+async def stream_queued(params: dict, flight: Flight) -> dict:
+    """
+    워커 모드 스트리밍: 워커가 job_pages 에 남기는 페이지를 읽어서 flight 로 넘김
+    (API 프로세스는 sqlite 폴링만, 브라우저 / 파싱은 워커에서)
+    반환값은 "done" 줄 body
+    """
+    queue = supervisor.queue
+    params["stream"] = True
+    job_id = flight.job_id = await enqueue(params)
+    after = 0
+    while True:
+        job = await asyncio.to_thread(queue.get, job_id, True)
+        # 끝난 뒤에도 한 번 더 읽어서 마지막 페이지를 놓치지 않음
+        for rowid, n, reviews in await asyncio.to_thread(queue.pages, job_id, after):
+            flight.push({"page": n, "records": loads(reviews)})
+            after = rowid
+        if job is None or job["status"] in ("done", "error"):
+            break
+        await asyncio.sleep(POLL_SECONDS)
+
+    # 다 읽은 페이지는 큐에서 지움 (늦게 붙는 요청은 flight 의 이벤트로 받음)
+    await asyncio.to_thread(queue.drop_pages, job_id)
+    if job is None:
+        raise HTTPException(500, "작업이 사라졌습니다.")
+    if job["status"] == "error":
+        raise HTTPException(job["status_code"] or 500, job["error"])
+    return loads(job["result"])
+
+
+def flight_timeout(params: dict) -> Optional[float]:
+    """이 요청의 deadline 까지 남은 초 (수집 쪽 deadline 처리 여유 포함), deadline 없으면 None"""
+    if not params.get("deadline_at"):
+        return None
+    return max(0.0, params["deadline_at"] - time.time() + DEADLINE_GRACE_SECONDS)
+
+
+async def wait_flight(flight: Flight, params: dict):
+    """
+    합류한 수집 결과를 이 요청의 deadline 까지만 기다림, 지나면 None
+    (수집 자체는 먼저 시작한 요청의 옵션대로 계속 → 다른 요청 / 저장소는 결과를 받음)
+    """
+    try:
+        return await asyncio.wait_for(flight.wait(), flight_timeout(params))
+    except asyncio.TimeoutError:
+        logger.warning(f"Deadline reached while waiting for in-flight scrape {flight.key}")
+        return None
+
+
+def partial_body(params: dict, flight: Flight, reviews: bool = True) -> dict:
+    """deadline 안에 안 끝난 합류 요청: 지금까지 나온 페이지로 truncated 응답 (워커 모드면 job_id 로 나중에 조회)"""
+    events = sorted(flight.events, key=lambda e: e["page"])
+    body = {
+        "product_id": product_id_from_url(params["url"]),
+        "count": 0,
+        "stored": 0,
+        "truncated": True,
+        "blocked": False,
+        "last_page": events[-1]["page"] if events else 0,
+        "resumed_pages": 0,
+    }
+    if flight.job_id:
+        body["job_id"] = flight.job_id
+    records = []
+    for event in events:
+        records += event["records"] if "records" in event else event["batch"].to_records(params["fields"])
+    body["count"] = len(records)
+    if reviews:
+        body["reviews"] = records
+    return body
+
+
+# 리뷰 응답은 FastJSONResponse 를 직접 반환 → jsonable_encoder 를 거치지 않음
+@app.post("/scrape", response_class=FastJSONResponse)
+async def scrape_endpoint(params: dict = Depends(scrape_form)):
     try:
-        data = await scrape_reviews(url, limit_pages, cookie_data)
+        if supervisor:
+            if params["profile"]:
+                # 프로파일은 요청마다 따로
+                result = await scrape_queued(params)
+            else:
+                flight = flights.join(flight_key(params, "queue"), lambda f: scrape_queued(params, f))
+                result = await wait_flight(flight, params)
+                if result is None:
+                    return FastJSONResponse(partial_body(params, flight))
+            # 워커가 직렬화해 둔 결과를 그대로
+            return raw_response(result.encode("utf-8"))
+
+        if params["profile"]:
+            data = await scrape_inline(params)
+        else:
+            flight = flights.join(flight_key(params, "inline"), lambda f: scrape_inline(params, f))
+            data = await wait_flight(flight, params)
+            if data is None:
+                return FastJSONResponse(partial_body(params, flight))
+        return FastJSONResponse(scrape_body(params, data))
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Scraping error: {e}")
         raise HTTPException(500, f"스크래핑 오류: {repr(e)}")
 
-    return {"count": len(data), "reviews": data}
+
+@app.post("/scrape/stream")
+async def scrape_stream(params: dict = Depends(scrape_form)):
+    """
+    NDJSON 스트리밍: 페이지가 끝날 때마다 {"type": "page", "page": n, "reviews": [...]} 한 줄,
+    마지막 줄은 {"type": "done", count, truncated, ...} 또는 {"type": "error", status_code, detail}
+    같은 상품을 수집 중이면 거기에 붙어서 이미 나온 페이지부터 받음
+    워커 모드면 워커가 수집하고 페이지는 작업 큐(job_pages)를 통해 받음 → API 이벤트 루프는 막히지 않음
+    """
+    if supervisor:
+        flight = flights.join(flight_key(params, "stream"), lambda f: stream_queued(params, f))
+    else:
+        flight = flights.join(flight_key(params, "inline"), lambda f: scrape_inline(params, f))
+    fields = params["fields"]
+
+    async def lines():
+        events = flight.follow()
+        count = last_page = 0
+        while True:
+            try:
+                event = await asyncio.wait_for(events.__anext__(), flight_timeout(params))
+            except StopAsyncIteration:
+                break
+            except asyncio.TimeoutError:
+                # 이 요청의 deadline: 보낸 페이지까지로 끝냄 (수집은 계속)
+                body = partial_body(params, flight, reviews=False)
+                body.update(count=count, last_page=last_page)
+                yield dumps({"type": "done", **body}) + b"\n"
+                return
+            reviews = event["records"] if "records" in event else event["batch"].to_records(fields)
+            count += len(reviews)
+            last_page = max(last_page, event["page"])
+            yield dumps({"type": "page", "page": event["page"], "reviews": reviews}) + b"\n"
+        try:
+            data = await flight.wait()
+        except HTTPException as e:
+            yield dumps({"type": "error", "status_code": e.status_code, "detail": e.detail}) + b"\n"
+            return
+        except Exception as e:
+            logger.error(f"Scraping error: {e}")
+            yield dumps({"type": "error", "status_code": 500, "detail": f"스크래핑 오류: {repr(e)}"}) + b"\n"
+            return
+        body = data if isinstance(data, dict) else scrape_body(params, data, reviews=False)
+        yield dumps({"type": "done", **body}) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.post("/jobs")
+async def submit_job(params: dict = Depends(scrape_form)):
+    if not supervisor:
+        raise HTTPException(503, "워커 모드 아님 (SCRAPER_WORKERS 설정 필요)")
+    return {"job_id": await enqueue(params), "status": "queued"}
+
+
+@app.get("/jobs/{job_id}", response_class=FastJSONResponse)
+async def get_job(job_id: str):
+    if not supervisor:
+        raise HTTPException(503, "워커 모드 아님 (SCRAPER_WORKERS 설정 필요)")
+    job = await asyncio.to_thread(supervisor.queue.get, job_id, True)
+    if job is None:
+        raise HTTPException(404, f"작업 없음: {job_id}")
+
+    # 저장된 결과 JSON 은 파싱 / 재직렬화 없이 이어 붙임
+    result = job.pop("result", None)
+    body = dumps(job)
+    if result is not None:
+        body = body[:-1] + b',"result":' + result.encode("utf-8") + b"}"
+    return raw_response(body)
+
+
+@app.get("/products/{product_id}/reviews", response_class=FastJSONResponse)
+async def product_reviews(
+    product_id: str,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    fields: Optional[str] = None,
+):
+    """저장된 리뷰를 keyset 페이지네이션 (next_cursor 가 None 이면 끝)"""
+    try:
+        after = int(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(400, f"cursor 형식 오류: {cursor}")
+    page = await asyncio.to_thread(get_store().page, product_id, after, max(1, min(limit, 1000)), parse_fields(fields))
+    return FastJSONResponse(page)
+
+
+@app.post("/watchlist")
+async def watch_product(
+    url: str = Form(...),
+    interval_minutes: float = Form(60),
+    pages: int = Form(10),
+    session_id: Optional[str] = Form(None),
+):
+    """상품 등록 (이미 있으면 설정 변경), 등록 직후 1번 갱신"""
+    if interval_minutes <= 0 or pages < 1:
+        raise HTTPException(400, "interval_minutes > 0, pages >= 1")
+    if session_id:
+        try:
+            await asyncio.to_thread(get_registry().info, session_id)
+        except SessionNotFound:
+            raise HTTPException(404, f"세션 없음: {session_id}")
+    product_id = product_id_from_url(url)
+    return await asyncio.to_thread(watchlist.add, product_id, url, interval_minutes * 60, pages, session_id)
+
+
+@app.get("/watchlist")
+async def list_watchlist():
+    return {"scheduler": scheduler is not None, "products": await asyncio.to_thread(watchlist.entries)}
+
+
+@app.post("/watchlist/{product_id}/run")
+async def run_watched(product_id: str):
+    if not await asyncio.to_thread(watchlist.run_now, product_id):
+        raise HTTPException(404, f"watchlist 에 없음: {product_id}")
+    return await asyncio.to_thread(watchlist.get, product_id)
+
+
+@app.delete("/watchlist/{product_id}")
+async def unwatch_product(product_id: str):
+    if not await asyncio.to_thread(watchlist.remove, product_id):
+        raise HTTPException(404, f"watchlist 에 없음: {product_id}")
+    return {"deleted": product_id}
+
+
+@app.get("/workers")
+async def list_workers():
+    if not supervisor:
+        return {"workers": [], "jobs": {}}
+    queue = supervisor.queue
+    return {"workers": await asyncio.to_thread(queue.workers), "jobs": await asyncio.to_thread(queue.counts)}
+
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    if supervisor:
+        metrics.update_workers(await asyncio.to_thread(supervisor.queue.workers))
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
 
 
 @app.get("/")
@@ -5,11 +5,8 @@ FastAPI 기반 SmartStore 리뷰 스크래퍼 API 서버
 """
 
 import time
-import pandas as pd
 from fastapi import FastAPI
 from pydantic import BaseModel
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
 
 app = FastAPI()
 
@@ -114,6 +111,9 @@ def load_review_frame(page):
 # 리뷰 수집 함수
 # ================================
 def scrape_reviews(url: str, limit_pages: int = 13):
+    from bs4 import BeautifulSoup
+    from playwright.sync_api import sync_playwright
+
     reviews = []
     seen = set()
 
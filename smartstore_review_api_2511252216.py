@@ -10,13 +10,14 @@ SmartStore Review Scraper API (with Naver Cookie Injection)
 import os
 import time
 import json
-from typing import List, Dict, Any
+from typing import TYPE_CHECKING, List, Dict, Any
 
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright, Browser, Page
 from starlette.concurrency import run_in_threadpool
 
+if TYPE_CHECKING:
+    from playwright.sync_api import Browser, Page
+
 app = FastAPI()
 
 
@@ -33,7 +34,7 @@ UA = (
 # ============================================================
 # 2) 브라우저 런처
 # ============================================================
-def launch_browser(p) -> Browser:
+def launch_browser(p) -> "Browser":
     headless_env = os.getenv("PLAYWRIGHT_HEADLESS", "false").lower()
     headless = headless_env in ("1", "true", "yes")
 
@@ -90,7 +91,7 @@ def normalize_cookie(c: dict) -> dict:
 # ============================================================
 # 4) 페이지 + 쿠키 삽입
 # ============================================================
-def create_page(browser: Browser, cookie_data: dict) -> Page:
+def create_page(browser: "Browser", cookie_data: dict) -> "Page":
     context = browser.new_context(
         locale="ko-KR",
         user_agent=UA,
@@ -166,7 +167,7 @@ def parse_review_card(card):
 # ============================================================
 # 6) 리뷰탭 & iframe 자동 탐지
 # ============================================================
-def load_review_frame(page: Page):
+def load_review_frame(page: "Page"):
     # 리뷰탭 클릭
     for _ in range(50):
         btn = page.locator('[data-name="REVIEW"]').first
@@ -191,7 +192,7 @@ def load_review_frame(page: Page):
 # ============================================================
 # 7) 네이버 시스템 에러 감지
 # ============================================================
-def check_service_error(page: Page):
+def check_service_error(page: "Page"):
     if "현재 서비스 접속이 불가합니다" in page.content():
         raise HTTPException(503, "네이버가 차단했습니다. 잠시 후 다시 시도하세요.")
 
@@ -200,6 +201,8 @@ def check_service_error(page: Page):
 # 8) 메인 스크래핑 함수
 # ============================================================
 def scrape_reviews(url: str, limit_pages: int, cookie_data: dict):
+    from bs4 import BeautifulSoup
+    from playwright.sync_api import sync_playwright
 
     with sync_playwright() as p:
         browser = launch_browser(p)
@@ -12,12 +12,13 @@ import os
 import json
 import time
 import logging
-from typing import List, Dict, Any
+from typing import TYPE_CHECKING, List, Dict, Any
 
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form
 from fastapi.concurrency import run_in_threadpool
-from playwright.async_api import async_playwright, Browser, Page
-from bs4 import BeautifulSoup
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, Page
 
 app = FastAPI()
 
@@ -42,7 +43,7 @@ UA = (
 # ============================================================
 # 2) 브라우저 런처
 # ============================================================
-async def launch_browser(p) -> Browser:
+async def launch_browser(p) -> "Browser":
     headless_env = os.getenv("PLAYWRIGHT_HEADLESS", "true").lower()
     headless = headless_env in ("1", "true", "yes")
 
@@ -88,7 +89,7 @@ def normalize_cookie(c: dict) -> dict:
 # ============================================================
 # 4) 페이지 + 쿠키 삽입
 # ============================================================
-async def create_page(browser: Browser, cookie_data: dict) -> Page:
+async def create_page(browser: "Browser", cookie_data: dict) -> "Page":
     context = await browser.new_context(
         locale="ko-KR",
         user_agent=UA,
@@ -157,7 +158,7 @@ def parse_review_card(card):
 # ============================================================
 # 6) 리뷰탭 + iframe 탐지
 # ============================================================
-async def load_review_frame(page: Page):
+async def load_review_frame(page: "Page"):
     logger.info("Seeking REVIEW tab...")
 
     for _ in range(50):
@@ -183,7 +184,7 @@ async def load_review_frame(page: Page):
 # ============================================================
 # 7) 에러 감지
 # ============================================================
-async def check_service_error(page: Page):
+async def check_service_error(page: "Page"):
     html = await page.content()
     if "현재 서비스 접속이 불가합니다" in html:
         raise HTTPException(503, "네이버가 차단했습니다.")
@@ -203,6 +204,8 @@ async def smooth_scroll(target, steps=10, delay=300):
 # 9) 메인 스크래핑
 # ============================================================
 async def scrape_reviews(url: str, limit_pages: int, cookie_data: dict):
+    from bs4 import BeautifulSoup
+    from playwright.async_api import async_playwright
 
     async with async_playwright() as p:
         browser = await launch_browser(p)
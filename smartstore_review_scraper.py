@@ -1,9 +1,10 @@
 # smartstore_review_scraper.py
 
 import time
-import pandas as pd
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
+
+from review_batch import ReviewBatch
+from review_normalize import normalize_batch
+from review_pagination import click_next_page
 
 
 # ================================
@@ -89,7 +90,9 @@ def load_review_frame(page):
 
     print("🔎 리뷰탭 탐색 중…")
 
-    # 리뷰탭 보일 때까지 스크롤
+    # 리뷰탭 보일 때까지 스크롤 (바닥에 닿아서 더 안 내려가면 그만)
+    last_y = None
+    stuck = 0
     for _ in range(40):
         btn = page.locator('[data-name="REVIEW"]').first
         if btn.is_visible():
@@ -99,6 +102,13 @@ def load_review_frame(page):
             break
         page.mouse.wheel(0, 600)
         time.sleep(0.2)
+
+        y = page.evaluate("window.scrollY")
+        stuck = stuck + 1 if y == last_y else 0
+        if stuck >= 3:
+            print("❌ 리뷰탭 못 찾음")
+            return None
+        last_y = y
     else:
         print("❌ 리뷰탭 못 찾음")
         return None
@@ -121,7 +131,10 @@ def load_review_frame(page):
 # 리뷰 전체 수집
 # ================================
 def extract_reviews_to_csv(url, limit_pages=13):
-    reviews = []
+    from bs4 import BeautifulSoup
+    from playwright.sync_api import sync_playwright
+
+    reviews = ReviewBatch()
     seen = set()
 
     with sync_playwright() as p:
@@ -152,23 +165,18 @@ def extract_reviews_to_csv(url, limit_pages=13):
                     seen.add(key)
                     reviews.append(info)
 
-            # 다음 페이지 버튼 클릭
-            pagination = iframe.locator(".LiT9lKOVbw")
-            next_btn = pagination.locator(f'a:has-text("{n+1}")').first
-
-            if next_btn.count() > 0:
+            # 다음 페이지 버튼 클릭 (10 페이지마다 "다음" 그룹 버튼)
+            if click_next_page(iframe, n + 1):
                 print(f"➡ 페이지 {n+1} 이동")
-                next_btn.click()
-                time.sleep(2)
             else:
                 print("⛔ 다음 페이지 없음")
                 break
 
         browser.close()
 
-    # 저장
-    df = pd.DataFrame(reviews)
-    df.to_csv("reviews.csv", index=False, encoding="utf-8-sig")
+    # 저장 (date_iso / date_ordinal 추가, rating → int)
+    normalize_batch(reviews)
+    reviews.to_csv("reviews.csv")
     print("\n====================================")
     print(f"✅ 총 리뷰 수집 완료: {len(reviews)}")
     print("📁 reviews.csv 저장됨")
@@ -0,0 +1,108 @@
+# tests/conftest.py
+
+# 저장소 루트의 모듈(rate_limiter, review_store, ...)을 패키지 설치 없이 import
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# ================================
+# 리뷰 데이터
+# ================================
+def _review_key(info):
+    # smartstore_review_api.review_key 와 같은 키 (API 는 fastapi 가 있어야 import 됨)
+    return f"{info['nickname']}|{info['date']}|{info['content'][:20]}"
+
+
+def _make_review(i, **fields):
+    review = {
+        "nickname": f"user{i}",
+        "date": "24.11.25.",
+        "rating": "5",
+        "option": "",
+        "auto_label": "",
+        "content": f"review {i}",
+        "image_count": 0,
+    }
+    review.update(fields)
+    return review
+
+
+@pytest.fixture
+def review_key():
+    return _review_key
+
+
+@pytest.fixture
+def make_review():
+    """make_review(i, **fields) → parse_review_card() 결과 모양의 dict"""
+    return _make_review
+
+
+@pytest.fixture
+def make_batch():
+    """make_batch(n, start=0) → user{start}..user{start+n-1} 리뷰를 정규화한 ReviewBatch"""
+
+    from review_batch import ReviewBatch
+    from review_normalize import normalize_batch
+
+    def make(n, start=0):
+        return normalize_batch(ReviewBatch([_make_review(i) for i in range(start, start + n)]))
+
+    return make
+
+
+# ================================
+# sqlite 상태 (tmp_path 안에 파일)
+# ================================
+@pytest.fixture
+def make_limiter(tmp_path):
+    from rate_limiter import RateLimiter
+
+    def make(rate=2.0, burst=2.0):
+        return RateLimiter(path=str(tmp_path / "rate.sqlite3"), rate=rate, burst=burst)
+
+    return make
+
+
+@pytest.fixture
+def make_checkpoint(tmp_path):
+    from review_checkpoint import Checkpoint
+
+    def make(options=None):
+        return Checkpoint(str(tmp_path), "https://smartstore.naver.com/x/products/1", "1", options or {"sort": None})
+
+    return make
+
+
+@pytest.fixture
+def make_store(tmp_path):
+    from review_store import ReviewStore
+
+    def make():
+        return ReviewStore(str(tmp_path / "reviews.sqlite3"))
+
+    return make
+
+
+@pytest.fixture
+def make_watchlist(tmp_path):
+    from review_watchlist import Watchlist
+
+    def make():
+        return Watchlist(str(tmp_path / "watch.sqlite3"))
+
+    return make
+
+
+@pytest.fixture
+def make_queue(tmp_path):
+    from review_jobs import JobQueue
+
+    def make():
+        return JobQueue(str(tmp_path / "jobs.sqlite3"))
+
+    return make
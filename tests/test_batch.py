@@ -0,0 +1,82 @@
+# tests/test_batch.py
+
+import pytest
+
+from review_batch import ReviewBatch
+from review_normalize import normalize_batch, normalize_frame
+
+
+def test_round_trip_and_dictionary_encoding(make_review):
+    reviews = [make_review(i, option="red" if i % 2 else "blue") for i in range(4)]
+    batch = ReviewBatch(reviews)
+
+    assert len(batch) == 4
+    assert batch.to_records() == reviews
+    assert batch[-1] == reviews[-1]
+    values, codes = batch.categories("option")
+    assert values == ["blue", "red"]
+    assert list(codes) == [0, 1, 0, 1]
+    with pytest.raises(IndexError):
+        batch[4]
+
+
+def test_missing_values_become_empty():
+    batch = ReviewBatch([{"nickname": "a"}])
+    assert batch[0] == {
+        "nickname": "a", "date": "", "rating": "", "option": "", "auto_label": "", "content": "", "image_count": 0,
+    }
+
+
+def test_to_records_fields(make_review):
+    batch = normalize_batch(ReviewBatch([make_review(1)]))
+    assert batch.to_records(["rating", "date_iso"]) == [{"rating": 5, "date_iso": "2024-11-25"}]
+    with pytest.raises(KeyError):
+        batch.to_records(["nope"])
+
+
+def test_normalize_batch(make_review):
+    batch = normalize_batch(ReviewBatch([
+        make_review(1, date="24.11.25.", rating="5"),
+        make_review(2, date="2023.01.02.", rating="4"),
+        make_review(3, date="bad", rating=""),
+    ]))
+
+    assert batch.columns[-2:] == ("date_iso", "date_ordinal")
+    assert batch.column("date_iso") == ["2024-11-25", "2023-01-02", ""]
+    assert batch.column("date_ordinal")[2] == 0
+    assert batch.column("rating") == [5, 4, None]
+    # 원본 date 는 그대로
+    assert batch.column("date") == ["24.11.25.", "2023.01.02.", "bad"]
+
+
+def test_normalize_empty_batch():
+    batch = normalize_batch(ReviewBatch())
+    assert batch.to_records() == []
+    assert "date_iso" in batch.columns
+
+
+def test_append_after_normalize_derives_new_values(make_review):
+    batch = normalize_batch(ReviewBatch([make_review(1)]))
+    batch.append(make_review(2, date="24.12.01.", rating="3"))
+    batch.append(make_review(3))
+
+    assert batch.column("date_iso") == ["2024-11-25", "2024-12-01", "2024-11-25"]
+    assert batch.column("rating") == [5, 3, 5]
+    assert batch[1]["date_iso"] == "2024-12-01"
+
+
+def test_normalize_frame(make_review):
+    pd = pytest.importorskip("pandas")
+
+    df = normalize_frame(pd.DataFrame([make_review(1), make_review(2, date="x", rating="")]))
+    assert df["date_iso"].tolist() == ["2024-11-25", ""]
+    assert df["date_ordinal"].tolist()[1] == 0
+    assert df["rating"].tolist()[0] == 5
+    assert pd.isna(df["rating"].tolist()[1])
+
+
+def test_normalize_frame_without_reviews():
+    pd = pytest.importorskip("pandas")
+
+    df = pd.DataFrame()
+    assert normalize_frame(df) is df
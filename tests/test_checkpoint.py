@@ -0,0 +1,67 @@
+# tests/test_checkpoint.py
+
+import json
+import threading
+
+
+def test_record_and_load(make_checkpoint, make_review, review_key):
+    a, b = make_review(1), make_review(2)
+    cp = make_checkpoint()
+    cp.record_page(1, [a], review_key)
+    cp.record_page(2, [b], review_key)
+
+    loaded = make_checkpoint()
+    pages = loaded.load(review_key)
+    assert sorted(pages) == [1, 2]
+    assert loaded.pages_done == [1, 2]
+    assert loaded.seen == {review_key(a), review_key(b)}
+
+
+def test_load_truncates_torn_last_line(make_checkpoint, make_review, review_key):
+    cp = make_checkpoint()
+    cp.record_page(1, [make_review(1)], review_key)
+    good_size = len(open(cp.pages_path, "rb").read())
+    # 쓰다가 죽은 줄
+    with open(cp.pages_path, "ab") as f:
+        f.write(b'{"page": 2, "reviews": [{"nick')
+
+    loaded = make_checkpoint()
+    assert sorted(loaded.load(review_key)) == [1]
+    assert len(open(cp.pages_path, "rb").read()) == good_size
+
+    # 잘라낸 뒤 append 한 줄도 다시 읽힘
+    loaded.record_page(2, [make_review(2)], review_key)
+    with open(cp.pages_path, encoding="utf-8") as f:
+        assert [json.loads(line)["page"] for line in f] == [1, 2]
+
+
+def test_options_change_key(make_checkpoint):
+    assert make_checkpoint({"sort": None}).key != make_checkpoint({"sort": "newest"}).key
+
+
+def test_identity_changes_key(make_checkpoint):
+    a = make_checkpoint({"sort": None, "identity": "session:a"})
+    b = make_checkpoint({"sort": None, "identity": "session:b"})
+    assert a.key != b.key
+
+
+def test_record_page_from_threads(make_checkpoint, make_review, review_key):
+    cp = make_checkpoint()
+
+    def record(n):
+        cp.record_page(n, [make_review(n, content="x" * 5000)], review_key)
+
+    threads = [threading.Thread(target=record, args=(n,)) for n in range(1, 9)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(make_checkpoint().load(review_key)) == list(range(1, 9))
+
+
+def test_clear(make_checkpoint, review_key):
+    cp = make_checkpoint()
+    cp.record_page(1, [], review_key)
+    cp.clear()
+    assert make_checkpoint().load(review_key) == {}
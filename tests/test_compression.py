@@ -0,0 +1,27 @@
+# tests/test_compression.py
+
+import pytest
+
+from review_compression import accepts
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("zstd", True),
+        ("gzip, deflate, br, zstd", True),
+        ("ZSTD;q=0.5", True),
+        ("zstd;q=0", False),
+        ("zstd; q=0.0, gzip", False),
+        ("zstd;q=abc", False),
+        ("gzip, *", False),
+        ("", False),
+        ("zstdx", False),
+    ],
+)
+def test_accepts_zstd(header, expected):
+    assert accepts(header, "zstd") is expected
+
+
+def test_accepts_other_coding():
+    assert accepts("zstd;q=0, gzip;q=0.8", "gzip")
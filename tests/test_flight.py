@@ -0,0 +1,132 @@
+# tests/test_flight.py
+
+import asyncio
+import time
+
+import pytest
+
+from review_flight import SingleFlight
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_same_key_shares_one_scrape(review_key):
+    async def main():
+        flights = SingleFlight(review_key)
+        calls = []
+        release = asyncio.Event()
+
+        async def start(flight):
+            calls.append(flight.key)
+            await release.wait()
+            return "result"
+
+        a = flights.join("k", start)
+        b = flights.join("k", start)
+        other = flights.join("other", start)
+        assert a is b and a is not other
+        assert a.joiners == 2
+
+        release.set()
+        assert await a.wait() == await b.wait() == "result"
+        await other.wait()
+        assert sorted(calls) == ["k", "other"]
+        # 끝난 뒤 같은 key 는 새로 수집
+        assert flights.flights == {}
+        assert flights.join("k", start) is not a
+
+    run(main())
+
+
+def test_late_joiner_replays_pages(make_review, review_key):
+    async def main():
+        flights = SingleFlight(review_key)
+        second_page = asyncio.Event()
+
+        async def start(flight):
+            flight.page(1, [make_review(1), make_review(1)])
+            await second_page.wait()
+            flight.page(2, [make_review(1), make_review(2)])
+            return "done"
+
+        flight = flights.join("k", start)
+        await asyncio.sleep(0)
+        late = flights.join("k", start)
+
+        async def collect():
+            return [(e["page"], e["batch"].column("nickname")) for e in [e async for e in late.follow()]]
+
+        task = asyncio.create_task(collect())
+        await asyncio.sleep(0)
+        second_page.set()
+        # 중복은 flight 안에서 제거, 정규화된 batch
+        assert await task == [(1, ["user1"]), (2, ["user2"])]
+        assert flight.events[0]["batch"].column("date_iso") == ["2024-11-25"]
+
+    run(main())
+
+
+def test_cancelled_waiter_does_not_cancel_scrape(review_key):
+    async def main():
+        flights = SingleFlight(review_key)
+        release = asyncio.Event()
+
+        async def start(flight):
+            await release.wait()
+            return "result"
+
+        flight = flights.join("k", start)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(flight.wait(), 0.01)
+        release.set()
+        assert await flight.wait() == "result"
+
+    run(main())
+
+
+def test_flight_key_separates_deadlines():
+    pytest.importorskip("fastapi")
+    from smartstore_review_api import FLIGHT_DEADLINE_BUCKET_SECONDS, flight_key
+
+    now = time.time()
+    base = dict(
+        url="https://smartstore.naver.com/x/products/1",
+        identity="session:a",
+        limit_pages=3,
+        sort=None,
+        ratings=None,
+        media_only=False,
+        resume=False,
+        fields=None,
+        timings=False,
+    )
+    none = flight_key(dict(base, deadline_at=None), "inline")
+    soon = flight_key(dict(base, deadline_at=now), "inline")
+    later = flight_key(dict(base, deadline_at=now + FLIGHT_DEADLINE_BUCKET_SECONDS * 2), "inline")
+    assert len({none, soon, later}) == 3
+    assert flight_key(dict(base, deadline_at=None, tabs=4), "inline") == none
+    assert flight_key(dict(base, deadline_at=None, identity="session:b"), "inline") != none
+
+
+def test_scrape_job_past_deadline_returns_normalized_empty_batch(monkeypatch, make_store):
+    pytest.importorskip("fastapi")
+    import smartstore_review_api as api
+
+    store = make_store()
+    monkeypatch.setattr(api, "get_store", lambda: store)
+    params = dict(
+        url="https://smartstore.naver.com/x/products/1",
+        deadline_seconds=5,
+        deadline_at=time.time() - 1,
+        profile=False,
+        trace=False,
+        timings=False,
+        fields=None,
+    )
+    data = asyncio.run(api.scrape_job(params, cookie_data={}))
+    body = api.scrape_body(params, data)
+    assert body["truncated"] is True
+    assert body["reviews"] == []
+    assert body["stored"] == 0
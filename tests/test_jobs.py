@@ -0,0 +1,101 @@
+# tests/test_jobs.py
+
+import os
+import stat
+import sys
+import time
+
+import pytest
+
+from review_jobs import MAX_ATTEMPTS
+
+COOKIES = [{"name": "NID_AUT", "value": "secret", "domain": ".naver.com", "path": "/"}]
+
+
+def stored_cookies(queue, job_id):
+    db = queue._connect()
+    try:
+        return db.execute("SELECT cookies FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+    finally:
+        db.close()
+
+
+def test_claim_returns_oldest_job_with_cookies(make_queue):
+    queue = make_queue()
+    first = queue.submit({"url": "a"}, COOKIES)
+    queue.submit({"url": "b"})
+
+    job = queue.claim(0)
+    assert job == {"id": first, "params": {"url": "a"}, "cookies": COOKIES}
+    assert queue.claim(0)["cookies"] is None
+    assert queue.claim(0) is None
+
+
+def test_requeue_returns_running_jobs(make_queue):
+    queue = make_queue()
+    a = queue.submit({"url": "a"})
+    b = queue.submit({"url": "b"})
+    queue.claim(0)
+    queue.claim(1)
+
+    # 워커 0 만 죽음
+    assert queue.requeue(0) == 1
+    assert queue.get(a)["status"] == "queued"
+    assert queue.get(b)["status"] == "running"
+    assert queue.claim(0)["id"] == a
+
+
+def test_requeue_errors_after_max_attempts_and_drops_cookies(make_queue):
+    queue = make_queue()
+    job_id = queue.submit({"url": "a"}, COOKIES)
+    for _ in range(MAX_ATTEMPTS - 1):
+        queue.claim(0)
+        assert queue.requeue() == 1
+    queue.claim(0)
+    assert queue.requeue() == 0
+
+    job = queue.get(job_id)
+    assert job["status"] == "error"
+    assert job["error"] == "worker crashed"
+    assert stored_cookies(queue, job_id) is None
+
+
+def test_finish_and_fail_drop_cookies(make_queue):
+    queue = make_queue()
+    done = queue.submit({"url": "a"}, COOKIES)
+    failed = queue.submit({"url": "b"}, COOKIES)
+    queue.claim(0)
+    queue.claim(0)
+    queue.finish(done, 0, {"count": 1})
+    queue.fail(failed, 0, "blocked", 503)
+
+    assert queue.get(done)["result"] == {"count": 1}
+    assert queue.get(failed)["status_code"] == 503
+    assert stored_cookies(queue, done) is None
+    assert stored_cookies(queue, failed) is None
+
+
+def test_stream_pages_drop_and_expire(make_queue):
+    queue = make_queue()
+    read = queue.submit({"url": "a"})
+    orphan = queue.submit({"url": "b"})
+    for job_id in (read, orphan):
+        queue.claim(0)
+        queue.add_page(job_id, 1, [{"content": "x"}])
+        queue.finish(job_id, 0, {})
+
+    assert [page for _, page, _ in queue.pages(read)] == [1]
+    queue.drop_pages(read)
+    assert queue.pages(read) == []
+
+    # 아직 TTL 안 지남
+    assert queue.expire_pages(max_age=600) == 0
+    time.sleep(0.01)
+    assert queue.expire_pages(max_age=0) == 1
+    assert queue.pages(orphan) == []
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX 권한")
+def test_database_is_private(make_queue):
+    queue = make_queue()
+    assert stat.S_IMODE(os.stat(queue.path).st_mode) == 0o600
@@ -0,0 +1,27 @@
+# tests/test_options.py
+
+import pytest
+
+from review_options import split_page_ranges
+
+
+@pytest.mark.parametrize(
+    "first, last, k, expected",
+    [
+        (1, 10, 1, [(1, 10)]),
+        (1, 10, 3, [(1, 4), (5, 7), (8, 10)]),
+        (4, 9, 2, [(4, 6), (7, 9)]),
+        # 탭이 페이지보다 많으면 페이지 수만큼
+        (1, 2, 5, [(1, 1), (2, 2)]),
+        (3, 3, 4, [(3, 3)]),
+        (1, 5, 0, [(1, 5)]),
+    ],
+)
+def test_split_page_ranges(first, last, k, expected):
+    assert split_page_ranges(first, last, k) == expected
+
+
+def test_split_page_ranges_covers_every_page_once():
+    ranges = split_page_ranges(2, 73, 6)
+    pages = [n for start, end in ranges for n in range(start, end + 1)]
+    assert pages == list(range(2, 74))
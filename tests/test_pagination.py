@@ -0,0 +1,67 @@
+# tests/test_pagination.py
+
+from review_pagination import click_next_page
+
+
+class FakePagination:
+    """10 페이지 그룹 + 다음 버튼만 흉내 (a 태그 index: 숫자들, 마지막이 "다음")"""
+
+    def __init__(self, total: int, current: int = 1):
+        self.total = total
+        self.current = current
+        self.clicks = []
+
+    def _group(self):
+        first = (self.current - 1) // 10 * 10 + 1
+        return list(range(first, min(first + 9, self.total) + 1))
+
+    def evaluate(self, js, selector):
+        group = self._group()
+        has_next = group[-1] < self.total
+        return {
+            "pages": [[num, i] for i, num in enumerate(group)],
+            "current": self.current,
+            "next": len(group) if has_next else -1,
+            "prev": -1,
+        }
+
+    def locator(self, selector):
+        return self
+
+    def nth(self, i):
+        return FakeLink(self, i)
+
+    def wait_for_function(self, js, arg, timeout):
+        if self._group()[0] == arg[1]:
+            raise TimeoutError("group did not change")
+
+
+class FakeLink:
+    def __init__(self, box, i):
+        self.box = box
+        self.i = i
+
+    def click(self):
+        group = self.box._group()
+        self.box.clicks.append(self.i)
+        # "다음" 은 다음 그룹의 첫 페이지로 이동
+        self.box.current = group[self.i] if self.i < len(group) else group[-1] + 1
+
+
+def test_click_exact_page_in_group():
+    box = FakePagination(total=25, current=1)
+    assert click_next_page(box, 2, delay=0)
+    assert box.current == 2
+    assert box.clicks == [1]
+
+
+def test_next_group_after_page_10():
+    box = FakePagination(total=25, current=10)
+    assert click_next_page(box, 11, delay=0)
+    assert box.current == 11
+
+
+def test_last_page_returns_false():
+    box = FakePagination(total=25, current=25)
+    assert not click_next_page(box, 26, delay=0)
+    assert box.clicks == []
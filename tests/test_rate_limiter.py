@@ -0,0 +1,60 @@
+# tests/test_rate_limiter.py
+
+import asyncio
+
+import pytest
+
+from rate_limiter import RateLimitWait
+
+
+def test_reserve_uses_burst_then_waits(make_limiter):
+    limiter = make_limiter()
+    assert limiter.reserve("smartstore.naver.com") == 0.0
+    assert limiter.reserve("smartstore.naver.com") == 0.0
+    # 버킷이 비면 토큰 1개가 생길 때까지 (1 / rate 초)
+    assert limiter.reserve("smartstore.naver.com") == pytest.approx(0.5, abs=0.05)
+
+
+def test_hosts_have_separate_buckets(make_limiter):
+    limiter = make_limiter(burst=1.0)
+    assert limiter.reserve("https://smartstore.naver.com/a/products/1") == 0.0
+    assert limiter.reserve("https://brand.naver.com/b/products/2") == 0.0
+    assert limiter.reserve("smartstore.naver.com") > 0
+
+
+def test_reserve_over_max_wait_does_not_take_token(make_limiter):
+    limiter = make_limiter(burst=1.0)
+    limiter.reserve("host")
+    with pytest.raises(RateLimitWait):
+        limiter.reserve("host", max_wait=0.1)
+    # 실패한 예약은 버킷에 남지 않음 → 기다릴 시간이 늘지 않음
+    assert limiter.reserve("host") == pytest.approx(0.5, abs=0.05)
+
+
+def test_penalize_halves_rate_and_empties_bucket(make_limiter):
+    limiter = make_limiter(rate=2.0, burst=5.0)
+    assert limiter.penalize("host") == pytest.approx(1.0)
+    # 토큰 0 에 속도 1/s → 1초
+    assert limiter.reserve("host") == pytest.approx(1.0, abs=0.05)
+
+
+def test_penalize_keeps_min_rate(make_limiter):
+    limiter = make_limiter(rate=0.2)
+    limiter.penalize("host")
+    assert limiter.penalize("host") == pytest.approx(limiter.min_rate)
+
+
+def test_acquire_raises_instead_of_sending_early(make_limiter):
+    limiter = make_limiter(rate=1.0, burst=1.0)
+
+    async def run():
+        await limiter.acquire("host")
+        with pytest.raises(RateLimitWait):
+            await limiter.acquire("host", max_wait=0.05)
+
+    asyncio.run(run())
+
+
+def test_disabled_limiter_never_waits(make_limiter):
+    limiter = make_limiter(rate=0)
+    assert asyncio.run(limiter.acquire("host", max_wait=0)) == 0.0
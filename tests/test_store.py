@@ -0,0 +1,43 @@
+# tests/test_store.py
+
+
+def test_save_ignores_duplicates(make_store, make_batch, review_key):
+    store = make_store()
+    assert store.save("p1", make_batch(5), review_key) == 5
+    assert store.save("p1", make_batch(7), review_key) == 2
+    assert store.count("p1") == 7
+    assert store.count("p2") == 0
+
+
+def test_page_keyset_pagination(make_store, make_batch, review_key):
+    store = make_store()
+    store.save("p1", make_batch(5), review_key)
+    store.save("p2", make_batch(3, start=100), review_key)
+
+    seen = []
+    cursor = None
+    while True:
+        page = store.page("p1", int(cursor) if cursor else None, limit=2, fields=["nickname"])
+        seen += [row["nickname"] for row in page["reviews"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+        assert len(page["reviews"]) == 2
+
+    # 다른 상품 리뷰는 섞이지 않고, 처음 저장된 순서 그대로 한 번씩
+    assert seen == [f"user{i}" for i in range(5)]
+
+
+def test_page_exact_multiple_has_no_empty_tail(make_store, make_batch, review_key):
+    store = make_store()
+    store.save("p1", make_batch(4), review_key)
+    first = store.page("p1", limit=2)
+    second = store.page("p1", int(first["next_cursor"]), limit=2)
+    assert len(second["reviews"]) == 2
+    assert second["next_cursor"] is None
+
+
+def test_keys(make_store, make_batch, review_key):
+    store = make_store()
+    store.save("p1", make_batch(2), review_key)
+    assert store.keys("p1") == {"user0|24.11.25.|review 0", "user1|24.11.25.|review 1"}
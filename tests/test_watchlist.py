@@ -0,0 +1,72 @@
+# tests/test_watchlist.py
+
+import os
+import time
+
+
+def set_row(watchlist, product_id, **values):
+    db = watchlist._connect()
+    try:
+        assignments = ", ".join(f"{k} = ?" for k in values)
+        db.execute(f"UPDATE watchlist SET {assignments} WHERE product_id = ?", (*values.values(), product_id))
+    finally:
+        db.close()
+
+
+def test_claim_due_orders_by_velocity_and_lateness(make_watchlist):
+    wl = make_watchlist()
+    now = time.time()
+    for pid in ("slow", "fast", "late", "future"):
+        wl.add(pid, f"https://smartstore.naver.com/x/products/{pid}", 3600, 3, None)
+    set_row(wl, "slow", velocity=0.0, next_run=now - 60)
+    set_row(wl, "fast", velocity=10.0, next_run=now - 60)
+    # 속도 0 이어도 주기의 몇 배만큼 밀렸으면 앞으로
+    set_row(wl, "late", velocity=0.0, next_run=now - 3600 * 20)
+    set_row(wl, "future", next_run=now + 600)
+
+    claimed = [entry["product_id"] for entry in wl.claim_due(10)]
+    assert claimed == ["late", "fast", "slow"]
+
+
+def test_claim_due_marks_running_and_respects_limit(make_watchlist):
+    wl = make_watchlist()
+    for pid in ("a", "b", "c"):
+        wl.add(pid, "u", 60, 1, None)
+
+    first = wl.claim_due(2)
+    assert len(first) == 2
+    # 이미 running 인 상품은 다시 안 나옴
+    second = wl.claim_due(10)
+    assert [e["product_id"] for e in second] == sorted({"a", "b", "c"} - {e["product_id"] for e in first})
+    assert wl.claim_due(10) == []
+    assert wl.claim_due(0) == []
+
+
+def test_finish_schedules_next_run(make_watchlist):
+    wl = make_watchlist()
+    wl.add("a", "u", 120, 1, None)
+    entry = wl.claim_due(1)[0]
+    wl.finish(entry, 4)
+
+    row = wl.get("a")
+    assert row["running"] == 0
+    assert row["runs"] == 1
+    assert row["last_new"] == 4
+    assert row["next_run"] == row["last_run"] + 120
+    assert wl.claim_due(1) == []
+
+
+def test_reset_running_keeps_live_owners(make_watchlist):
+    wl = make_watchlist()
+    for pid in ("mine", "live", "dead", "legacy"):
+        wl.add(pid, "u", 60, 1, None)
+    wl.claim_due(10)
+    # 살아 있는 다른 프로세스(부모), 없는 pid, owner 를 남기지 않던 이전 버전 행
+    set_row(wl, "live", owner=os.getppid())
+    set_row(wl, "dead", owner=2**22 + 12345)
+    set_row(wl, "legacy", owner=None)
+
+    assert wl.reset_running() == 3
+    running = {e["product_id"] for e in wl.entries() if e["running"]}
+    assert running == {"live"}
+